@@ -0,0 +1,168 @@
+""" Benchmarks of the simulator.
+
+Micro-benchmarks time the hot functions of the players (Player.play, estimate_rent, choose_mortgage_properties) and
+the setup of a table, on fixed states of a game played from a fixed seed. Macro-benchmarks time whole games: games
+and turns per second on a single core, and with the batch runner (monosim.runner.iter_games) on several cores.
+Each benchmark reports the best rate of a few repetitions, which is the least affected by the other processes.
+Results can be saved as json and compared with a baseline, e.g. from the command line:
+    monosim bench --save baseline.json
+    monosim bench --baseline baseline.json --threshold 0.1  # exit code 1 if a benchmark is 10% slower
+"""
+from monosim.player import Player
+from monosim.game import Game
+from monosim.runner import iter_games
+import platform
+import time
+import json
+import os
+
+#  Seed and number of turns of the game where the micro-benchmarks are run (the players own most properties)
+STATE_SEED = 3
+STATE_TURNS = 60
+
+
+def _get_game_state():
+    """ Return a game after STATE_TURNS turns, with its snapshot. """
+    game = Game([Player, Player], seed=STATE_SEED)
+    for _ in range(STATE_TURNS):
+        game.play_turn()
+    return game, game.snapshot()
+
+
+def _time(function, n_calls, repeat):
+    """ Return the best time of `repeat` runs of n_calls calls of a function. """
+    list_times = []
+    for _ in range(repeat):
+        start = time.perf_counter()
+        for _ in range(n_calls):
+            function()
+        list_times.append(time.perf_counter() - start)
+    return min(list_times)
+
+
+def bench_player_play(scale=1., repeat=3, n_games=100):
+    """ Player.play of the next player in a fixed state. Copies of the game are restored to the state before the
+        timing starts, so only Game.play_next is timed (restoring a snapshot costs more than a play).
+    """
+    _, snapshot = _get_game_state()
+    list_games = [Game([Player, Player], seed=STATE_SEED) for _ in range(n_games)]
+    n_rounds = max(1, int(20000 * scale) // n_games)
+    list_times = []
+    for _ in range(repeat):
+        elapsed = 0.
+        for _ in range(n_rounds):
+            for game in list_games:
+                game.restore(snapshot)
+            start = time.perf_counter()
+            for game in list_games:
+                game.play_next()
+            elapsed += time.perf_counter() - start
+        list_times.append(elapsed)
+    return {'ops_per_second': n_rounds * n_games / min(list_times), 'unit': 'plays'}
+
+
+def bench_estimate_rent(scale=1., repeat=3):
+    """ Player.estimate_rent of all the properties owned by the opponent. """
+    game, _ = _get_game_state()
+    player, opponent = game.get_players()
+    list_infos = [player._dict_roads[name] for name in opponent._list_owned_roads] + \
+                 [player._dict_properties[name] for name in opponent._list_owned_stations +
+                  opponent._list_owned_utilities]
+
+    def estimate():
+        for dict_info in list_infos:
+            player.estimate_rent(dict_info)
+    n_calls = max(1, int(20000 * scale))
+    return {'ops_per_second': n_calls * len(list_infos) / _time(estimate, n_calls, repeat), 'unit': 'rents'}
+
+
+def bench_choose_mortgage_properties(scale=1., repeat=3):
+    """ Player.choose_mortgage_properties of the player with the largest mortgageable amount. """
+    game, _ = _get_game_state()
+    player = max(game.get_players(), key=lambda player: player._properties_total_mortgageable_amount)
+    amount = player._properties_total_mortgageable_amount // 2
+
+    n_calls = max(1, int(20000 * scale))
+    return {'ops_per_second': n_calls / _time(lambda: player.choose_mortgage_properties(amount), n_calls, repeat),
+            'unit': 'calls'}
+
+
+def bench_table_setup(scale=1., repeat=3):
+    """ Setup of a game of two players: bank, board, roads, properties, deck and players. """
+    n_calls = max(1, int(2000 * scale))
+    return {'ops_per_second': n_calls / _time(lambda: Game([Player, Player], seed=0), n_calls, repeat),
+            'unit': 'games'}
+
+
+def bench_games(scale=1., repeat=3, n_workers=1):
+    """ Games of two default players, seeds 0 to 199 (scaled), played on n_workers processes. """
+    seeds = range(max(1, int(200 * scale)))
+    list_times, n_turns = [], 0
+    for _ in range(repeat):
+        start = time.perf_counter()
+        n_turns = sum(result['turns'] for result in iter_games([Player, Player], seeds, n_workers=n_workers))
+        list_times.append(time.perf_counter() - start)
+    return {'ops_per_second': len(seeds) / min(list_times), 'unit': 'games',
+            'turns_per_second': n_turns / min(list_times)}
+
+
+def bench_batch_games(scale=1., repeat=3, n_workers=None):
+    """ Same as bench_games with the batch runner on all the cores (or n_workers processes). """
+    return bench_games(scale * 4, repeat, n_workers or os.cpu_count() or 1)
+
+
+BENCHMARKS = {'player_play': bench_player_play, 'estimate_rent': bench_estimate_rent,
+              'choose_mortgage_properties': bench_choose_mortgage_properties, 'table_setup': bench_table_setup,
+              'games': bench_games, 'batch_games': bench_batch_games}
+
+
+def run_benchmarks(names=None, scale=1., repeat=3, n_workers=None):
+    """ Run benchmarks.
+
+    :param names: (list) names of the benchmarks (keys of BENCHMARKS). Default: all.
+    :param scale: (float) scale of the number of calls and games (e.g. 0.1 for a quick run)
+    :param repeat: (int) number of repetitions of each benchmark. The best one is reported.
+    :param n_workers: (int) number of processes of batch_games. Default: number of CPUs.
+    :return: (dict) information of the machine and results of each benchmark ('ops_per_second' and 'unit')
+    """
+    dict_benchmarks = {}
+    for name in names or BENCHMARKS:
+        if name not in BENCHMARKS:
+            raise Exception('Benchmark {} not found. Available benchmarks: {}'.format(name, list(BENCHMARKS)))
+        if name == 'batch_games':
+            dict_benchmarks[name] = bench_batch_games(scale, repeat, n_workers)
+        else:
+            dict_benchmarks[name] = BENCHMARKS[name](scale, repeat)
+    return {'python': platform.python_version(), 'machine': platform.machine(), 'cpu_count': os.cpu_count(),
+            'scale': scale, 'benchmarks': dict_benchmarks}
+
+
+def compare(results, baseline, threshold=0.1):
+    """ Compare benchmark results with a baseline.
+
+    :param results: (dict) results of run_benchmarks
+    :param baseline: (dict) results of run_benchmarks saved as baseline
+    :param threshold: (float) relative slowdown considered a regression (0.1: 10% fewer operations per second)
+    :return: (dict) key: benchmark name, value: dict with 'ratio' (rate / baseline rate) and 'regression' (bool).
+             Benchmarks missing from the baseline are skipped.
+    """
+    dict_comparison = {}
+    for name, dict_result in results['benchmarks'].items():
+        dict_baseline = baseline['benchmarks'].get(name)
+        if dict_baseline is None:
+            continue
+        ratio = dict_result['ops_per_second'] / dict_baseline['ops_per_second']
+        dict_comparison[name] = {'ratio': ratio, 'regression': ratio < 1 - threshold}
+    return dict_comparison
+
+
+def save_results(results, path):
+    """ Save benchmark results as json. """
+    with open(path, 'w') as f:
+        json.dump(results, f, indent=2)
+
+
+def load_results(path):
+    """ Load benchmark results saved with save_results. """
+    with open(path) as f:
+        return json.load(f)
@@ -1,3 +1,8 @@
+from types import MappingProxyType
+import hashlib
+import json
+
+
 def get_board():
     list_board = [{'name': 'go',
                    'type': 'go'},
@@ -91,7 +96,7 @@ def get_bank():
     return dict_bank
 
 
-def get_roads():
+def _get_roads_records():
 
     dict_roads = {
         'old kent road': {
@@ -537,7 +542,7 @@ def get_roads():
     return dict_roads
 
 
-def get_properties():
+def _get_properties_records():
 
     dict_properties = {
         'kings cross station': {
@@ -644,4 +649,196 @@ def get_community_chest_cards():
               "street_repair": "YOU ARE ASSESSED FOR STREET REPAIRS: PAY 40 PER HOUSE AND 115 PER "
                                "HOTEL YOU OWN.",
               "out_of_jail": "GET OUT OF JAIL FREE. THIS CARD MAY BE KEPT UNTIL NEEDED, TRADED "
-                             "OR SOLD."}
\ No newline at end of file
+                             "OR SOLD."}
+
+
+def _get_infos(dict_positions, board_state):
+    """ Return a dict of road or property information for each name of dict_positions, added to the board state. """
+    if board_state is None:
+        board_state = BoardState()
+    records = get_catalog()._records
+    dict_infos = {name: records[position].copy()
+                  for name, position in dict_positions.items()}
+    board_state.add(dict_infos.values())
+    return dict_infos
+
+
+def get_roads(board_state=None):
+    """ Return the roads of the board. Each road is a new dict with the road information (price, rent, color, etc.)
+        copied from the catalog, 'belongs_to' and 'is_mortgaged', which are the state of the game.
+
+    :param board_state: (BoardState) State of the game, indexing the roads. If None, a new state is created.
+    :return: (dict) key: road name, value: (dict) road information
+    """
+    return _get_infos(get_catalog().road_positions, board_state)
+
+
+def get_properties(board_state=None):
+    """ Return the properties (stations and utilities) of the board. See get_roads.
+
+    :param board_state: (BoardState) State of the game, indexing the properties. If None, a new state is created.
+    :return: (dict) key: property name, value: (dict) property information
+    """
+    return _get_infos(get_catalog().property_positions, board_state)
+
+
+def get_board_data_hash():
+    """ Return a hash of the static data of the game (board, roads, properties, community chest cards and bank).
+        The hash changes whenever any of these data change, so it can be used as key of values computed from them
+        (e.g. cached tables).
+
+    :return: (str) hexadecimal sha256 hash
+    """
+    dict_data = {'board': get_board(), 'roads': _get_roads_records(), 'properties': _get_properties_records(),
+                 'community_chest_cards': get_community_chest_cards(), 'bank': get_bank()}
+    return hashlib.sha256(json.dumps(dict_data, sort_keys=True).encode('utf-8')).hexdigest()
+
+
+RENT_KEYS = ('rent', 'rent_with_color_set', 'rent_with_1_houses_0_hotels', 'rent_with_2_houses_0_hotels',
+             'rent_with_3_houses_0_hotels', 'rent_with_4_houses_0_hotels', 'rent_with_4_houses_1_hotels')
+#  Cash of the community chest cards, as in Player.play_community_chest. Positive values are collected, negative values
+#  are paid as a tax.
+COMMUNITY_CHEST_CASH = {'stock_sale': 50, 'holiday_fund': 100, 'second_price': 100, 'inherit': 100, 'consultancy': 25,
+                        'income_tax': 20, 'insurance': 100, 'bank_error': 200, 'hospital_fees': -100,
+                        'school_fees': -50, 'doctor_fees': -50}
+#  Cost of the community chest card 'street_repair' per house and per hotel (see Player.community_chest_street_repair)
+STREET_REPAIR_HOUSE_COST = 40
+STREET_REPAIR_HOTEL_COST = 115
+
+
+class Catalog:
+    """ Static information of the board (prices, rents, mortgage values, colors, etc.), compiled once in read-only
+        tables indexed by board position. Use get_catalog() to get the shared instance.
+    """
+
+    def __init__(self):
+        list_board = get_board()
+        dict_records = dict(_get_roads_records(), **_get_properties_records())
+
+        self.board_size = len(list_board)
+        self.names = tuple(board_cell['name'] for board_cell in list_board)
+        self.types = tuple(board_cell['type'] for board_cell in list_board)
+        self.road_positions = MappingProxyType({name: record['board_num'] for name, record in dict_records.items()
+                                                if record['type'] == 'road'})
+        self.property_positions = MappingProxyType({name: record['board_num']
+                                                    for name, record in dict_records.items()
+                                                    if record['type'] != 'road'})
+        self.position_of = MappingProxyType(dict(self.road_positions, **self.property_positions))
+
+        # Records of the roads and properties at the start of a game, by position. They are copied by get_roads and
+        # get_properties for each game and never modified.
+        list_records = [None] * self.board_size
+        for record in dict_records.values():
+            list_records[record['board_num']] = record
+        self._records = tuple(list_records)
+        self.prices = tuple(info['price'] if info else 0 for info in list_records)
+        self.mortgage_values = tuple(info['mortgage_value'] if info else 0 for info in list_records)
+        self.unmortgage_values = tuple(info['unmortgage_value'] if info else 0 for info in list_records)
+        self.houses_costs = tuple(info.get('houses_cost', 0) if info else 0 for info in list_records)
+        self.hotels_costs = tuple(info.get('hotels_cost', 0) if info else 0 for info in list_records)
+        self.colors = tuple(info.get('color') if info else None for info in list_records)
+
+        # Bit of each purchasable cell (1 << index among the 28 purchasable cells, 0 for the other cells), used to
+        # represent holdings and mortgages as integer bitmasks. color_masks holds the bits of the roads of each color.
+        list_purchasable = [position for position, info in enumerate(list_records) if info]
+        self.bits = tuple(1 << list_purchasable.index(position) if info else 0
+                          for position, info in enumerate(list_records))
+        dict_color_masks = {}
+        for position, color in enumerate(self.colors):
+            if color is not None:
+                dict_color_masks[color] = dict_color_masks.get(color, 0) | self.bits[position]
+        self.color_masks = MappingProxyType(dict_color_masks)
+
+        # Rent of each road by development level: 0 = no color set, 1 = color set, 2 to 5 = 1 to 4 houses,
+        # 6 = hotel. The level is 0 if the owner doesn't have the color set, 1 + houses + hotels otherwise.
+        self.rents = tuple(tuple(info[key] for key in RENT_KEYS) if info and info['type'] == 'road' else None
+                           for info in list_records)
+        # Rent of a station by number of stations owned (index 0 is never used)
+        station_rent = dict_records['kings cross station']['rent']
+        self.station_rents = (0,) + tuple(station_rent * 2 ** idx for idx in range(4))
+        # Utility rent multiplier (of the dice value) by number of utilities owned (index 0 is never used)
+        self.utility_multipliers = (0, 4, 10)
+
+    def __reduce__(self):
+        # The catalog is read-only: copies and pickles refer to the shared instance of the process
+        return get_catalog, ()
+
+
+_catalog = None
+
+
+def get_catalog():
+    """ Return the static information of the board. The catalog is built once per process and shared by all the
+        games (and by the processes forked afterwards).
+
+    :return: (Catalog) Static board information
+    """
+    global _catalog
+    if _catalog is None:
+        _catalog = Catalog()
+    return _catalog
+
+
+class BoardState:
+    """ Mutable state of the board in a game: the owner of each cell and whether it is mortgaged. The state is kept
+        in the 'belongs_to' and 'is_mortgaged' items of the road and property dicts of the game (see get_roads), so
+        that players read it with plain dict lookups. The board state indexes those dicts by board position.
+    """
+
+    KEYS = ('belongs_to', 'is_mortgaged')
+    __slots__ = ('_infos', '_list_infos')
+
+    def __init__(self, board_size=40):
+        self._infos = [None] * board_size
+        self._list_infos = []  # Dicts of the cells which can be owned, in the order of the board
+
+    def add(self, list_infos):
+        """ Add the dicts of roads or properties of the game (see get_roads). """
+        for info in list_infos:
+            self._infos[info['board_num']] = info
+        self._list_infos = [info for info in self._infos if info is not None]
+
+    @property
+    def belongs_to(self):
+        """ (tuple) Owner of each cell, by board position (None if the cell has no owner or can't be owned). """
+        return tuple(info['belongs_to'] if info is not None else None for info in self._infos)
+
+    @property
+    def is_mortgaged(self):
+        """ (tuple) True for the mortgaged cells, by board position. """
+        return tuple(info is not None and info['is_mortgaged'] for info in self._infos)
+
+    def get_state(self):
+        """ Return owners and mortgages of the cells which can be owned, e.g. for a snapshot of the game.
+
+        :return: (tuple) owners and mortgages (tuples) of the cells which can be owned, in the order of the board
+        """
+        list_infos = self._list_infos
+        return tuple([info['belongs_to'] for info in list_infos]), tuple([info['is_mortgaged'] for info in list_infos])
+
+    def set_state(self, state):
+        """ Set owners and mortgages in place from a state returned by get_state.
+
+        :param state: (tuple) state of the board
+        :return: None
+        """
+        for info, owner, mortgaged in zip(self._list_infos, state[0], state[1]):
+            info['belongs_to'] = owner
+            info['is_mortgaged'] = mortgaged
+
+    def release(self, owner):
+        """ Give the cells of an owner back to the bank, unmortgaged.
+
+        :param owner: (str) name of the owner
+        :return: None
+        """
+        for info in self._list_infos:
+            if info['belongs_to'] == owner:
+                info['belongs_to'] = None
+                info['is_mortgaged'] = False
+
+    def reset(self):
+        """ Clear owners and mortgages in place. """
+        for info in self._list_infos:
+            info['belongs_to'] = None
+            info['is_mortgaged'] = False
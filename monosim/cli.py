@@ -0,0 +1,138 @@
+""" Command line tools.
+
+    monosim replay trace.bin                                  print a trace saved with Tracer.save
+    monosim replay --seed 1006                                play the game of a seed with tracing and print it
+    monosim replay --seed 1006 --players mymodule:MyPlayer,Player --save trace.bin
+    monosim record --seed 313880 --interval 100 --save seed_313880.rec   record a game with checkpoints
+    monosim replay --recording seed_313880.rec --turn 1800 --turns 5      print 5 turns from turn 1800
+    monosim bench --save baseline.json                        run the benchmarks (see monosim.benchmark)
+    monosim bench --baseline baseline.json --threshold 0.1    compare with a baseline, exit code 1 if slower
+"""
+from monosim.player import Player
+from monosim.runner import trace_game
+from monosim.trace import Tracer, load_trace, format_records
+from monosim.recording import record_game, load_recording
+from monosim.benchmark import run_benchmarks, compare, save_results, load_results
+import argparse
+import importlib
+import sys
+
+
+def get_player_factory(name):
+    """ Return the player class of a name: 'Player' for monosim.player.Player, or 'module:Class'. """
+    if name == 'Player':
+        return Player
+    if ':' not in name:
+        raise Exception('Player {} not valid. Use Player or module:Class'.format(name))
+    module_name, class_name = name.split(':')
+    return getattr(importlib.import_module(module_name), class_name)
+
+
+def get_player_factories(names):
+    """ Return the player classes of a comma separated list of names (see get_player_factory). """
+    return [get_player_factory(name) for name in names.split(',')]
+
+
+def record(args):
+    recording = record_game(args.seed, get_player_factories(args.players), args.max_turns, not args.no_shuffle,
+                            args.interval)
+    recording.save(args.save)
+    print('seed: {} checkpoints: {} result: {}'.format(args.seed, sorted(recording.dict_checkpoints),
+                                                        recording.result))
+
+
+def replay(args):
+    if args.recording is not None:
+        recording = load_recording(args.recording)
+        # Turns are numbered from 1 in the traces: turn T starts after T - 1 turns have been played
+        game = recording.seek(max(args.turn - 1, 0))
+        tracer = Tracer(args.capacity, {'seed': recording.seed,
+                                        'players': [player._name for player in game.get_players()]})
+        game.set_tracer(tracer)
+        while not game.is_over() and game.get_turn() < max(args.turn - 1, 0) + args.turns:
+            game.play_turn()
+        dict_info, list_records = dict(tracer.dict_info, turn=args.turn), tracer.get_records()
+    elif args.trace_file is not None:
+        dict_info, list_records = load_trace(args.trace_file)
+    elif args.seed is not None:
+        result, tracer = trace_game(args.seed, get_player_factories(args.players), args.max_turns,
+                                    not args.no_shuffle, args.capacity)
+        if args.save is not None:
+            tracer.save(args.save)
+        dict_info, list_records = dict(tracer.dict_info, count=tracer.get_count(), result=result), \
+            tracer.get_records()
+    else:
+        raise Exception('Give a trace file, a recording or a seed to replay')
+
+    if args.last is not None:
+        list_records = list_records[-args.last:]
+    print(' '.join('{}: {}'.format(key, value) for key, value in dict_info.items()))
+    for line in format_records(list_records, dict_info.get('players')):
+        print(line)
+
+
+def bench(args):
+    results = run_benchmarks(args.only.split(',') if args.only else None, args.scale, args.repeat, args.workers)
+    dict_comparison = compare(results, load_results(args.baseline), args.threshold) if args.baseline else {}
+    for name, dict_result in results['benchmarks'].items():
+        line = '{:<28}{:>14.1f} {}/s'.format(name, dict_result['ops_per_second'], dict_result['unit'])
+        if 'turns_per_second' in dict_result:
+            line += ' ({:.1f} turns/s)'.format(dict_result['turns_per_second'])
+        if name in dict_comparison:
+            line += '  {:+.1%}{}'.format(dict_comparison[name]['ratio'] - 1,
+                                         '  REGRESSION' if dict_comparison[name]['regression'] else '')
+        print(line)
+    if args.save is not None:
+        save_results(results, args.save)
+    if any(dict_value['regression'] for dict_value in dict_comparison.values()):
+        sys.exit(1)
+
+
+def main(list_args=None):
+    parser = argparse.ArgumentParser(prog='monosim', description='Monopoly simulator tools')
+    subparsers = parser.add_subparsers(dest='command')
+    parser_replay = subparsers.add_parser('replay', help='print the events of a game')
+    parser_replay.add_argument('trace_file', nargs='?', help='trace file saved with Tracer.save')
+    parser_replay.add_argument('--seed', type=int, help='play and trace the game of this seed')
+    parser_replay.add_argument('--players', default='Player,Player',
+                               help='comma separated players of the game: Player or module:Class')
+    parser_replay.add_argument('--max-turns', type=int, default=1000)
+    parser_replay.add_argument('--no-shuffle', action='store_true', help='do not shuffle the playing order')
+    parser_replay.add_argument('--capacity', type=int, default=65536, help='maximum number of events kept')
+    parser_replay.add_argument('--save', help='save the trace of the game in this file')
+    parser_replay.add_argument('--last', type=int, help='print only the last events')
+    parser_replay.add_argument('--recording', help='recording saved by monosim record')
+    parser_replay.add_argument('--turn', type=int, default=1, help='first turn to print from the recording')
+    parser_replay.add_argument('--turns', type=int, default=1, help='number of turns to print from the recording')
+
+    parser_record = subparsers.add_parser('record', help='record a game with periodic checkpoints')
+    parser_record.add_argument('--seed', type=int, required=True, help='seed of the game')
+    parser_record.add_argument('--players', default='Player,Player',
+                               help='comma separated players of the game: Player or module:Class')
+    parser_record.add_argument('--max-turns', type=int, default=1000)
+    parser_record.add_argument('--no-shuffle', action='store_true', help='do not shuffle the playing order')
+    parser_record.add_argument('--interval', type=int, default=100, help='number of turns between checkpoints')
+    parser_record.add_argument('--save', required=True, help='file of the recording')
+
+    parser_bench = subparsers.add_parser('bench', help='run the benchmarks')
+    parser_bench.add_argument('--only', help='comma separated benchmarks to run (default: all)')
+    parser_bench.add_argument('--scale', type=float, default=1., help='scale of the number of calls and games')
+    parser_bench.add_argument('--repeat', type=int, default=3, help='repetitions of each benchmark')
+    parser_bench.add_argument('--workers', type=int, help='processes of the batch benchmark (default: CPUs)')
+    parser_bench.add_argument('--save', help='save the results in this json file')
+    parser_bench.add_argument('--baseline', help='json file of results to compare with')
+    parser_bench.add_argument('--threshold', type=float, default=0.1, help='relative slowdown of a regression')
+    args = parser.parse_args(list_args)
+
+    if args.command == 'replay':
+        replay(args)
+    elif args.command == 'record':
+        record(args)
+    elif args.command == 'bench':
+        bench(args)
+    else:
+        parser.print_help()
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,139 @@
+""" Fixed-length NumPy encoding of the state of a game.
+
+ObservationEncoder writes the state of a game, seen by one of its players, in a preallocated NumPy buffer, e.g. as
+input of machine learning models. Layout of an observation (see ObservationEncoder.layout for the slices):
+    game features (GAME_FEATURES): turn, bank cash, bank houses, bank hotels
+    one block per player, starting from the observing player and continuing in the order of the player numbers
+    (player3 observing a game of 4 players: player3, player4, player1, player2). Each block holds:
+        PLAYER_FEATURES: position, cash, in jail (1 or 0), jail count, has lost (1 or 0), mortgageable amount
+        owned: 1 for each of the 28 purchasable cells owned by the player, in board order (see Catalog.bits)
+        mortgaged: 1 for each of the 28 purchasable cells mortgaged by the player
+        houses: number of houses of each of the 22 roads, in board order
+        hotels: number of hotels of each of the 22 roads
+The values are written directly in the slices of the buffer: the scalar features of a block with a single assignment,
+the owned and mortgaged bitmasks (which are contiguous) packed in a scratch buffer of the encoder and expanded at once
+with a table of the bits of each byte, and only the buildings of the roads which have some. Encoding a game doesn't
+allocate new arrays, so an encoder must not be shared between threads.
+"""
+from monosim.board import get_catalog
+from struct import pack_into
+import numpy as np
+
+GAME_FEATURES = ('turn', 'bank_cash', 'bank_houses', 'bank_hotels')
+PLAYER_FEATURES = ('position', 'cash', 'in_jail', 'jail_count', 'has_lost', 'mortgageable_amount')
+JAIL_POSITION = 10
+
+
+class ObservationEncoder:
+    def __init__(self, n_players, dtype=np.float32):
+        """ Encoder of the games of n_players players. See the module description for the layout.
+
+        :param n_players: (int) number of players of the games
+        :param dtype: NumPy type of the buffers (e.g. np.float32 or np.int32)
+        """
+        catalog = get_catalog()
+        list_purchasable = [position for position, bit in enumerate(catalog.bits) if bit]
+        list_roads = [position for position, cell_type in enumerate(catalog.types) if cell_type == 'road']
+        self.n_players = n_players
+        self.dtype = np.dtype(dtype)
+        self.n_properties = len(list_purchasable)
+        self.n_bytes = (self.n_properties + 7) // 8
+        self.road_index = {catalog.names[position]: idx for idx, position in enumerate(list_roads)}
+
+        self.player_size = len(PLAYER_FEATURES) + 2 * self.n_properties + 2 * len(list_roads)
+        self.size = len(GAME_FEATURES) + n_players * self.player_size
+        self.layout = {name: slice(idx, idx + 1) for idx, name in enumerate(GAME_FEATURES)}
+        for idx_player in range(n_players):
+            start = len(GAME_FEATURES) + idx_player * self.player_size
+            for name, length in ([(name, 1) for name in PLAYER_FEATURES] +
+                                 [('owned', self.n_properties), ('mortgaged', self.n_properties),
+                                  ('houses', len(list_roads)), ('hotels', len(list_roads))]):
+                self.layout['player{}_{}'.format(idx_player, name)] = slice(start, start + length)
+                start += length
+        self._offset_owned = len(PLAYER_FEATURES)
+        self._offset_mortgaged = self._offset_owned + self.n_properties
+        self._offset_houses = self._offset_mortgaged + self.n_properties
+        self._offset_hotels = self._offset_houses + len(list_roads)
+
+        self._n_roads = len(list_roads)
+        # Bits of each byte, from the least significant, used to expand the bitmasks of the players. The owned and
+        # mortgaged masks (2 * 28 bits) are packed together in the 8 bytes of _mask_bytes and expanded in _bits.
+        self._byte_bits = np.unpackbits(np.arange(256, dtype=np.uint8)[:, None], axis=1,
+                                        bitorder='little').astype(self.dtype)
+        self._mask_bytes = np.zeros(8, dtype=np.uint8)
+        self._bits = np.zeros((8, 8), dtype=self.dtype)
+
+    def new_buffer(self, n_observations=None):
+        """ Allocate a buffer for one observation (1D) or a batch of n_observations (2D). """
+        shape = (self.size,) if n_observations is None else (n_observations, self.size)
+        return np.zeros(shape, dtype=self.dtype)
+
+    def _write_player(self, player, out, start):
+        """ Write the block of a player in out, starting from the index start. """
+        out[start:start + self._offset_owned] = (
+            player._position, player.cash, player._position == JAIL_POSITION and not player._free_visit,
+            player._jail_count, player.has_lost(), player._properties_total_mortgageable_amount)
+        # The mortgaged bits follow the owned bits in the layout, so both masks are expanded together
+        n_properties = self.n_properties
+        pack_into('<Q', self._mask_bytes, 0, player._owned_mask | (player._mortgaged_mask << n_properties))
+        np.take(self._byte_bits, self._mask_bytes, axis=0, out=self._bits)
+        out[start + self._offset_owned:start + self._offset_houses] = self._bits.reshape(-1)[:2 * n_properties]
+        start_houses = start + self._offset_houses
+        start_hotels = start + self._offset_hotels
+        out[start_houses:start_hotels + self._n_roads] = 0
+        road_index = self.road_index
+        for road, (houses, hotels) in player._dict_owned_houses_hotels.items():
+            if houses:
+                out[start_houses + road_index[road]] = houses
+            if hotels:
+                out[start_hotels + road_index[road]] = hotels
+
+    def encode(self, game, player=None, out=None):
+        """ Write the state of a game, seen by one of its players, in a buffer.
+
+        :param game: (Game) game with n_players players
+        :param player: (Player) observing player. Default: player1
+        :param out: (np.ndarray) 1D buffer of size `size` (e.g. a row of a batch). Default: a new buffer.
+        :return: (np.ndarray) the buffer
+        """
+        list_players = game.get_players()
+        if len(list_players) != self.n_players:
+            raise Exception('The encoder is for {} players, the game has {}'.format(self.n_players,
+                                                                                   len(list_players)))
+        if out is None:
+            out = self.new_buffer()
+        bank = game._bank
+        n_game_features = len(GAME_FEATURES)
+        out[:n_game_features] = (game.get_turn(), bank['cash'], bank['houses'], bank['hotels'])
+        first = 0 if player is None else player._number - 1
+        for idx in range(self.n_players):
+            self._write_player(list_players[(first + idx) % self.n_players], out,
+                               n_game_features + idx * self.player_size)
+        return out
+
+    def encode_batch(self, list_games, list_players=None, out=None):
+        """ Write the states of many games in the rows of a batch buffer.
+
+        :param list_games: (list) games with n_players players
+        :param list_players: (list) observing player of each game. Default: player1 of each game
+        :param out: (np.ndarray) 2D buffer with at least len(list_games) rows. Default: a new buffer.
+        :return: (np.ndarray) the buffer
+        """
+        if out is None:
+            out = self.new_buffer(len(list_games))
+        if list_players is None:
+            list_players = [None] * len(list_games)
+        for row, game, player in zip(out, list_games, list_players):
+            self.encode(game, player, row)
+        return out
+
+    def observe(self, game, player, hook, dict_property_info):
+        """ Observation function of monosim.env.MonopolyEnv (its observe argument): a new buffer with the state of the
+            game seen by the agent. The pending decision is in the info returned by the environment. """
+        return self.encode(game, player)
+
+    def decode(self, observation):
+        """ Return the features of an observation as a dict (key: name of the layout, value: value or array). Useful
+            to inspect observations. """
+        return {name: observation[item].item() if item.stop - item.start == 1 else observation[item]
+                for name, item in self.layout.items()}
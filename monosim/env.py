@@ -0,0 +1,317 @@
+""" Reinforcement learning environments.
+
+MonopolyEnv wraps a game in a reset()/step(action) interface (the same of gymnasium.Env, without depending on it). The
+agent is player1 and each decision of its Player hooks (see HOOKS) is an action point. Actions are 0 (no: 'bid',
+'wait', False) or 1 (yes: 'buy', 'mortgage', 'pay', True), see ACTIONS.
+Hooks are called deep inside Player.play, so the environment can't return in the middle of a turn. Instead, at the
+beginning of each turn of the agent the game takes a snapshot. When the agent has to take a decision that has not been
+given yet, the turn is interrupted, the observation taken and the snapshot restored. After step(action), the turn is
+replayed from the snapshot with the same dice, forcing the decisions already taken, until the next decision or the end
+of the turn. Turns are short, so replaying them costs much less than running the game in a separate thread.
+
+VectorEnv steps many independent environments per call and resets the finished ones automatically. The environments
+can be split between worker processes.
+"""
+from monosim.player import Player, DECISION_HOOKS as HOOKS, DECISION_ANSWERS as ACTIONS
+from monosim.game import Game
+from multiprocessing import Pipe, Process
+from collections import deque
+
+N_ACTIONS = 2
+MAX_SKIPPED_GAMES = 100  # games ending before the first decision of the agent skipped in a row by VectorEnv
+
+
+class DecisionRequired(Exception):
+    """ Raised by AgentPlayer to interrupt the turn when a decision of the agent is needed. """
+
+    def __init__(self, hook, dict_property_info=None):
+        super().__init__(hook)
+        self.hook = hook
+        self.dict_property_info = dict_property_info
+
+
+class AgentPlayer(Player):
+    """ Player controlled by an environment. The decisions in forced_decisions are taken first, in order. When they
+        are finished, hooks in `hooks` raise DecisionRequired, the other hooks behave as the default Player.
+    """
+
+    def __init__(self, name, number, bank, list_board, dict_roads, dict_properties, community_cards_deck, rng=None):
+        super().__init__(name, number, bank, list_board, dict_roads, dict_properties, community_cards_deck, rng)
+        self.forced_decisions = deque()
+        self.hooks = frozenset(HOOKS)
+
+    def reset(self):
+        super().reset()
+        self.forced_decisions.clear()
+
+    def _decide(self, hook, dict_property_info=None):
+        if self.forced_decisions:
+            return self.forced_decisions.popleft()
+        raise DecisionRequired(hook, dict_property_info)
+
+    def buy_or_bid(self, dict_road_info):
+        if 'buy_or_bid' in self.hooks:
+            return self._decide('buy_or_bid', dict_road_info)
+        return super().buy_or_bid(dict_road_info)
+
+    def mortgage_or_bid(self, dict_road_info):
+        if 'mortgage_or_bid' in self.hooks:
+            return self._decide('mortgage_or_bid', dict_road_info)
+        return super().mortgage_or_bid(dict_road_info)
+
+    def want_to_buy_house_hotel(self):
+        if 'want_to_buy_house_hotel' in self.hooks:
+            return self._decide('want_to_buy_house_hotel')
+        return super().want_to_buy_house_hotel()
+
+    def want_to_unmortgage(self):
+        if 'want_to_unmortgage' in self.hooks:
+            return self._decide('want_to_unmortgage')
+        return super().want_to_unmortgage()
+
+    def pay_jail_or_wait(self):
+        if 'pay_jail_or_wait' in self.hooks:
+            return self._decide('pay_jail_or_wait')
+        return super().pay_jail_or_wait()
+
+
+def get_observation(game, player, hook, dict_property_info):
+    """ Default observation of MonopolyEnv: the pending decision and the public state of the players.
+
+    :param game: (Game) game
+    :param player: (AgentPlayer) agent
+    :param hook: (str) name of the hook to answer, None at the end of the game
+    :param dict_property_info: (dict) property of buy_or_bid and mortgage_or_bid, otherwise None
+    :return: (dict) observation. Player values are tuples in the order of the player number.
+    """
+    list_players = game.get_players()
+    return {'decision': hook, 'property': dict_property_info['name'] if dict_property_info else None,
+            'turn': game.get_turn(), 'player': player._number - 1,
+            'cash': tuple(opponent.cash for opponent in list_players),
+            'position': tuple(opponent._position for opponent in list_players),
+            'dice_value': tuple(opponent._dice_value for opponent in list_players),
+            'holdings': tuple(opponent.get_holdings_key() for opponent in list_players),
+            'has_lost': tuple(opponent.has_lost() for opponent in list_players)}
+
+
+class MonopolyEnv:
+    def __init__(self, list_opponent_factories=(Player,), hooks=HOOKS, max_turns=1000, shuffle_players=True,
+                 observe=get_observation):
+        """ Environment of a game between an agent (player1) and the opponents. See the module description.
+
+        :param list_opponent_factories: (list) classes of the opponents (player2, player3, ...)
+        :param hooks: (tuple) hooks of the agent which are action points. The others are answered as the default Player.
+        :param max_turns: (int) maximum number of turns of a game. Longer games are truncated.
+        :param shuffle_players: (bool) see Game
+        :param observe: callable(game, agent, hook, dict_property_info) returning the observation
+        """
+        unknown_hooks = set(hooks) - set(HOOKS)
+        if unknown_hooks:
+            raise Exception('Hooks {} not valid. Available hooks: {}'.format(sorted(unknown_hooks), HOOKS))
+        self.list_opponent_factories = list(list_opponent_factories)
+        self.hooks = frozenset(hooks)
+        self.max_turns = max_turns
+        self.shuffle_players = shuffle_players
+        self.observe = observe
+        self.n_actions = N_ACTIONS
+        self.game = None
+        self._agent = None
+        self._turn_snapshot = None
+        self._list_decisions = []
+        self._hook = None
+
+    def reset(self, seed=None):
+        """ Start a new game and play until the first decision of the agent. The game of the previous episode is
+            reset with the new seed instead of being created again.
+
+        :param seed: (int) Random seed of the game
+        :return: (tuple) (observation, info). info['decision'] is the pending decision. If the game ends before the
+                 first decision of the agent (e.g. with a small max_turns), there is none: info['result'] is the
+                 result of the game and step can't be called.
+        """
+        if self.game is None:
+            self.game = Game([AgentPlayer] + self.list_opponent_factories, seed, self.shuffle_players)
+            self._agent = self.game.get_players()[0]
+        else:
+            # The players are reused (see Game.reset), so the auto-reset of VectorEnv doesn't allocate new games
+            self.game.reset(seed)
+        self._agent.hooks = self.hooks
+        self._turn_snapshot = None
+        self._list_decisions = []
+        observation, _, _, _, info = self._advance()
+        return observation, info
+
+    def step(self, action):
+        """ Answer the pending decision and play until the next decision of the agent or the end of the game.
+
+        :param action: (int) 0 or 1, see ACTIONS
+        :return: (tuple) (observation, reward, terminated, truncated, info). The reward is 1 if the agent won, -1 if it
+                 lost, 0 otherwise. terminated is True when a player lost, truncated when max_turns is reached.
+        """
+        if self._hook is None:
+            raise Exception('No pending decision. Call reset() to start a new game')
+        self._list_decisions.append(ACTIONS[self._hook][action])
+        return self._advance()
+
+    def _advance(self):
+        """ Play until the agent must decide (the turn is then rolled back to its snapshot) or the game ends. """
+        game, agent = self.game, self._agent
+        while not game.is_over() and game.get_turn() < self.max_turns:
+            if game.get_next_player() is not agent:
+                game.play_next()
+                continue
+            if self._turn_snapshot is None:
+                self._turn_snapshot = game.snapshot()
+            agent.forced_decisions = deque(self._list_decisions)
+            try:
+                game.play_next()
+            except DecisionRequired as decision:
+                # The observation shows the game at the moment of the decision, before rolling back the turn
+                observation = self.observe(game, agent, decision.hook, decision.dict_property_info)
+                game.restore(self._turn_snapshot)
+                self._hook = decision.hook
+                return observation, 0., False, False, {'turn': game.get_turn(), 'decision': decision.hook}
+            self._turn_snapshot = None
+            self._list_decisions = []
+
+        self._hook = None
+        result = game.get_result()
+        terminated = game.is_over()
+        reward = 0. if result['winner'] is None else 1. if result['winner'] == agent._name else -1.
+        if agent.has_lost():
+            reward = -1.
+        return self.observe(game, agent, None, None), reward, terminated, not terminated, {'result': result}
+
+
+def _reset(env, seed, seed_step):
+    """ Reset an environment until the agent has a decision to take. The games ending before it are skipped, playing
+        the next seeds seed + seed_step, seed + 2 * seed_step, ... (see VectorEnv).
+
+    :return: (tuple) (observation, info, number of games started)
+    """
+    for n_games in range(1, MAX_SKIPPED_GAMES + 1):
+        observation, info = env.reset(seed)
+        if 'decision' in info:
+            return observation, info, n_games
+        seed += seed_step
+    raise Exception('The agent had no decision to take in {} games in a row'.format(MAX_SKIPPED_GAMES))
+
+
+def _step_and_reset(env, action, seed, seed_step):
+    """ Step an environment and, if the game is finished, reset it with the given seed (see VectorEnv.step).
+
+    :return: (tuple) (observation, reward, terminated, truncated, info, number of games started)
+    """
+    observation, reward, terminated, truncated, info = env.step(action)
+    n_games = 0
+    if terminated or truncated:
+        new_observation, new_info, n_games = _reset(env, seed, seed_step)
+        info = dict(new_info, final_observation=observation, final_info=info)
+        observation = new_observation
+    return observation, reward, terminated, truncated, info, n_games
+
+
+def _call_envs(list_envs, command, list_data, seed_step):
+    """ Reset or step environments, with one argument (seed or (action, seed)) per environment. """
+    if command == 'reset':
+        return [_reset(env, seed, seed_step) for env, seed in zip(list_envs, list_data)]
+    return [_step_and_reset(env, action, seed, seed_step) for env, (action, seed) in zip(list_envs, list_data)]
+
+
+def _run_worker(connection, list_env_factories, seed_step):
+    """ Loop of a worker process of VectorEnv: reset or step its environments on request. """
+    list_envs = [factory() for factory in list_env_factories]
+    while True:
+        command, list_data = connection.recv()
+        if command in ('reset', 'step'):
+            connection.send(_call_envs(list_envs, command, list_data, seed_step))
+        else:
+            connection.close()
+            return
+
+
+class VectorEnv:
+    def __init__(self, list_env_factories, seed=0, n_workers=1):
+        """ Batch of independent environments stepped together. A finished environment is reset automatically: the
+            observation returned by step is the first observation of the new game, the last observation and info of
+            the finished game are in info['final_observation'] and info['final_info'].
+            The environment i plays the seeds seed + i, seed + i + n_envs, seed + i + 2 * n_envs, ..., so the games
+            don't depend on the number of workers. Games ending before the first decision of the agent are skipped.
+
+        :param list_env_factories: (list) callables returning an environment, e.g. functools.partial(MonopolyEnv, ...).
+                                   They must be picklable when n_workers > 1.
+        :param seed: (int) seed of the first game of the first environment
+        :param n_workers: (int) number of processes. With 1, the environments are stepped in the current process.
+        """
+        self.n_envs = len(list_env_factories)
+        self.n_actions = N_ACTIONS
+        self._seed = seed
+        self._list_games = [0] * self.n_envs  # number of games started by each environment
+        n_workers = max(1, min(n_workers, self.n_envs))
+        self._list_slices = [range(idx, self.n_envs, n_workers) for idx in range(n_workers)]
+        self._list_envs = None
+        self._list_connections = []
+        self._list_processes = []
+        if n_workers == 1:
+            self._list_envs = [factory() for factory in list_env_factories]
+            return
+        for env_slice in self._list_slices:
+            connection, worker_connection = Pipe()
+            process = Process(target=_run_worker, daemon=True,
+                              args=(worker_connection, [list_env_factories[idx] for idx in env_slice], self.n_envs))
+            process.start()
+            worker_connection.close()
+            self._list_connections.append(connection)
+            self._list_processes.append(process)
+
+    def _get_seed(self, idx):
+        """ Return the seed of the next game of the environment idx. """
+        return self._seed + idx + self._list_games[idx] * self.n_envs
+
+    def _call(self, command, list_data):
+        """ Send a command (reset or step) with one argument per environment and return the outputs in order, counting
+            the games started by each environment. """
+        if self._list_envs is not None:
+            list_outputs = _call_envs(self._list_envs, command, list_data, self.n_envs)
+        else:
+            for connection, env_slice in zip(self._list_connections, self._list_slices):
+                connection.send((command, [list_data[idx] for idx in env_slice]))
+            list_outputs = [None] * self.n_envs
+            for connection, env_slice in zip(self._list_connections, self._list_slices):
+                for idx, output in zip(env_slice, connection.recv()):
+                    list_outputs[idx] = output
+        for idx, output in enumerate(list_outputs):
+            self._list_games[idx] += output[-1]
+        return [output[:-1] for output in list_outputs]
+
+    def reset(self):
+        """ Start a new game in every environment.
+
+        :return: (tuple) (list of observations, list of infos)
+        """
+        list_outputs = self._call('reset', [self._get_seed(idx) for idx in range(self.n_envs)])
+        return [observation for observation, _ in list_outputs], [info for _, info in list_outputs]
+
+    def step(self, list_actions):
+        """ Step every environment with its action, resetting the finished ones.
+
+        :param list_actions: (list) one action per environment
+        :return: (tuple) lists of observations, rewards, terminated, truncated and infos
+        """
+        list_outputs = self._call('step', [(action, self._get_seed(idx)) for idx, action in enumerate(list_actions)])
+        return tuple(list(values) for values in zip(*list_outputs))
+
+    def close(self):
+        """ Stop the worker processes. """
+        for connection in self._list_connections:
+            connection.send(('close', None))
+            connection.close()
+        for process in self._list_processes:
+            process.join()
+        self._list_connections, self._list_processes = [], []
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc_value, traceback):
+        self.close()
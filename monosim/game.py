@@ -0,0 +1,275 @@
+from monosim.board import get_board, get_roads, get_properties, get_community_chest_cards, get_bank, BoardState
+from monosim.trace import TURN
+from monosim.logs import logger, enable_output, TURNS
+import random
+
+STALEMATE_CHECK_INTERVAL = 10
+
+
+class Game:
+    def __init__(self, list_player_factories, seed=None, shuffle_players=True, last_player_standing=False):
+        """ Set the table (bank, board, community chest deck) and the players of a game. The game owns a
+            random.Random(seed) generator shared by its players.
+            Players play in turn, following a circular list of the seats still in the game: eliminated players are
+            unlinked from the list, so the next player is always found in constant time.
+
+        :param list_player_factories: (list) callables with the same signature of Player (e.g. Player or a subclass).
+                                      The i-th factory creates the player named 'player{i+1}'.
+        :param seed: (int) Random seed of the game
+        :param shuffle_players: (bool) if True, shuffle the playing order so that player1 doesn't always start first
+        :param last_player_standing: (bool) if False, the game is over when a player loses (as in the notebooks). If
+                                     True, the properties of a bankrupt player go back to the bank and the game goes
+                                     on until a single player is left (e.g. for tables of 6-8 players).
+        """
+        self._seed = seed
+        self._rng = random.Random(seed)
+        self._bank = get_bank()
+        self._list_board = get_board()
+        self._board_state = BoardState(len(self._list_board))
+        self._dict_roads = get_roads(self._board_state)
+        self._dict_properties = get_properties(self._board_state)
+        self._community_cards_deck = list(get_community_chest_cards().keys())
+        self._initial_bank = tuple(self._bank.values())
+        self._initial_deck = tuple(self._community_cards_deck)
+
+        self._list_players = [factory('player{}'.format(idx + 1), idx + 1, self._bank, self._list_board,
+                                      self._dict_roads, self._dict_properties, self._community_cards_deck)
+                              for idx, factory in enumerate(list_player_factories)]
+        # Players share a single dict of the players instead of building one each
+        self._dict_players = {player._name: player for player in self._list_players}
+        for player in self._list_players:
+            player.set_rng(self._rng)
+            player.set_game(self)
+            player.meet_other_players([opponent for opponent in self._list_players if opponent is not player],
+                                      self._dict_players)
+
+        self._shuffle_players = shuffle_players
+        self._list_order = list(self._list_players)
+        if shuffle_players:
+            self._rng.shuffle(self._list_order)
+
+        self._last_player_standing = last_player_standing
+        self._turn = 0  # Number of turns (rounds of the table) completed
+        self._seat = 0  # Seat (in playing order) of the next player to play
+        # Circular list of the seats still playing: next and previous seat of each seat, first seat of a round
+        self._next_seats = [0] * len(self._list_order)
+        self._previous_seats = [0] * len(self._list_order)
+        self._first_seat = 0
+        self._n_playing = 0
+        self._link_seats()
+        self._started_turn = -1  # Last turn whose beginning has been logged
+        self._tracer = None
+        self._verbosity = 0
+        self._stalemate = False
+
+    def reset(self, seed=None):
+        """ Start a new game with the same players, as if the game was created again with the given seed. Bank,
+            board, deck and players (see Player.reset) are reset in place, so a game can be reused for many seeds
+            without allocating new objects.
+
+        :param seed: (int) Random seed of the new game
+        :return: None
+        """
+        self._seed = seed
+        self._rng.seed(seed)
+        self._bank.update(zip(self._bank, self._initial_bank))
+        self._board_state.reset()
+        self._community_cards_deck[:] = self._initial_deck
+        for player in self._list_players:
+            player.reset()
+        self._list_order[:] = self._list_players
+        if self._shuffle_players:
+            self._rng.shuffle(self._list_order)
+        self._turn = 0
+        self._seat = 0
+        self._link_seats()
+        self._started_turn = -1
+        self._stalemate = False
+
+    def _link_seats(self):
+        """ Link the seats of the players still playing in a circular list, in playing order. """
+        list_seats = [seat for seat, player in enumerate(self._list_order) if not player.has_lost()]
+        for seat, next_seat in zip(list_seats, list_seats[1:] + list_seats[:1]):
+            self._next_seats[seat] = next_seat
+            self._previous_seats[next_seat] = seat
+        self._first_seat = list_seats[0] if list_seats else 0
+        self._n_playing = len(list_seats)
+
+    def _eliminate(self, seat):
+        """ Unlink the seat of a player who lost. With last_player_standing, its properties, houses and hotels go back
+            to the bank. """
+        next_seat, previous_seat = self._next_seats[seat], self._previous_seats[seat]
+        self._next_seats[previous_seat] = next_seat
+        self._previous_seats[next_seat] = previous_seat
+        if seat == self._first_seat:
+            self._first_seat = next_seat
+        self._n_playing -= 1
+        if self._last_player_standing:
+            player = self._list_order[seat]
+            self._board_state.release(player._name)
+            houses, hotels = player.release_holdings()
+            self._bank['houses'] += houses
+            self._bank['hotels'] += hotels
+
+    def get_players(self):
+        """ Return the players, in the order of their number (player1, player2, ...).
+
+        :return: (list) Player objects
+        """
+        return self._list_players
+
+    def get_turn(self):
+        """ Return the number of turns (rounds of the table) completed. """
+        return self._turn
+
+    def reseed(self, seed):
+        """ Seed the random generator of the game again, e.g. to play different continuations from a snapshot.
+
+        :param seed: (int) Random seed
+        :return: None
+        """
+        self._rng.seed(seed)
+
+    def set_tracer(self, tracer):
+        """ Record the events of the game and of its players in a tracer (see monosim.trace).
+
+        :param tracer: (Tracer) Tracer. None disables tracing.
+        :return: None
+        """
+        self._tracer = tracer
+        for player in self._list_players:
+            player.set_tracer(tracer)
+
+    def set_profiler(self, profiler):
+        """ Count and time the branches of the plays of the players in a profiler (see monosim.profiling).
+
+        :param profiler: (Profiler) Profiler. None disables profiling.
+        :return: None
+        """
+        for player in self._list_players:
+            player.set_profiler(profiler)
+
+    def set_verbosity(self, verbosity):
+        """ Set which events of the game and of its players are logged (see Player.set_verbosity and monosim.logs).
+
+        :param verbosity: (int) Verbosity level
+        :return: None
+        """
+        self._verbosity = verbosity
+        if verbosity > 0:
+            enable_output()
+        for player in self._list_players:
+            player.set_verbosity(verbosity)
+
+    def get_next_player(self):
+        """ Return the next player to play. """
+        return self._list_order[self._seat]
+
+    def is_over(self):
+        """ Return True if a player has lost or, with last_player_standing, if a single player is left. """
+        if self._last_player_standing:
+            return self._n_playing <= 1
+        return self._n_playing < len(self._list_order)
+
+    def play_next(self):
+        """ The next player (in playing order) plays. The turn count is increased when all the players still playing
+            have played.
+
+        :return: None
+        """
+        if self._started_turn != self._turn:
+            self._started_turn = self._turn
+            if self._tracer is not None:
+                self._tracer.record(TURN, 0, 0, self._turn + 1)
+            if self._verbosity >= TURNS:
+                logger.info('--------- turn %d ---------', self._turn + 1,
+                            extra={'event': 'turn', 'player': None, 'amount': None})
+        seat = self._seat
+        player = self._list_order[seat]
+        player.play()
+        if player._has_lost:
+            self._eliminate(seat)
+        self._seat = self._next_seats[seat]
+        if self._seat <= seat:
+            self._turn += 1
+
+    def play_turn(self):
+        """ Play until the end of the current turn (round of the table). With last_player_standing, the turn stops
+            when a single player is left.
+
+        :return: None
+        """
+        turn = self._turn
+        while self._turn == turn and not (self._last_player_standing and self._n_playing <= 1):
+            self.play_next()
+
+    def run(self, max_turns=1000, detect_stalemate=False):
+        """ Play turns until a player loses or the maximum number of turns is reached.
+
+        :param max_turns: (int) Maximum number of turns of the game
+        :param detect_stalemate: (bool) if True, stop the game when it is a stalemate: no player can lose before
+                                 max_turns (see monosim.stalemate). It is checked every STALEMATE_CHECK_INTERVAL
+                                 turns. Requires numpy.
+        :return: (dict) game result (see get_result)
+        """
+        if detect_stalemate:
+            # Imported here since numpy is only required to detect stalemates
+            from monosim.stalemate import is_stalemate
+        while not self.is_over() and self._turn < max_turns:
+            self.play_turn()
+            if detect_stalemate and self._turn % STALEMATE_CHECK_INTERVAL == 0 and \
+                    is_stalemate(self, max_turns):
+                self._stalemate = True
+                break
+        return self.get_result()
+
+    def get_result(self):
+        """ Return the result of the game.
+
+        :return: (dict) Example: {'seed': 3, 'turns': 120, 'player_order': ('player2', 'player1'),
+                                  'lost_players': ('player2',), 'winner': 'player1', 'cash': (1520, -40),
+                                  'holdings': (8396800, 1090), 'stalemate': False}
+                        'cash' and 'holdings' hold the final cash and the bitmask of the owned properties (see
+                        Catalog.bits) of each player, in the order of their number. 'stalemate' is True if the game
+                        was stopped as a stalemate (see run).
+        """
+        list_lost = tuple(player._name for player in self._list_players if player.has_lost())
+        list_alive = [player._name for player in self._list_players if not player.has_lost()]
+        return {'seed': self._seed, 'turns': self._turn,
+                'player_order': tuple(player._name for player in self._list_order), 'lost_players': list_lost,
+                'winner': list_alive[0] if list_lost and len(list_alive) == 1 else None,
+                'cash': tuple(player.cash for player in self._list_players),
+                'holdings': tuple(player.get_holdings_key()[0] for player in self._list_players),
+                'stalemate': self._stalemate}
+
+    def snapshot(self):
+        """ Capture the whole state of the game (players, bank, board, deck, random generator and turn) in a compact
+            structure of tuples. The snapshot can be restored any number of times with restore(), e.g. to explore
+            different continuations of the game.
+
+        :return: (tuple) snapshot of the game
+        """
+        return (self._rng.getstate(), tuple(self._bank.values()), self._board_state.get_state(),
+                tuple(self._community_cards_deck), self._turn, self._seat,
+                tuple(player._number - 1 for player in self._list_order),
+                tuple(player.get_snapshot() for player in self._list_players))
+
+    def restore(self, snapshot):
+        """ Restore the state of the game from a snapshot returned by snapshot(). The game must have the same
+            number of players of the game the snapshot was taken from. State is restored in place, so references
+            to the bank, board and deck held by the players stay valid.
+
+        :param snapshot: (tuple) snapshot of the game
+        :return: None
+        """
+        (rng_state, bank_values, board_state, deck, self._turn, self._seat, order,
+         player_snapshots) = snapshot
+        self._rng.setstate(rng_state)
+        self._bank.update(zip(self._bank, bank_values))
+        self._board_state.set_state(board_state)
+        self._community_cards_deck[:] = deck
+        self._list_order[:] = [self._list_players[idx] for idx in order]
+        for player, player_snapshot in zip(self._list_players, player_snapshots):
+            player.restore_snapshot(player_snapshot)
+        self._link_seats()
+        self._started_turn = self._turn if self._seat != self._first_seat else -1
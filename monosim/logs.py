@@ -0,0 +1,33 @@
+""" Logging of games.
+
+Players and games log their events to the 'monosim' logger when their verbosity is set (Player.set_verbosity,
+Game.set_verbosity). Verbosity levels:
+    OFF (0): nothing is logged. This is the default.
+    TURNS (1): turns, dice and moves
+    DECISIONS (2): also the decisions of the players (buy, mortgage, houses, unmortgage, jail)
+    ECONOMY (3): also the payments (purchases, rents, taxes, mortgages, houses, cards, bankruptcies)
+Log calls are guarded by a comparison with the verbosity, so with OFF no message is formatted and no record is created.
+Records are formatted lazily by the logging module and carry the fields 'event', 'player' and 'amount' (see extra in
+logging.Logger.log), e.g. to filter them or to write them as structured records.
+"""
+import logging
+import sys
+
+OFF, TURNS, DECISIONS, ECONOMY = 0, 1, 2, 3
+
+logger = logging.getLogger('monosim')
+
+
+def enable_output(stream=None):
+    """ Print the log messages of the games on a stream (default: sys.stdout), unless the 'monosim' logger already
+        has a handler (e.g. configured by the user with logging.config).
+
+    :param stream: stream where the messages are written
+    :return: None
+    """
+    if not logger.handlers:
+        handler = logging.StreamHandler(stream if stream is not None else sys.stdout)
+        handler.setFormatter(logging.Formatter('%(message)s'))
+        logger.addHandler(handler)
+    if logger.level == logging.NOTSET:
+        logger.setLevel(logging.INFO)
@@ -0,0 +1,182 @@
+""" Markov chain of the movement of a player on the board.
+
+The position of a player at the end of each turn is a Markov chain. The chain has 44 states: the 40 cells of the board
+(cell 10 means "just visiting" the jail) and 4 states for a player in jail, one per jail count (see Player.play).
+Transitions follow the rules of Player.play:
+    * the player moves by the sum of two dice. Doubles don't give an extra roll.
+    * the cell 30 (go to jail) sends the player to jail.
+    * in the community chest cells the top card of the deck is drawn. Since the deck is cycled, in the long run each
+      card is drawn with the same frequency, so each card is drawn with probability 1/16. The card 'to_go' moves the
+      player to Go. The card 'jail' doesn't move the player in Player.play_community_chest, unless chest_jail_card=True.
+    * a player in jail leaves with a double, or pays after three turns (or immediately with jail_policy='pay'), and
+      moves by the dice value without playing the cell where it ends.
+Chance cards are not implemented, so chance cells don't move the player.
+
+Matrices and distributions are cached per rule configuration and returned as read-only arrays.
+"""
+from monosim.board import get_board, get_community_chest_cards
+from functools import lru_cache
+import numpy as np
+
+BOARD_SIZE = 40
+JAIL_POSITION = 10
+GO_TO_JAIL_POSITION = 30
+MAX_JAIL_COUNT = 3
+#  Index of the state "in jail with jail count 0". State JAIL_STATE + k is "in jail with jail count k".
+JAIL_STATE = BOARD_SIZE
+N_STATES = BOARD_SIZE + MAX_JAIL_COUNT + 1
+JAIL_POLICIES = ('wait', 'pay')
+
+
+def get_dice_probabilities():
+    """ Return the probabilities of the sums of two dice, split in doubles and non doubles.
+
+    :return: (tuple) two arrays of length 13 (index: dice value), probabilities of doubles and non doubles
+    """
+    doubles, non_doubles = np.zeros(13), np.zeros(13)
+    for dice1 in range(1, 7):
+        for dice2 in range(1, 7):
+            if dice1 == dice2:
+                doubles[dice1 + dice2] += 1 / 36
+            else:
+                non_doubles[dice1 + dice2] += 1 / 36
+    return doubles, non_doubles
+
+
+def _land(row, position, probability, chest_jail_card):
+    """ Add to row the probability of ending the turn after landing in a cell (i.e. after playing the cell). """
+
+    list_board = get_board()
+    if position == GO_TO_JAIL_POSITION:
+        row[JAIL_STATE] += probability
+    elif list_board[position]['type'] == 'community chest':
+        list_cards = list(get_community_chest_cards().keys())
+        for card_name in list_cards:
+            card_probability = probability / len(list_cards)
+            if card_name == 'to_go':
+                row[0] += card_probability
+            elif card_name == 'jail' and chest_jail_card:
+                row[JAIL_STATE] += card_probability
+            else:
+                row[position] += card_probability
+    else:
+        row[position] += probability
+
+
+def _check_rules(jail_policy):
+    if jail_policy not in JAIL_POLICIES:
+        raise Exception('Jail policy {} not valid. Valid policies are {}'.format(jail_policy, JAIL_POLICIES))
+
+
+@lru_cache(maxsize=None)
+def get_transition_matrix(jail_policy='wait', chest_jail_card=False):
+    """ Return the transition matrix of the chain. Entry [i, j] is the probability of ending the next turn in state j
+        when the current turn ended in state i.
+
+    :param jail_policy: (str) 'wait' if the player waits in jail (as Player.pay_jail_or_wait), 'pay' otherwise
+    :param chest_jail_card: (bool) if True, the community chest card 'jail' sends the player to jail
+    :return: (np.ndarray) read-only matrix of shape (N_STATES, N_STATES)
+    """
+    _check_rules(jail_policy)
+    doubles, non_doubles = get_dice_probabilities()
+    matrix = np.zeros((N_STATES, N_STATES))
+
+    for position in range(BOARD_SIZE):
+        for dice_value in range(2, 13):
+            _land(matrix[position], (position + dice_value) % BOARD_SIZE, doubles[dice_value] + non_doubles[dice_value],
+                  chest_jail_card)
+
+    for jail_count in range(MAX_JAIL_COUNT + 1):
+        row = matrix[JAIL_STATE + jail_count]
+        for dice_value in range(2, 13):
+            # The player leaves the jail with a double, after three turns or paying. The cell is not played.
+            row[JAIL_POSITION + dice_value] += doubles[dice_value]
+            if jail_count == MAX_JAIL_COUNT or jail_policy == 'pay':
+                row[JAIL_POSITION + dice_value] += non_doubles[dice_value]
+            else:
+                row[JAIL_STATE + jail_count + 1] += non_doubles[dice_value]
+
+    matrix.flags.writeable = False
+    return matrix
+
+
+@lru_cache(maxsize=None)
+def get_stationary_distribution(jail_policy='wait', chest_jail_card=False):
+    """ Return the long run probability of each state at the end of a turn.
+
+    :param jail_policy: (str) see get_transition_matrix
+    :param chest_jail_card: (bool) see get_transition_matrix
+    :return: (np.ndarray) read-only array of length N_STATES
+    """
+    matrix = get_transition_matrix(jail_policy, chest_jail_card)
+    # Solve pi (P - I) = 0 with sum(pi) = 1, replacing one (redundant) equation with the normalization
+    system = matrix.T - np.eye(N_STATES)
+    system[-1] = 1.
+    rhs = np.zeros(N_STATES)
+    rhs[-1] = 1.
+    distribution = np.linalg.solve(system, rhs)
+    distribution[np.abs(distribution) < 1e-15] = 0.
+    distribution.flags.writeable = False
+    return distribution
+
+
+def get_n_step_distribution(n_turns, start=0, jail_policy='wait', chest_jail_card=False):
+    """ Return the probability of each state after n_turns turns.
+
+    :param n_turns: (int) number of turns
+    :param start: (int) starting state (0 is Go)
+    :param jail_policy: (str) see get_transition_matrix
+    :param chest_jail_card: (bool) see get_transition_matrix
+    :return: (np.ndarray) array of length N_STATES
+    """
+    matrix = get_transition_matrix(jail_policy, chest_jail_card)
+    distribution = np.zeros(N_STATES)
+    distribution[start] = 1.
+    for _ in range(n_turns):
+        distribution = distribution @ matrix
+    return distribution
+
+
+def to_cells(distribution):
+    """ Fold the jail states of a distribution into the jail cell.
+
+    :param distribution: (np.ndarray) array of length N_STATES
+    :return: (np.ndarray) array of length BOARD_SIZE
+    """
+    cells = np.array(distribution[:BOARD_SIZE])
+    cells[JAIL_POSITION] += distribution[JAIL_STATE:].sum()
+    return cells
+
+
+@lru_cache(maxsize=None)
+def get_hit_probabilities(jail_policy='wait', chest_jail_card=False):
+    """ Return the long run probability that a turn ends up playing each cell with each dice value, i.e. the player
+        moves to the cell with a normal roll (players leaving the jail don't play the cell where they end). Summing
+        over the dice values gives the probability that a cell is played in a turn, e.g. that a rent is paid.
+
+    :param jail_policy: (str) see get_transition_matrix
+    :param chest_jail_card: (bool) see get_transition_matrix
+    :return: (np.ndarray) read-only array of shape (BOARD_SIZE, 13), index: (cell, dice value)
+    """
+    distribution = get_stationary_distribution(jail_policy, chest_jail_card)
+    doubles, non_doubles = get_dice_probabilities()
+    hits = np.zeros((BOARD_SIZE, 13))
+    for dice_value in range(2, 13):
+        hits[:, dice_value] = np.roll(distribution[:BOARD_SIZE], dice_value) * (doubles[dice_value] +
+                                                                                 non_doubles[dice_value])
+    hits.flags.writeable = False
+    return hits
+
+
+@lru_cache(maxsize=None)
+def get_landing_probabilities(jail_policy='wait', chest_jail_card=False):
+    """ Return the long run probability of each cell at the end of a turn (the jail cell includes the players in
+        jail). E.g. the probability that a property is landed on in a turn, when the player ends the turn there.
+
+    :param jail_policy: (str) see get_transition_matrix
+    :param chest_jail_card: (bool) see get_transition_matrix
+    :return: (np.ndarray) read-only array of length BOARD_SIZE
+    """
+    cells = to_cells(get_stationary_distribution(jail_policy, chest_jail_card))
+    cells.flags.writeable = False
+    return cells
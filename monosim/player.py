@@ -1,9 +1,10 @@
-from monosim.board import get_color_to_house_mapping
+from monosim.board import get_color_to_house_mapping, get_catalog
+from monosim.logs import logger, enable_output, TURNS, DECISIONS, ECONOMY
+from monosim import profiling
+from time import perf_counter
+from monosim.trace import DICE, MOVE, BUY, RENT, TAX, MORTGAGE, UNMORTGAGE, HOUSE, HOTEL, CARD, JAIL, JAIL_EXIT, \
+    BANKRUPT, CARD_INDEX
 import random
-#  TODO allow user to set verbosity. Text should be printed only if verbosity=1 is set.
-#   Add paramenter to the constructor and a ad-hoc function set_verbosity().
-#   Do this first otherwise it's impossible to run the simulations with jupyter notebooks because of the excessive
-#   amount of text in the output.
 # TODO make test function to check if the _list_mortgaged_roads is properly used. DO not mortgage properties
 #  from this list Check that attribute _properties_total_mortgageable_amount and _list_mortgaged_roads always sum up
 #  to the same value
@@ -11,9 +12,17 @@ import random
 #   not possible to buy a house (check the rules)
 #  TODO Implement cards functionality (opportunity, etc.)
 
+#  Yes/no decision hooks of Player, which strategies, rollouts and environments can take in its place
+DECISION_HOOKS = ('buy_or_bid', 'mortgage_or_bid', 'want_to_buy_house_hotel', 'want_to_unmortgage', 'pay_jail_or_wait')
+#  Answers of each decision hook: no ('bid', 'wait', False) at index 0, yes ('buy', 'mortgage', 'pay', True) at index 1
+DECISION_ANSWERS = {'buy_or_bid': ('bid', 'buy'), 'mortgage_or_bid': ('bid', 'mortgage'),
+                    'want_to_buy_house_hotel': (False, True), 'want_to_unmortgage': (False, True),
+                    'pay_jail_or_wait': ('wait', 'pay')}
+
 
 class Player:
-    def __init__(self, name, number, bank, list_board, dict_roads, dict_properties, community_cards_deck):
+    def __init__(self, name, number, bank, list_board, dict_roads, dict_properties, community_cards_deck, rng=None,
+                 verbosity=0):
         self._name = name
         self._number = number
         self._list_board = list_board
@@ -39,9 +48,136 @@ class Player:
         self._dict_owned_colors = {'brown': False, 'light_blue': False, 'purple': False, 'orange': False,
                                    'red': False, 'yellow': False, 'green': False, 'blue': False}
         self._dict_owned_houses_hotels = {}
+        # Holdings as bitmasks over the purchasable cells (see Catalog.bits and Catalog.color_masks)
+        self._owned_mask = 0
+        self._mortgaged_mask = 0
+        self._color_sets_mask = 0
         self._has_lost = False
         self.color_to_house_mapping = get_color_to_house_mapping()
+        self._catalog = get_catalog()
         self.community_cards_deck = community_cards_deck
+        # Random generator of the game. The global random module is used if the game doesn't provide one.
+        self._rng = rng if rng is not None else random
+        self._game = None
+        self._tracer = None
+        self._profiler = None
+        self._verbosity = 0
+        self.set_verbosity(verbosity)
+
+    def reset(self):
+        """ Reset the player's state to the beginning of a game (cash 1500, position 0, no properties, etc.) in place,
+            reusing its lists and dicts. The random generator, the game, the opponents, the tracer and the verbosity
+            are kept. Subclasses with additional state of the game should extend this function (see Game.reset).
+
+        :return: None
+        """
+        self._position = 0
+        self._dice_value = 0
+        self._cash = 1500
+        self._properties_total_mortgageable_amount = 0
+        self._exit_jail = False
+        self._jail_count = 0
+        self._free_visit = False
+        self._list_owned_roads.clear()
+        self._list_owned_stations.clear()
+        self._list_owned_utilities.clear()
+        self._list_mortgaged_roads.clear()
+        self._list_mortgaged_stations.clear()
+        self._list_mortgaged_utilities.clear()
+        for color in self._dict_owned_colors:
+            self._dict_owned_colors[color] = False
+        self._dict_owned_houses_hotels.clear()
+        self._owned_mask = 0
+        self._mortgaged_mask = 0
+        self._color_sets_mask = 0
+        self._has_lost = False
+
+    def release_holdings(self):
+        """ Give up all the properties, houses and hotels of the player, e.g. when it leaves a game with
+            last_player_standing (see Game). The board and the bank are updated by the game.
+
+        :return: (tuple) (number of houses, number of hotels) released
+        """
+        houses = sum(houses for houses, _ in self._dict_owned_houses_hotels.values())
+        hotels = sum(hotels for _, hotels in self._dict_owned_houses_hotels.values())
+        self._properties_total_mortgageable_amount = 0
+        self._list_owned_roads.clear()
+        self._list_owned_stations.clear()
+        self._list_owned_utilities.clear()
+        self._list_mortgaged_roads.clear()
+        self._list_mortgaged_stations.clear()
+        self._list_mortgaged_utilities.clear()
+        for color in self._dict_owned_colors:
+            self._dict_owned_colors[color] = False
+        self._dict_owned_houses_hotels.clear()
+        self._owned_mask = 0
+        self._mortgaged_mask = 0
+        self._color_sets_mask = 0
+        return houses, hotels
+
+    def get_learner_state(self):
+        """ Get the state a learning player keeps across games (e.g. the q-values of a k-arm player), to save it in
+            checkpoints (see monosim.sweep). By default, the public attributes added by subclasses. Subclasses can
+            override it, together with set_learner_state.
+
+        :return: (dict) key: attribute name, value: attribute value
+        """
+        return {key: value for key, value in self.__dict__.items()
+                if not key.startswith('_') and key not in ('color_to_house_mapping', 'community_cards_deck')}
+
+    def set_learner_state(self, dict_state):
+        """ Restore the state returned by get_learner_state.
+
+        :param dict_state: (dict) key: attribute name, value: attribute value
+        :return: None
+        """
+        self.__dict__.update(dict_state)
+
+    def set_rng(self, rng):
+        """ Set the random generator used by the player (e.g. random.Random(seed)). Players of the same game should
+            share the same generator, so that the game is reproducible from its seed without seeding the global
+            random module.
+
+        :param rng: (random.Random) Random generator
+        :return: None
+        """
+        self._rng = rng
+
+    def set_game(self, game):
+        """ Set the game the player is playing (see monosim.game.Game). Players that need to look at the whole game
+            to take decisions (e.g. to simulate its continuations) can use it.
+
+        :param game: (Game) Game
+        :return: None
+        """
+        self._game = game
+
+    def set_verbosity(self, verbosity):
+        """ Set which events of the player are logged (see monosim.logs): 0 nothing, 1 turns, 2 decisions,
+            3 payments. Messages are printed on the standard output unless the 'monosim' logger is configured.
+
+        :param verbosity: (int) Verbosity level
+        :return: None
+        """
+        self._verbosity = verbosity
+        if verbosity > 0:
+            enable_output()
+
+    def set_tracer(self, tracer):
+        """ Record the events of the player (dice, moves, purchases, rents, etc.) in a tracer (see monosim.trace).
+
+        :param tracer: (Tracer) Tracer. None disables tracing.
+        :return: None
+        """
+        self._tracer = tracer
+
+    def set_profiler(self, profiler):
+        """ Count and time the branches of play() in a profiler (see monosim.profiling).
+
+        :param profiler: (Profiler) Profiler. None disables profiling.
+        :return: None
+        """
+        self._profiler = profiler
 
     def roll_dice(self):
         """ Simulate the roll of two dice. Returns two int values between 1 and 6.
@@ -49,9 +185,8 @@ class Player:
         :return: (tuple) two int values between 1 and 6 drawn from a uniform distribution.
         """
 
-        x = random.randint(1, 6)
-        y = random.randint(1, 6)
-        return x, y
+        randint = self._rng.randint
+        return randint(1, 6), randint(1, 6)
 
     def get_state(self):
         """ Get the player's state. The state contains information such as position, roads owned, money, mortgaged
@@ -70,19 +205,55 @@ class Player:
                 'owned_houses_hotels': self._dict_owned_houses_hotels, 'has_lost': self._has_lost,
                 'bank_cash': self._bank['cash']}
 
+    def get_snapshot(self):
+        """ Get a compact copy of the player's state, that can be restored with restore_snapshot. Unlike get_state,
+            the snapshot doesn't hold references to the player's lists and dicts. Subclasses with additional state
+            should extend both functions.
+
+        :return: (tuple) snapshot of the player's state
+        """
+
+        return (self._position, self._dice_value, self._cash, self._properties_total_mortgageable_amount,
+                self._exit_jail, self._jail_count, self._free_visit, self._has_lost, self._owned_mask,
+                self._mortgaged_mask, self._color_sets_mask, tuple(self._list_owned_roads),
+                tuple(self._list_owned_stations), tuple(self._list_owned_utilities), tuple(self._list_mortgaged_roads),
+                tuple(self._list_mortgaged_stations), tuple(self._list_mortgaged_utilities),
+                tuple(self._dict_owned_colors.values()), tuple(self._dict_owned_houses_hotels.items()))
+
+    def restore_snapshot(self, snapshot):
+        """ Restore the player's state from a snapshot returned by get_snapshot. Lists and dicts are updated in
+            place. State appended to the snapshot by subclasses is ignored, so that the snapshot of a subclass can
+            be restored in a Player (e.g. in the shadow games of monosim.rollout).
+
+        :param snapshot: (tuple) snapshot of the player's state
+        :return: None
+        """
+
+        (self._position, self._dice_value, self._cash, self._properties_total_mortgageable_amount, self._exit_jail,
+         self._jail_count, self._free_visit, self._has_lost, self._owned_mask, self._mortgaged_mask,
+         self._color_sets_mask, self._list_owned_roads[:], self._list_owned_stations[:],
+         self._list_owned_utilities[:], self._list_mortgaged_roads[:], self._list_mortgaged_stations[:],
+         self._list_mortgaged_utilities[:], owned_colors, owned_houses_hotels) = snapshot[:19]
+        self._dict_owned_colors.update(zip(self._dict_owned_colors, owned_colors))
+        self._dict_owned_houses_hotels.clear()
+        self._dict_owned_houses_hotels.update(owned_houses_hotels)
+
     def set_cash(self, amount):
         self._cash = amount
 
-    def meet_other_players(self, list_players):
+    def meet_other_players(self, list_players, dict_players=None):
         """ Get opponent players. Create dict {'name': Player} of players.
 
         :param list_players: (list) players objects of the other opponents
+        :param dict_players: (dict) {'name': Player} of the players of the game, shared by all the players (see
+                             Game). If None, a dict of the opponents is created.
         :return:
         """
         self._list_players = list_players
 
         # dict of players easier/faster to use later
-        self._dict_players = {player._name: player for player in list_players}
+        self._dict_players = dict_players if dict_players is not None else \
+            {player._name: player for player in list_players}
 
     def have_enough_money(self, amount, plus_mortgageable=False):
         """ Determine if the player has enough money. The required amount is passed as parameter (amount).
@@ -123,6 +294,11 @@ class Player:
         :return: None
         """
 
+        if self._tracer is not None:
+            self._tracer.record(TAX, self._number, 0, tax_amount)
+        if self._verbosity >= ECONOMY:
+            logger.info('%s pays tax %d', self._name, tax_amount,
+                        extra={'event': 'tax', 'player': self._name, 'amount': tax_amount})
         if self.have_enough_money(tax_amount):
             self.pay_bank(tax_amount)
         else:
@@ -162,30 +338,14 @@ class Player:
         dict_road_info['belongs_to'] = self._name
         self._list_owned_roads.append(road_name)
         self._dict_owned_houses_hotels[road_name] = (0, 0)
+        self._add_holding(dict_road_info['board_num'])
         # mortgage value
         self._properties_total_mortgageable_amount += dict_road_info['mortgage_value']
-
-        color = dict_road_info['color']
-        count_roads_of_color = 0
-        for road in self._list_owned_roads:
-            if color == self._dict_roads[road]['color']:
-                count_roads_of_color += 1
-        if color == 'brown' and count_roads_of_color == 2:
-            self._dict_owned_colors[color] = True
-        elif color == 'light_blue' and count_roads_of_color == 3:
-            self._dict_owned_colors[color] = True
-        elif color == 'purple' and count_roads_of_color == 3:
-            self._dict_owned_colors[color] = True
-        elif color == 'orange' and count_roads_of_color == 3:
-            self._dict_owned_colors[color] = True
-        elif color == 'red' and count_roads_of_color == 3:
-            self._dict_owned_colors[color] = True
-        elif color == 'yellow' and count_roads_of_color == 3:
-            self._dict_owned_colors[color] = True
-        elif color == 'green' and count_roads_of_color == 3:
-            self._dict_owned_colors[color] = True
-        elif color == 'blue' and count_roads_of_color == 2:
-            self._dict_owned_colors[color] = True
+        if self._tracer is not None:
+            self._tracer.record(BUY, self._number, dict_road_info['board_num'], road_price)
+        if self._verbosity >= ECONOMY:
+            logger.info('%s buys %s for %d', self._name, road_name, road_price,
+                        extra={'event': 'buy', 'player': self._name, 'amount': road_price})
 
     def buy_property(self, dict_property_info):
         """ Buy property (station or utility)
@@ -211,8 +371,47 @@ class Player:
             self._list_owned_utilities.append(property_name)
         else:
             raise Exception('Property type {} does not exist'.format(property_type))
+        self._add_holding(dict_property_info['board_num'])
         # mortgage value
         self._properties_total_mortgageable_amount += dict_property_info['mortgage_value']
+        if self._tracer is not None:
+            self._tracer.record(BUY, self._number, dict_property_info['board_num'], property_price)
+        if self._verbosity >= ECONOMY:
+            logger.info('%s buys %s for %d', self._name, property_name, property_price,
+                        extra={'event': 'buy', 'player': self._name, 'amount': property_price})
+
+    def _add_holding(self, position):
+        """ Add a property bought to the bitmasks of the holdings (see get_holdings_key) and mark its color set as
+            owned if it is complete.
+
+        :param position: (int) board position of the property
+        :return: None
+        """
+        catalog = self._catalog
+        self._owned_mask |= catalog.bits[position]
+        color = catalog.colors[position]
+        if color is not None:
+            color_mask = catalog.color_masks[color]
+            if self._owned_mask & color_mask == color_mask:
+                self._dict_owned_colors[color] = True
+                self._color_sets_mask |= color_mask
+
+    def _update_holdings(self):
+        """ Derive the bitmasks of the holdings (see get_holdings_key) and the color sets owned from the lists of
+            owned and mortgaged properties. Used by play() to catch up with subclasses which update the lists
+            without _add_holding (e.g. with a copy of the body of buy, as in the notebooks).
+
+        :return: None
+        """
+        catalog = self._catalog
+        self._owned_mask = 0
+        self._color_sets_mask = 0
+        for property_name in self._list_owned_roads + self._list_owned_stations + self._list_owned_utilities:
+            self._add_holding(catalog.position_of[property_name])
+        self._mortgaged_mask = 0
+        for property_name in self._list_mortgaged_roads + self._list_mortgaged_stations + \
+                self._list_mortgaged_utilities:
+            self._mortgaged_mask |= catalog.bits[catalog.position_of[property_name]]
 
     def pay_rent(self, dict_property_info, amount):
         """ Pay the rent to the owner of the property.
@@ -223,6 +422,11 @@ class Player:
         """
 
         opponent_name = dict_property_info['belongs_to']
+        if self._tracer is not None:
+            self._tracer.record(RENT, self._number, dict_property_info['board_num'], amount)
+        if self._verbosity >= ECONOMY:
+            logger.info('%s pays rent %d to %s for %s', self._name, amount, opponent_name, dict_property_info['name'],
+                        extra={'event': 'rent', 'player': self._name, 'amount': amount})
         self.pay_opponent(opponent_name, amount)
 
     def bid(self, dict_road_info, player_offer):
@@ -259,8 +463,14 @@ class Player:
         else:
             raise Exception('Property type {} unknown'.format(property_type))
 
+        self._mortgaged_mask |= self._catalog.bits[self._catalog.position_of[property_name]]
         self._properties_total_mortgageable_amount -= mortgage_value
         self._cash += mortgage_value
+        if self._tracer is not None:
+            self._tracer.record(MORTGAGE, self._number, self._catalog.position_of[property_name], mortgage_value)
+        if self._verbosity >= ECONOMY:
+            logger.info('%s mortgages %s for %d', self._name, property_name, mortgage_value,
+                        extra={'event': 'mortgage', 'player': self._name, 'amount': mortgage_value})
 
     def unmortgage(self, property_name, property_type):
         """ Unmortgage property.
@@ -294,9 +504,15 @@ class Player:
         else:
             raise Exception('Property type {} unknown'.format(property_type))
 
+        self._mortgaged_mask &= ~self._catalog.bits[self._catalog.position_of[property_name]]
         self._properties_total_mortgageable_amount += mortgage_value
         self._cash -= unmortgage_value
         self._bank['cash'] = unmortgage_value
+        if self._tracer is not None:
+            self._tracer.record(UNMORTGAGE, self._number, self._catalog.position_of[property_name], unmortgage_value)
+        if self._verbosity >= ECONOMY:
+            logger.info('%s unmortgages %s for %d', self._name, property_name, unmortgage_value,
+                        extra={'event': 'unmortgage', 'player': self._name, 'amount': unmortgage_value})
 
     def choose_mortgage_properties(self, amount):
         """ Return a list of properties to mortgage given a required amount. This function
@@ -381,6 +597,9 @@ class Player:
 
         if self._cash + self._properties_total_mortgageable_amount < amount_required:
             raise Exception('player {} has insufficient funds'.format(self._name))
+        profiler = self._profiler
+        if profiler is not None:
+            time_start = perf_counter()
 
         #  choose properties to mortgage
         list_properties = self.choose_mortgage_properties(amount_required)
@@ -388,6 +607,8 @@ class Player:
         #  mortgage properties
         for property in list_properties:
             self.mortgage(property[1], property[0])
+        if profiler is not None:
+            profiler.lap(profiling.MORTGAGE, time_start)
 
     def mortgage_and_pay_rent(self, dict_property_info):
         """ Mortgage the necessary properties to pay the rent for the given property.
@@ -403,6 +624,9 @@ class Player:
             raise Exception('player {} has money and should not mortgage'.format(self._name))
         if self._properties_total_mortgageable_amount + self._cash < property_rent:
             raise Exception('player {} cannot rent (insufficient funds)'.format(self._name))
+        profiler = self._profiler
+        if profiler is not None:
+            time_start = perf_counter()
 
         #  choose properties to mortgage
         list_properties = self.choose_mortgage_properties(amount_required)
@@ -410,6 +634,8 @@ class Player:
         #  mortgage properties
         for property in list_properties:
             self.mortgage(property[1], property[0])
+        if profiler is not None:
+            profiler.lap(profiling.MORTGAGE, time_start)
 
         self.pay_rent(dict_property_info, property_rent)
 
@@ -497,19 +723,15 @@ class Player:
         if opponent_name is None:
             raise Exception('{} does not belong to anyone'.format(dict_property_info['name']))
         opponent = self._dict_players[opponent_name]
-        property_name = dict_property_info['name']
 
-        road_color = dict_property_info['color']
-        if opponent.has_all_roads_of_color(road_color):
-            houses, hotel = opponent.get_houses_hotel_count(property_name)
-            if hotel == 0 and houses == 0:
-                rent = dict_property_info['rent_with_color_set']
-            else:
-                rent = dict_property_info['rent_with_{}_houses_{}_hotels'.format(houses, hotel)]
+        # Development level: 0 without color set, 1 + houses + hotels otherwise (see Catalog.rents)
+        if opponent.has_all_roads_of_color(dict_property_info['color']):
+            houses, hotel = opponent.get_houses_hotel_count(dict_property_info['name'])
+            level = 1 + houses + hotel
         else:
-            rent = dict_property_info['rent']
+            level = 0
 
-        return rent
+        return self._catalog.rents[dict_property_info['board_num']][level]
 
     def estimate_rent_station(self, dict_property_info):
         """ Given a station, estimate how much rent needs to be paid based on the other player's owned properties.
@@ -519,25 +741,18 @@ class Player:
         :return: (int) Rent amount
         """
 
-        opponent_name, property_name = dict_property_info['belongs_to'], dict_property_info['name']
+        opponent_name = dict_property_info['belongs_to']
         if opponent_name is None:
             raise Exception('{} does not belong to anyone'.format(dict_property_info['name']))
-        opponent = self._dict_players[opponent_name]
-        num_of_stations = opponent.get_owned_stations_count()
+        num_of_stations = self._dict_players[opponent_name].get_owned_stations_count()
 
         if dict_property_info['type'] != 'station':
             raise Exception('Property type must be of type "station"')
 
-        if num_of_stations == 1:
-            return 25
-        elif num_of_stations == 2:
-            return 50
-        elif num_of_stations == 3:
-            return 100
-        elif num_of_stations == 4:
-            return 200
-        else:
+        station_rents = self._catalog.station_rents
+        if not 0 < num_of_stations < len(station_rents):
             raise Exception("The maximum number of stations is 4.")
+        return station_rents[num_of_stations]
 
     def estimate_rent_utility(self, dict_property_info):
         """ Given a utility, estimate how much rent needs to be paid based on the other player's owned properties.
@@ -548,21 +763,18 @@ class Player:
         :return: (int) Rent amount
         """
 
-        opponent_name, property_name = dict_property_info['belongs_to'], dict_property_info['name']
+        opponent_name = dict_property_info['belongs_to']
         if opponent_name is None:
             raise Exception('{} does not belong to anyone'.format(dict_property_info['name']))
-        opponent = self._dict_players[opponent_name]
-        num_of_utilities = opponent.get_owned_utilities_count()
+        num_of_utilities = self._dict_players[opponent_name].get_owned_utilities_count()
 
         if dict_property_info['type'] != 'utility':
             raise Exception('Property type must be of type "utility"')
 
-        if num_of_utilities == 1:
-            return self._dice_value * 4
-        elif num_of_utilities == 2:
-            return self._dice_value * 10
-        else:
+        utility_multipliers = self._catalog.utility_multipliers
+        if not 0 < num_of_utilities < len(utility_multipliers):
             raise Exception("The maximum number of utilities is 2.")
+        return self._dice_value * utility_multipliers[num_of_utilities]
 
     def estimate_rent(self, dict_property_info):
         """ Given a property or road, estimate how much rent needs to be paid based on the other player's owned
@@ -590,6 +802,11 @@ class Player:
         """
         if self._properties_total_mortgageable_amount + self._cash < value_to_pay:
             self._has_lost = True
+            if self._tracer is not None:
+                self._tracer.record(BANKRUPT, self._number, self._position, value_to_pay)
+            if self._verbosity >= ECONOMY:
+                logger.info('%s is bankrupt, cannot pay %d', self._name, value_to_pay,
+                            extra={'event': 'bankrupt', 'player': self._name, 'amount': value_to_pay})
         return self._has_lost
 
     def get_tax_value(self, tax_type):
@@ -610,13 +827,14 @@ class Player:
 
         :return: (bool) True if players owns at least one color.
         """
-        if self._dict_owned_colors['brown'] or self._dict_owned_colors['light_blue'] or \
-                self._dict_owned_colors['purple'] or self._dict_owned_colors['orange'] or \
-                self._dict_owned_colors['red'] or self._dict_owned_colors['yellow'] or \
-                self._dict_owned_colors['green'] or self._dict_owned_colors['blue']:
-                    return True
-        else:
-            return False
+        return self._color_sets_mask != 0
+
+    def get_holdings_key(self):
+        """ Return a compact and hashable representation of the properties owned and mortgaged by the player.
+
+        :return: (tuple) (owned bitmask, mortgaged bitmask). See Catalog.bits for the bit of each cell.
+        """
+        return self._owned_mask, self._mortgaged_mask
 
     def want_to_buy_house_hotel(self):
         """ Determine if the player wants to buy a house or a hotel. This function should be used only if the player
@@ -692,6 +910,11 @@ class Player:
             houses_owned = self._dict_owned_houses_hotels[road][0]
             self._dict_owned_houses_hotels[road] = (houses_owned + 1, 0)
             self._bank['houses'] -= 1
+            if self._tracer is not None:
+                self._tracer.record(HOUSE, self._number, self._catalog.position_of[road], house_price)
+            if self._verbosity >= ECONOMY:
+                logger.info('%s buys a house in %s for %d', self._name, road, house_price,
+                            extra={'event': 'house', 'player': self._name, 'amount': house_price})
         else:
             raise Exception('The bank has no more houses to sell.')
 
@@ -717,6 +940,11 @@ class Player:
                                 "4 houses are not owned first".format(self._name, road))
             self._dict_owned_houses_hotels[road] = (houses_owned, 1)
             self._bank['hotels'] -= 1
+            if self._tracer is not None:
+                self._tracer.record(HOTEL, self._number, self._catalog.position_of[road], hotel_price)
+            if self._verbosity >= ECONOMY:
+                logger.info('%s buys a hotel in %s for %d', self._name, road, hotel_price,
+                            extra={'event': 'hotel', 'player': self._name, 'amount': hotel_price})
         else:
             raise Exception('The bank has no more hotels to sell.')
 
@@ -744,11 +972,15 @@ class Player:
         """ Move the player in the jail cell. Change player position to 10. Used when the player ends in the cell
             30 (go to jail) or when chances and opportunity cards say to do so."""
         self._position = 10
+        if self._tracer is not None:
+            self._tracer.record(JAIL, self._number, 10)
 
     def get_out_of_jail(self):
         """ Player leaves the jail. Jail count is set to zero and the position updated with the latest dices values"""
         self._jail_count = 0
         self._position = (self._position + self._dice_value)
+        if self._tracer is not None:
+            self._tracer.record(JAIL_EXIT, self._number, self._position)
 
     def pay_jail_or_wait(self):
         """ Determine whether the player wants to wait the next turn or pay to get out of the jail. This is used
@@ -794,6 +1026,11 @@ class Player:
         :return:
         """
 
+        if self._tracer is not None:
+            self._tracer.record(CARD, self._number, CARD_INDEX[board_cell_name])
+        if self._verbosity >= ECONOMY:
+            logger.info('%s draws the community chest card %s', self._name, board_cell_name,
+                        extra={'event': 'card', 'player': self._name, 'amount': None})
         if board_cell_name == 'street_repair':
             self.community_chest_street_repair()
         elif board_cell_name == 'stock_sale':
@@ -824,8 +1061,14 @@ class Player:
 
     def play(self):
 
+        profiler = self._profiler
+        if profiler is not None:
+            time_start = perf_counter()
         tuple_dices = self.roll_dice()
         self._dice_value = tuple_dices[0] + tuple_dices[1]
+        tracer = self._tracer
+        if tracer is not None:
+            tracer.record(DICE, self._number, tuple_dices[0], tuple_dices[1])
         if self._position is not 10 or (self._position == 10 and self._free_visit):  # if player is not in jail
             self._position = (self._position + self._dice_value) % len(self._list_board)
             self._free_visit = True if self._position == 10 else False
@@ -833,6 +1076,14 @@ class Player:
             # check if player passed Go. If yes, get 200 $
             if self._position - self._dice_value < 0:
                 self._cash += 200
+            if tracer is not None:
+                tracer.record(MOVE, self._number, self._position, self._cash)
+        if self._verbosity >= TURNS:
+            logger.info('%s rolls %d and %d, position %d (%s), cash %d', self._name, tuple_dices[0], tuple_dices[1],
+                        self._position, self._list_board[self._position]['name'], self._cash,
+                        extra={'event': 'move', 'player': self._name, 'amount': self._cash})
+        if profiler is not None:
+            time_start = profiler.lap(profiling.MOVE, time_start)
 
         board_cell = self._list_board[self._position]
         board_cell_type = board_cell['type']
@@ -841,6 +1092,9 @@ class Player:
         if self.owns_all_roads_of_a_color() and self.want_to_buy_house_hotel():
 
             road, house_or_hotel = self.choose_house_hotel_to_buy()
+            if self._verbosity >= DECISIONS:
+                logger.info('%s wants to buy a %s in %s', self._name, house_or_hotel, road,
+                            extra={'event': 'decision', 'player': self._name, 'amount': None})
             if house_or_hotel == 'house' and self._bank['houses'] > 0 and self._dict_owned_houses_hotels[road][0] < 4:
                 house_price = self._dict_roads[road]['houses_cost']
                 if self.have_enough_money(house_price):
@@ -859,12 +1113,19 @@ class Player:
                         if self._properties_total_mortgageable_amount + self._cash >= hotel_price:
                             self.get_money_from_mortgages(hotel_price)
                             self.buy_hotel(road)
+            if profiler is not None:
+                time_start = profiler.lap(profiling.BUILD, time_start)
 
         # Unmortgage property
         if self._properties_total_mortgageable_amount > 0 and self.want_to_unmortgage():
             list_unmortgage_properties = self.choose_unmortgage_properties()
+            if self._verbosity >= DECISIONS and list_unmortgage_properties:
+                logger.info('%s wants to unmortgage %s', self._name, [name for _, name in list_unmortgage_properties],
+                            extra={'event': 'decision', 'player': self._name, 'amount': None})
             for property_type, property_name in list_unmortgage_properties:
                 self.unmortgage(property_name, property_type)
+            if profiler is not None:
+                time_start = profiler.lap(profiling.UNMORTGAGE, time_start)
 
         if board_cell_type == 'jail' and not self._free_visit:
             # Double roll
@@ -885,7 +1146,11 @@ class Player:
 
             # Player decides to pay or wait in jail
             else:
-                if self.pay_jail_or_wait() == 'wait':
+                pay_or_wait = self.pay_jail_or_wait()
+                if self._verbosity >= DECISIONS:
+                    logger.info('%s decides to %s in jail', self._name, pay_or_wait,
+                                extra={'event': 'decision', 'player': self._name, 'amount': None})
+                if pay_or_wait == 'wait':
                     self._jail_count += 1
                 else:
                     if self.have_enough_money(50):
@@ -896,16 +1161,21 @@ class Player:
                             self.get_money_from_mortgages(50)
                             self.pay_bank(50)
                             self.get_out_of_jail()
+            if profiler is not None:
+                profiler.lap(profiling.JAIL, time_start)
 
         elif board_cell_type == 'road' or board_cell_type == 'station' or board_cell_type == 'utility':
             property_name = board_cell['name']
             dict_property_info = self._dict_roads[property_name] if board_cell_type == 'road' else self._dict_properties[property_name]
             property_owner = dict_property_info['belongs_to']
-            if property_name in self._list_owned_roads or property_name in self._list_owned_stations or property_name in self._list_owned_utilities:
+            if property_owner == self._name:
                 pass
             elif property_owner is None:
                 if self.have_enough_money(dict_property_info['price']):
                     buy_bid = self.buy_or_bid(dict_property_info)
+                    if self._verbosity >= DECISIONS:
+                        logger.info('%s decides to %s %s', self._name, buy_bid, property_name,
+                                    extra={'event': 'decision', 'player': self._name, 'amount': None})
                     if buy_bid == 'buy' and board_cell_type == 'road':
                         self.buy(dict_property_info, property_name)
                     elif buy_bid == 'buy' and board_cell_type != 'road':
@@ -914,6 +1184,9 @@ class Player:
                         self.bid(dict_property_info, 'temp')
                 elif self.have_enough_money(dict_property_info['price'], plus_mortgageable=True):
                     mortgage_bid = self.mortgage_or_bid(dict_property_info)
+                    if self._verbosity >= DECISIONS:
+                        logger.info('%s decides to %s to buy %s', self._name, mortgage_bid, property_name,
+                                    extra={'event': 'decision', 'player': self._name, 'amount': None})
                     if mortgage_bid == 'mortgage':
                         self.mortgage_and_buy(dict_property_info, property_name, board_cell_type)
                     else:
@@ -921,6 +1194,10 @@ class Player:
                 else:
                     # Players with no money should bid
                     self.bid(dict_property_info, 'temp')
+                if dict_property_info['belongs_to'] == self._name and \
+                        not self._owned_mask & self._catalog.bits[self._position]:
+                    # Bought by an override of buy which updated the lists only (as in the notebooks)
+                    self._update_holdings()
             elif property_owner is not None and dict_property_info['is_mortgaged'] is False:
                 # Have enough money to rent?
                 rent = self.estimate_rent(dict_property_info)
@@ -930,21 +1207,31 @@ class Player:
                     if not self.is_bankrupt(rent):
                         self.mortgage_and_pay_rent(dict_property_info)
                 # self.make_offer(road_owner)  # This should be possible at any time in the game...
+            if profiler is not None:
+                profiler.lap(profiling.PURCHASE if property_owner is None else
+                             profiling.OTHER if property_owner == self._name else profiling.RENT, time_start)
 
         elif board_cell_type == 'go' or board_cell_type == 'free parking':
-            pass
+            if profiler is not None:
+                profiler.lap(profiling.OTHER, time_start)
 
         elif board_cell_type == 'tax':
             tax_amount = self.get_tax_value(board_cell['name'])
             self.pay_tax(tax_amount)
+            if profiler is not None:
+                profiler.lap(profiling.TAX, time_start)
 
         elif board_cell_type == 'go to jail':
             self.go_to_jail()
+            if profiler is not None:
+                profiler.lap(profiling.GO_TO_JAIL, time_start)
 
         elif board_cell_type == 'community chest':
             card_name = self.community_cards_deck[0]  # Choose top card
             self.community_cards_deck.append(self.community_cards_deck.pop(0))  # Put top card at the bottom of the deck
             self.play_community_chest(card_name)
+            if profiler is not None:
+                profiler.lap(profiling.COMMUNITY_CHEST, time_start)
 
     @property
     def cash(self):
@@ -0,0 +1,78 @@
+""" Counters and timers of the branches of Player.play.
+
+Profiling is opt-in: a Profiler is attached to a game with Game.set_profiler (or to single players with
+Player.set_profiler). Players without a profiler only check that the profiler is None at each branch.
+Sections of a play (SECTION_NAMES):
+    move: dice and move (counted once per play)
+    build: purchase of a house or a hotel (including the mortgages needed)
+    unmortgage: choice and unmortgage of properties
+    jail: turn in jail (double, payment or wait)
+    purchase: landing on a property without owner (buy, mortgage to buy or bid)
+    rent: landing on a property of an opponent (including the mortgages needed and bankruptcy)
+    tax, go_to_jail, community_chest: landing on those cells
+    other: landing on go, free parking or an owned property
+    mortgage: mortgage cascades (get_money_from_mortgages and mortgage_and_pay_rent). Nested in the sections above,
+              so its time is also counted in build, jail, purchase or rent.
+The time of a section is measured from the end of the previous section of the same play, so it includes the checks
+of the branches not taken. Profilers of many games are merged with Profiler.merge, e.g. by
+monosim.runner.profile_games, which plays a batch of games on several processes:
+    profiler = profile_games([Player, Player_no_brown], range(1000), n_workers=4)
+    print(profiler.format_report())
+"""
+from time import perf_counter
+
+#  Sections of Player.play
+MOVE, BUILD, UNMORTGAGE, JAIL, PURCHASE, RENT, TAX, GO_TO_JAIL, COMMUNITY_CHEST, OTHER, MORTGAGE = range(11)
+SECTION_NAMES = ('move', 'build', 'unmortgage', 'jail', 'purchase', 'rent', 'tax', 'go_to_jail', 'community_chest',
+                 'other', 'mortgage')
+
+
+class Profiler:
+    def __init__(self):
+        """ Counts and total times (in seconds) of the sections of Player.play (see the module description). """
+        self.counts = [0] * len(SECTION_NAMES)
+        self.times = [0.] * len(SECTION_NAMES)
+        self.games = 0
+
+    def lap(self, section, time_start):
+        """ Count a section which started at time_start and ended now.
+
+        :param section: (int) section (e.g. profiling.RENT)
+        :param time_start: (float) time.perf_counter() at the start of the section
+        :return: (float) time.perf_counter() now, the start of the next section
+        """
+        time_now = perf_counter()
+        self.counts[section] += 1
+        self.times[section] += time_now - time_start
+        return time_now
+
+    def merge(self, other):
+        """ Add the counts and times of another profiler (e.g. of another game).
+
+        :param other: (Profiler) profiler
+        :return: (Profiler) self
+        """
+        self.counts = [count + other_count for count, other_count in zip(self.counts, other.counts)]
+        self.times = [time + other_time for time, other_time in zip(self.times, other.times)]
+        self.games += other.games
+        return self
+
+    def get_report(self):
+        """ Return the counts and times of the sections.
+
+        :return: (dict) key: section name, value: dict with count, time (seconds), mean time (microseconds) and share
+                 of the total time of the sections (mortgage excluded, since it's nested)
+        """
+        total_time = sum(self.times[:MORTGAGE]) or 1.
+        return {name: {'count': count, 'time': time, 'mean_us': time / count * 1e6 if count else 0.,
+                       'share': time / total_time}
+                for name, count, time in zip(SECTION_NAMES, self.counts, self.times)}
+
+    def format_report(self):
+        """ Return the report as a readable table. """
+        list_lines = ['games: {} plays: {}'.format(self.games, self.counts[MOVE]),
+                      '{:<16}{:>12}{:>12}{:>12}{:>8}'.format('section', 'count', 'time (s)', 'mean (us)', 'share')]
+        for name, dict_section in self.get_report().items():
+            list_lines.append('{:<16}{:>12}{:>12.3f}{:>12.2f}{:>8.1%}'.format(
+                name, dict_section['count'], dict_section['time'], dict_section['mean_us'], dict_section['share']))
+        return '\n'.join(list_lines)
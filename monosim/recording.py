@@ -0,0 +1,126 @@
+""" Recordings of games with periodic checkpoints.
+
+A recording plays the game of a seed and stores a snapshot of the game (see Game.snapshot) every `interval` turns.
+Any turn of the game can then be reached by restoring the closest checkpoint and playing the few turns after it,
+instead of playing the game from the start. Since games are deterministic, the game continues exactly as it did
+when it was recorded.
+Recordings can be saved and compared, e.g. to find where two versions of the engine start to play a seed differently:
+    recording = load_recording('seed_313880.rec')
+    turn = recording.verify()  # first checkpoint not reproduced by the current engine
+    game = recording.seek(turn - recording.interval)
+    game.play_turn()  # step forward turn by turn
+"""
+from monosim.game import Game
+from monosim.board import get_board_data_hash
+import pickle
+
+
+class Recording:
+    def __init__(self, seed, list_player_factories, shuffle_players=True, interval=100):
+        """ Recording of the game of a seed. Call record() to play the game.
+
+        :param seed: (int) Random seed of the game
+        :param list_player_factories: (list) player classes (see Game). They must be picklable to save the recording.
+        :param shuffle_players: (bool) see Game
+        :param interval: (int) Number of turns between two checkpoints
+        """
+        self.seed = seed
+        self.list_player_factories = list(list_player_factories)
+        self.shuffle_players = shuffle_players
+        self.interval = interval
+        self.board_hash = get_board_data_hash()
+        self.dict_checkpoints = {}
+        self.result = None
+
+    def new_game(self):
+        """ Return a new game of the recorded seed, at turn 0. """
+        return Game(self.list_player_factories, self.seed, self.shuffle_players)
+
+    def record(self, max_turns=1000):
+        """ Play the game, storing a checkpoint at turn 0, every `interval` turns and at the end of the game.
+
+        :param max_turns: (int) Maximum number of turns of the game
+        :return: (dict) game result (see Game.get_result)
+        """
+        game = self.new_game()
+        self.dict_checkpoints = {0: game.snapshot()}
+        while not game.is_over() and game.get_turn() < max_turns:
+            game.play_turn()
+            if game.get_turn() % self.interval == 0:
+                self.dict_checkpoints[game.get_turn()] = game.snapshot()
+        self.dict_checkpoints[game.get_turn()] = game.snapshot()
+        self.result = game.get_result()
+        return self.result
+
+    def get_last_turn(self):
+        """ Return the last turn of the recorded game. """
+        return max(self.dict_checkpoints)
+
+    def seek(self, turn):
+        """ Return the game after the given number of turns have been played. The game is restored from the closest
+            checkpoint and can be played forward (e.g. with Game.play_turn or Game.play_next).
+
+        :param turn: (int) number of turns played
+        :return: (Game) game
+        """
+        if not self.dict_checkpoints:
+            raise Exception('The game of seed {} has not been recorded'.format(self.seed))
+        if not 0 <= turn <= self.get_last_turn():
+            raise Exception('Turn {} not recorded. Turns go from 0 to {}'.format(turn, self.get_last_turn()))
+        checkpoint_turn = max(checkpoint for checkpoint in self.dict_checkpoints if checkpoint <= turn)
+        return self._play_from(checkpoint_turn, turn)
+
+    def _play_from(self, checkpoint_turn, turn):
+        """ Restore a checkpoint and play until the given turn (or the end of the game). """
+        game = self.new_game()
+        game.restore(self.dict_checkpoints[checkpoint_turn])
+        while not game.is_over() and game.get_turn() < turn:
+            game.play_turn()
+        return game
+
+    def verify(self):
+        """ Play again each interval between two checkpoints with the current engine and compare the result with the
+            recorded checkpoint.
+
+        :return: (int) turn of the first checkpoint not reproduced, None if the whole game is reproduced
+        """
+        list_turns = sorted(self.dict_checkpoints)
+        for start_turn, end_turn in zip(list_turns, list_turns[1:]):
+            if self._play_from(start_turn, end_turn).snapshot() != self.dict_checkpoints[end_turn]:
+                return end_turn
+        return None
+
+    def save(self, path):
+        """ Save the recording in a file. """
+        with open(path, 'wb') as f:
+            pickle.dump(self, f)
+
+
+def load_recording(path):
+    """ Load a recording saved with Recording.save. """
+    with open(path, 'rb') as f:
+        recording = pickle.load(f)
+    if recording.board_hash != get_board_data_hash():
+        raise Exception('Recording {} was made with different board data'.format(path))
+    return recording
+
+
+def record_game(seed, list_player_factories, max_turns=1000, shuffle_players=True, interval=100):
+    """ Record the game of a seed. See Recording.
+
+    :return: (Recording) recording of the game
+    """
+    recording = Recording(seed, list_player_factories, shuffle_players, interval)
+    recording.record(max_turns)
+    return recording
+
+
+def find_divergence(recording, other_recording):
+    """ Compare the checkpoints of two recordings of the same seed (e.g. made by two versions of the engine).
+
+    :return: (int) first checkpoint turn where the games differ, None if all the common checkpoints are the same
+    """
+    for turn in sorted(set(recording.dict_checkpoints) & set(other_recording.dict_checkpoints)):
+        if recording.dict_checkpoints[turn] != other_recording.dict_checkpoints[turn]:
+            return turn
+    return None
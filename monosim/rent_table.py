@@ -0,0 +1,134 @@
+""" Expected rent and return on investment of roads, stations and utilities.
+
+For every purchasable cell and every development level the table holds the rent expected from an opponent in one of
+its turns (probability that the opponent plays the cell, see monosim.markov, times the rent), the money invested to
+reach the level and the payback time, i.e. the number of opponent turns needed to earn back the investment.
+Levels are the same indexes of the catalog tables (see monosim.board.Catalog):
+    * roads: 0 = no color set, 1 = color set, 2 to 5 = 1 to 4 houses, 6 = hotel (Catalog.rents)
+    * stations: number of stations owned, from 1 to 4 (Catalog.station_rents). Level 0 has no rent.
+    * utilities: number of utilities owned, 1 or 2 (Catalog.utility_multipliers). Level 0 has no rent.
+The rent of a utility is the expected dice value of the players landing on it times the multiplier.
+
+Tables are computed once and cached on disk, in a json file named after the hash of the board data (see
+monosim.board.get_board_data_hash), so they are computed again only when the board data change. Strategies can then
+look up expected rents and payback times in constant time, e.g.:
+    table = get_rent_table()
+    table['properties']['mayfair']['payback_turns'][6]
+"""
+from monosim.board import get_catalog, get_board_data_hash
+from monosim.markov import get_hit_probabilities
+from functools import lru_cache
+import numpy as np
+import json
+import os
+
+TABLE_VERSION = 1
+DEFAULT_CACHE_DIR = os.path.join(os.path.expanduser('~'), '.cache', 'monosim')
+
+
+def get_cache_dir():
+    """ Return the directory of the cached tables: $MONOSIM_CACHE_DIR if set, ~/.cache/monosim otherwise. """
+    return os.environ.get('MONOSIM_CACHE_DIR', DEFAULT_CACHE_DIR)
+
+
+def _get_investments(catalog, position):
+    """ Money invested to own a cell at each development level. """
+    price = catalog.prices[position]
+    if catalog.types[position] == 'road':
+        houses_cost = catalog.houses_costs[position]
+        return [price, price] + [price + houses * houses_cost for houses in range(1, 5)] + \
+               [price + 4 * houses_cost + catalog.hotels_costs[position]]
+    return [price] * len(catalog.station_rents if catalog.types[position] == 'station' else
+                         catalog.utility_multipliers)
+
+
+def compute_rent_table(jail_policy='wait', chest_jail_card=False):
+    """ Compute the table of expected rents. See the module description.
+
+    :param jail_policy: (str) jail policy of the opponents (see monosim.markov.get_transition_matrix)
+    :param chest_jail_card: (bool) see monosim.markov.get_transition_matrix
+    :return: (dict) Example: {'board_hash': 'ce3a...', 'jail_policy': 'wait', 'chest_jail_card': False,
+                              'properties': {'mayfair': {'position': 39, 'type': 'road', 'hit_probability': 0.021,
+                                                         'expected_rent': [...], 'investment': [...],
+                                                         'payback_turns': [...]}, ...}}
+    """
+    catalog = get_catalog()
+    hits = get_hit_probabilities(jail_policy, chest_jail_card)
+    dict_properties = {}
+    for name, position in catalog.position_of.items():
+        hit_probability = float(hits[position].sum())
+        cell_type = catalog.types[position]
+        if cell_type == 'road':
+            list_expected_rents = [hit_probability * rent for rent in catalog.rents[position]]
+        elif cell_type == 'station':
+            list_expected_rents = [hit_probability * rent for rent in catalog.station_rents]
+        else:
+            expected_dice = float(hits[position] @ np.arange(13))
+            list_expected_rents = [expected_dice * multiplier for multiplier in catalog.utility_multipliers]
+
+        list_investments = _get_investments(catalog, position)
+        dict_properties[name] = {
+            'position': position, 'type': cell_type, 'hit_probability': hit_probability,
+            'expected_rent': list_expected_rents, 'investment': list_investments,
+            'payback_turns': [investment / rent if rent > 0 else None
+                              for investment, rent in zip(list_investments, list_expected_rents)]}
+
+    return {'board_hash': get_board_data_hash(), 'jail_policy': jail_policy, 'chest_jail_card': chest_jail_card,
+            'properties': dict_properties}
+
+
+def get_rent_table_path(jail_policy='wait', chest_jail_card=False, cache_dir=None):
+    """ Return the path of the cached table for the current board data and the given rules. """
+    file_name = 'rent_table_v{}_{}_{}_{}.json'.format(TABLE_VERSION, get_board_data_hash()[:16], jail_policy,
+                                                      int(chest_jail_card))
+    return os.path.join(cache_dir if cache_dir is not None else get_cache_dir(), file_name)
+
+
+@lru_cache(maxsize=None)
+def get_rent_table(jail_policy='wait', chest_jail_card=False, cache_dir=None):
+    """ Return the table of expected rents, reading it from the disk cache or computing (and caching) it. The table
+        is shared by all the callers of the process and must not be modified.
+
+    :param jail_policy: (str) jail policy of the opponents (see monosim.markov.get_transition_matrix)
+    :param chest_jail_card: (bool) see monosim.markov.get_transition_matrix
+    :param cache_dir: (str) directory of the cached tables. Default is get_cache_dir().
+    :return: (dict) table (see compute_rent_table)
+    """
+    path = get_rent_table_path(jail_policy, chest_jail_card, cache_dir)
+    try:
+        with open(path, 'r') as f:
+            return json.load(f)
+    except (OSError, ValueError):
+        pass
+
+    table = compute_rent_table(jail_policy, chest_jail_card)
+    try:
+        os.makedirs(os.path.dirname(path), exist_ok=True)
+        # Write a temporary file first, so that concurrent processes never read a partial table
+        tmp_path = '{}.{}.tmp'.format(path, os.getpid())
+        with open(tmp_path, 'w') as f:
+            json.dump(table, f)
+        os.replace(tmp_path, path)
+    except OSError:
+        pass  # The cache is an optimization: a read-only file system is not an error
+    return table
+
+
+def get_expected_rent(property_name, level, jail_policy='wait', chest_jail_card=False):
+    """ Return the rent expected from an opponent in one of its turns for a property at the given level.
+
+    :param property_name: (str) name of the road, station or utility
+    :param level: (int) development level (see the module description)
+    :return: (float) expected rent
+    """
+    return get_rent_table(jail_policy, chest_jail_card)['properties'][property_name]['expected_rent'][level]
+
+
+def get_payback_turns(property_name, level, jail_policy='wait', chest_jail_card=False):
+    """ Return the number of opponent turns needed to earn back the money invested in a property at the given level.
+
+    :param property_name: (str) name of the road, station or utility
+    :param level: (int) development level (see the module description)
+    :return: (float) payback time in opponent turns. None if the level has no rent.
+    """
+    return get_rent_table(jail_policy, chest_jail_card)['properties'][property_name]['payback_turns'][level]
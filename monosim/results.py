@@ -0,0 +1,234 @@
+""" Streaming storage of game results.
+
+Results (see Game.get_result) are flattened in records with one column per value and written to disk as they arrive,
+so batches of any size can be stored with bounded memory. Supported formats, chosen by the file extension:
+    * .parquet: Parquet file, one row group per chunk of records (requires pyarrow)
+    * .arrow: Arrow IPC file, one record batch per chunk of records (requires pyarrow). The reader memory-maps it.
+    * .csv: CSV file with a header
+    * .jsonl: one json record per line
+Flattened records have the columns: seed, turns, starting_player, player_order, lost_players, winner and, for each
+player, cash_playerN and holdings_playerN. Lists of players are stored as comma separated names (None if empty).
+"""
+import csv
+import json
+import os
+
+try:
+    import pyarrow
+    import pyarrow.ipc
+    import pyarrow.parquet
+except ImportError:
+    pyarrow = None
+
+FORMATS = {'.parquet': 'parquet', '.arrow': 'arrow', '.csv': 'csv', '.jsonl': 'jsonl'}
+#  Results values with one value per player (in the order of their number)
+PLAYER_KEYS = ('cash', 'holdings')
+
+
+def flatten_result(result):
+    """ Flatten a game result in a record of scalar values.
+
+    :param result: (dict) game result (see Game.get_result)
+    :return: (dict) Example: {'seed': 3, 'turns': 120, 'starting_player': 'player2', 'player_order': 'player2,player1',
+                              'lost_players': 'player2', 'winner': 'player1', 'cash_player1': 1520,
+                              'cash_player2': -40, 'holdings_player1': 8396800, 'holdings_player2': 1090}
+    """
+    record = {}
+    for key, value in result.items():
+        if key in PLAYER_KEYS:
+            for idx, player_value in enumerate(value):
+                record['{}_player{}'.format(key, idx + 1)] = player_value
+        elif isinstance(value, tuple):
+            record[key] = ','.join(value) if value else None
+            if key == 'player_order':
+                record['starting_player'] = value[0]
+        else:
+            record[key] = value
+    return record
+
+
+def get_format(path):
+    """ Return the format of a results file from its extension. """
+    file_format = FORMATS.get(os.path.splitext(path)[1])
+    if file_format is None:
+        raise Exception('Results file {} not valid. Valid extensions are {}'.format(path, tuple(FORMATS)))
+    if file_format in ('parquet', 'arrow') and pyarrow is None:
+        raise Exception('pyarrow is required for {} files. Use a .csv or .jsonl file.'.format(file_format))
+    return file_format
+
+
+def _parse_csv_value(value):
+    """ Convert back a value read from a csv file. Empty values are None. """
+    if value == '':
+        return None
+    if value in ('True', 'False'):
+        return value == 'True'
+    for type_value in (int, float):
+        try:
+            return type_value(value)
+        except ValueError:
+            pass
+    return value
+
+
+class ResultsWriter:
+    def __init__(self, path, chunk_size=100000):
+        """ Write game results to a file, one chunk of records at a time. Use it as a context manager, or call close()
+            at the end. The columns are the ones of the first record.
+
+            Example:
+                with ResultsWriter('results.parquet') as writer:
+                    for result in iter_games([Player, Player], range(0, 10 ** 7)):
+                        writer.write(result)
+
+        :param path: (str) path of the file. The format is chosen from the extension (see the module description).
+        :param chunk_size: (int) Number of records held in memory before they are written
+        """
+        self._path = path
+        self._format = get_format(path)
+        self._chunk_size = chunk_size
+        self._columns = None
+        self._dict_buffer = None
+        self._n_buffered = 0
+        self._n_written = 0
+        self._schema = None
+        self._writer = None
+        self._file = None
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc_value, traceback):
+        self.close()
+
+    def get_count(self):
+        """ Return the number of records written (including the ones still buffered). """
+        return self._n_written + self._n_buffered
+
+    def write(self, result):
+        """ Write a game result.
+
+        :param result: (dict) game result (see Game.get_result) or flattened record (see flatten_result)
+        :return: None
+        """
+        record = flatten_result(result)
+        if self._columns is None:
+            self._columns = tuple(record)
+            self._dict_buffer = {column: [] for column in self._columns}
+        for column in self._columns:
+            self._dict_buffer[column].append(record.get(column))
+        self._n_buffered += 1
+        if self._n_buffered >= self._chunk_size:
+            self.flush()
+
+    def write_many(self, results):
+        """ Write all the results of an iterable (e.g. monosim.runner.iter_games).
+
+        :param results: (iterable) game results
+        :return: (int) number of records written
+        """
+        for result in results:
+            self.write(result)
+        return self.get_count()
+
+    def flush(self):
+        """ Write the buffered records to the file. """
+        if not self._n_buffered:
+            return
+        if self._format in ('parquet', 'arrow'):
+            self._flush_arrow()
+        else:
+            self._flush_text()
+        self._n_written += self._n_buffered
+        self._n_buffered = 0
+        for values in self._dict_buffer.values():
+            values.clear()
+
+    def _flush_arrow(self):
+        if self._schema is None:
+            self._schema = pyarrow.schema([(column, self._get_arrow_type(values))
+                                           for column, values in self._dict_buffer.items()])
+            if self._format == 'parquet':
+                self._writer = pyarrow.parquet.ParquetWriter(self._path, self._schema)
+            else:
+                self._file = pyarrow.OSFile(self._path, 'wb')
+                self._writer = pyarrow.ipc.new_file(self._file, self._schema)
+        batch = pyarrow.record_batch([pyarrow.array(self._dict_buffer[field.name], type=field.type)
+                                      for field in self._schema], schema=self._schema)
+        if self._format == 'parquet':
+            self._writer.write_table(pyarrow.Table.from_batches([batch]))
+        else:
+            self._writer.write_batch(batch)
+
+    @staticmethod
+    def _get_arrow_type(values):
+        """ Arrow type of a column, from the first value which is not None. Columns of None are strings. """
+        value = next((value for value in values if value is not None), '')
+        if isinstance(value, bool):
+            return pyarrow.bool_()
+        if isinstance(value, int):
+            return pyarrow.int64()
+        if isinstance(value, float):
+            return pyarrow.float64()
+        return pyarrow.string()
+
+    def _flush_text(self):
+        if self._file is None:
+            self._file = open(self._path, 'w', newline='')
+            if self._format == 'csv':
+                self._writer = csv.writer(self._file)
+                self._writer.writerow(self._columns)
+        list_columns = [self._dict_buffer[column] for column in self._columns]
+        if self._format == 'csv':
+            self._writer.writerows(zip(*list_columns))
+        else:
+            self._file.writelines(json.dumps(dict(zip(self._columns, row))) + '\n' for row in zip(*list_columns))
+
+    def close(self):
+        """ Write the buffered records and close the file. """
+        self.flush()
+        if self._format in ('parquet', 'arrow') and self._writer is not None:
+            self._writer.close()
+        if self._file is not None:
+            self._file.close()
+        self._writer, self._file = None, None
+
+
+def read_table(path):
+    """ Read a Parquet or Arrow results file as a pyarrow Table. Arrow files are memory-mapped, so the records are
+        not copied in memory until they are used (e.g. table.column('winner') or table.to_pandas()).
+
+    :param path: (str) path of the file
+    :return: (pyarrow.Table) results table
+    """
+    file_format = get_format(path)
+    if file_format == 'arrow':
+        return pyarrow.ipc.open_file(pyarrow.memory_map(path, 'r')).read_all()
+    if file_format == 'parquet':
+        return pyarrow.parquet.read_table(path, memory_map=True)
+    raise Exception('Only Parquet and Arrow files can be read as a table. Use iter_results for {}'.format(path))
+
+
+def iter_results(path, chunk_size=100000):
+    """ Iterate over the records of a results file of any format, holding at most one chunk in memory.
+
+    :param path: (str) path of the file
+    :param chunk_size: (int) Number of records read at a time from Parquet files
+    :return: (generator) dict records (see flatten_result)
+    """
+    file_format = get_format(path)
+    if file_format == 'parquet':
+        for batch in pyarrow.parquet.ParquetFile(path, memory_map=True).iter_batches(batch_size=chunk_size):
+            yield from batch.to_pylist()
+    elif file_format == 'arrow':
+        reader = pyarrow.ipc.open_file(pyarrow.memory_map(path, 'r'))
+        for idx in range(reader.num_record_batches):
+            yield from reader.get_batch(idx).to_pylist()
+    elif file_format == 'csv':
+        with open(path, 'r', newline='') as f:
+            for record in csv.DictReader(f):
+                yield {key: _parse_csv_value(value) for key, value in record.items()}
+    else:
+        with open(path, 'r') as f:
+            for line in f:
+                yield json.loads(line)
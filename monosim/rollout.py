@@ -0,0 +1,248 @@
+""" Monte Carlo rollout player.
+
+RolloutPlayer takes its decisions (buy_or_bid, mortgage_or_bid, want_to_buy_house_hotel, want_to_unmortgage,
+pay_jail_or_wait) by simulating, for each option, a number of continuations of the game played by dummy players.
+At the beginning of each turn the player takes a snapshot of the game. To evaluate an option, the snapshot is restored
+in a separate "shadow" game and the turn is replayed with the same dice, forcing the decisions already taken in the
+turn and the option being evaluated. The game then continues for a few turns with new random dice and the option
+with the best average outcome is chosen.
+"""
+from monosim.player import Player, DECISION_HOOKS, DECISION_ANSWERS
+from monosim.game import Game
+from concurrent.futures import ProcessPoolExecutor, wait
+from collections import deque
+import time
+
+
+class ShadowPlayer(Player):
+    """ Dummy player used in the rollouts. The decisions in forced_decisions are taken first, in order, then the
+        player behaves as the default Player.
+    """
+
+    def __init__(self, name, number, bank, list_board, dict_roads, dict_properties, community_cards_deck, rng=None):
+        super().__init__(name, number, bank, list_board, dict_roads, dict_properties, community_cards_deck, rng)
+        self.forced_decisions = deque()
+
+    def reset(self):
+        super().reset()
+        self.forced_decisions.clear()
+
+    def buy_or_bid(self, dict_road_info):
+        return self.forced_decisions.popleft() if self.forced_decisions else super().buy_or_bid(dict_road_info)
+
+    def mortgage_or_bid(self, dict_road_info):
+        return self.forced_decisions.popleft() if self.forced_decisions else super().mortgage_or_bid(dict_road_info)
+
+    def want_to_buy_house_hotel(self):
+        return self.forced_decisions.popleft() if self.forced_decisions else super().want_to_buy_house_hotel()
+
+    def want_to_unmortgage(self):
+        return self.forced_decisions.popleft() if self.forced_decisions else super().want_to_unmortgage()
+
+    def pay_jail_or_wait(self):
+        return self.forced_decisions.popleft() if self.forced_decisions else super().pay_jail_or_wait()
+
+
+def get_outcome(player, list_players):
+    """ Outcome of a rollout for the given player: 1 if an opponent lost, 0 if the player lost, otherwise the share of
+        the player's wealth (cash + mortgageable amount) over the wealth of all the players.
+
+    :param player: (Player) player
+    :param list_players: (list) all the players of the game
+    :return: (float) outcome between 0 and 1
+    """
+    if player.has_lost():
+        return 0.
+    if any(opponent.has_lost() for opponent in list_players):
+        return 1.
+    total_wealth = sum(opponent.cash + opponent._properties_total_mortgageable_amount for opponent in list_players)
+    if total_wealth <= 0:
+        return 1. / len(list_players)
+    return (player.cash + player._properties_total_mortgageable_amount) / total_wealth
+
+
+def simulate(shadow_game, turn_snapshot, player_idx, list_decisions, list_seeds, rollout_turns):
+    """ Replay a turn from its snapshot with the given decisions, then play rollout_turns more turns for each seed.
+
+    :param shadow_game: (Game) game of ShadowPlayer used to play the rollouts
+    :param turn_snapshot: (tuple) snapshot of the game at the beginning of the turn of the player
+    :param player_idx: (int) index of the player (player number - 1)
+    :param list_decisions: (list) decisions taken by the player in the turn, in order
+    :param list_seeds: (list) one seed per rollout
+    :param rollout_turns: (int) number of turns (rounds of the table) played after the current turn
+    :return: (float) sum of the outcomes of the rollouts
+    """
+    list_players = shadow_game.get_players()
+    player = list_players[player_idx]
+    n_plays = rollout_turns * len(list_players)
+    total = 0.
+    for seed in list_seeds:
+        shadow_game.restore(turn_snapshot)
+        player.forced_decisions.clear()
+        player.forced_decisions.extend(list_decisions)
+        shadow_game.play_next()
+        player.forced_decisions.clear()
+        shadow_game.reseed(seed)
+        for _ in range(n_plays):
+            if shadow_game.is_over():
+                break
+            shadow_game.play_next()
+        total += get_outcome(player, list_players)
+    return total
+
+
+_worker_shadow_games = {}
+
+
+def _simulate_in_worker(turn_snapshot, player_idx, list_decisions, list_seeds, rollout_turns):
+    """ Run simulate() in a worker process, reusing one shadow game per number of players. """
+    n_players = len(turn_snapshot[-1])
+    if n_players not in _worker_shadow_games:
+        _worker_shadow_games[n_players] = Game([ShadowPlayer] * n_players, shuffle_players=False)
+    return simulate(_worker_shadow_games[n_players], turn_snapshot, player_idx, list_decisions, list_seeds,
+                    rollout_turns)
+
+
+class RolloutPlayer(Player):
+    def __init__(self, name, number, bank, list_board, dict_roads, dict_properties, community_cards_deck, rng=None,
+                 n_rollouts=8, rollout_turns=30, time_budget=None, n_workers=1, hooks=DECISION_HOOKS):
+        """ Player taking decisions with Monte Carlo rollouts. The player must play in a Game (see monosim.game).
+            Use functools.partial to set the parameters, e.g. partial(RolloutPlayer, n_rollouts=16).
+
+        :param n_rollouts: (int) Number of rollouts per option of each decision
+        :param rollout_turns: (int) Number of turns (rounds of the table) played in each rollout
+        :param time_budget: (float) Maximum time in seconds per decision. At least one rollout per option is played.
+                            With n_workers > 1, the rollouts still running at the deadline are not waited for.
+        :param n_workers: (int) Number of processes playing the rollouts. With 1 they are played in this process.
+        :param hooks: (tuple) names of the decisions taken with rollouts. Others are taken as the default Player.
+        """
+        super().__init__(name, number, bank, list_board, dict_roads, dict_properties, community_cards_deck, rng)
+        self._n_rollouts = n_rollouts
+        self._rollout_turns = rollout_turns
+        self._time_budget = time_budget
+        self._n_workers = n_workers
+        self._hooks = frozenset(hooks)
+        self._turn_snapshot = None
+        self._list_turn_decisions = []
+        self._rollout_count = 0
+        self._shadow_game = None
+        self._executor = None
+
+    def __getstate__(self):
+        dict_state = self.__dict__.copy()
+        dict_state['_shadow_game'], dict_state['_executor'] = None, None
+        return dict_state
+
+    def reset(self):
+        super().reset()
+        self._turn_snapshot = None
+        self._list_turn_decisions = []
+        self._rollout_count = 0
+
+    def get_snapshot(self):
+        # The rollout count seeds the rollouts, so it's part of the state of the game
+        return super().get_snapshot() + (self._rollout_count,)
+
+    def restore_snapshot(self, snapshot):
+        super().restore_snapshot(snapshot)
+        self._rollout_count = snapshot[-1]
+
+    def close(self):
+        """ Shut down the worker processes, if any. """
+        if self._executor is not None:
+            self._executor.shutdown()
+            self._executor = None
+
+    def play(self):
+        if self._game is None:
+            raise Exception('Player {} must play in a Game to use rollouts'.format(self._name))
+        self._turn_snapshot = self._game.snapshot()
+        self._list_turn_decisions = []
+        super().play()
+
+    def _evaluate(self, list_options):
+        """ Return the average outcome of the rollouts of each option. The same seeds are used for all the options,
+            so that the options are compared on the same dice.
+        """
+        list_decisions = self._list_turn_decisions
+        player_idx = self._number - 1
+        deadline = None if self._time_budget is None else time.perf_counter() + self._time_budget
+        list_seeds = [hash((self._rollout_count, idx)) for idx in range(self._n_rollouts)]
+        self._rollout_count += 1
+
+        if self._n_workers > 1:
+            if self._executor is None:
+                self._executor = ProcessPoolExecutor(max_workers=self._n_workers)
+            if deadline is not None:
+                return self._evaluate_until(list_options, list_seeds, deadline)
+            list_chunks = [list_seeds[idx::self._n_workers] for idx in range(self._n_workers)]
+            dict_futures = {option: [self._executor.submit(_simulate_in_worker, self._turn_snapshot, player_idx,
+                                                           list_decisions + [option], chunk, self._rollout_turns)
+                                     for chunk in list_chunks if chunk]
+                            for option in list_options}
+            return [sum(future.result() for future in dict_futures[option]) / len(list_seeds)
+                    for option in list_options]
+
+        if self._shadow_game is None:
+            self._shadow_game = Game([ShadowPlayer] * len(self._turn_snapshot[-1]), shuffle_players=False)
+        list_totals = [0.] * len(list_options)
+        n_played = 0
+        for seed in list_seeds:
+            for idx, option in enumerate(list_options):
+                list_totals[idx] += simulate(self._shadow_game, self._turn_snapshot, player_idx,
+                                             list_decisions + [option], [seed], self._rollout_turns)
+            n_played += 1
+            if deadline is not None and time.perf_counter() > deadline:
+                break
+        return [total / n_played for total in list_totals]
+
+    def _evaluate_until(self, list_options, list_seeds, deadline):
+        """ Evaluate the options in the worker processes until the deadline. Each rollout is a separate task, submitted
+            in the order of the seeds, and the average is taken over the seeds whose rollouts of all the options were
+            completed. The tasks not started at the deadline are cancelled.
+        """
+        list_decisions = self._list_turn_decisions
+        player_idx = self._number - 1
+        list_seed_futures = [[self._executor.submit(_simulate_in_worker, self._turn_snapshot, player_idx,
+                                                    list_decisions + [option], [seed], self._rollout_turns)
+                              for option in list_options]
+                             for seed in list_seeds]
+        # At least one rollout per option is played
+        wait(list_seed_futures[0])
+        wait([future for list_futures in list_seed_futures[1:] for future in list_futures],
+             timeout=max(0., deadline - time.perf_counter()))
+        list_completed = []
+        for list_futures in list_seed_futures:
+            for future in list_futures:
+                future.cancel()
+            if all(future.done() and not future.cancelled() for future in list_futures):
+                list_completed.append(list_futures)
+        return [sum(list_futures[idx].result() for list_futures in list_completed) / len(list_completed)
+                for idx in range(len(list_options))]
+
+    def _decide(self, hook, default_decision):
+        """ Take a decision with rollouts. The default decision is kept in case of a tie. """
+        if hook in self._hooks:
+            list_options = [default_decision] + [option for option in DECISION_ANSWERS[hook]
+                                                 if option != default_decision]
+            list_values = self._evaluate(list_options)
+            decision = list_options[list_values.index(max(list_values))]
+        else:
+            decision = default_decision
+        self._list_turn_decisions.append(decision)
+        return decision
+
+    def buy_or_bid(self, dict_road_info):
+        return self._decide('buy_or_bid', super().buy_or_bid(dict_road_info))
+
+    def mortgage_or_bid(self, dict_road_info):
+        return self._decide('mortgage_or_bid', super().mortgage_or_bid(dict_road_info))
+
+    def want_to_buy_house_hotel(self):
+        return self._decide('want_to_buy_house_hotel', super().want_to_buy_house_hotel())
+
+    def want_to_unmortgage(self):
+        return self._decide('want_to_unmortgage', super().want_to_unmortgage())
+
+    def pay_jail_or_wait(self):
+        return self._decide('pay_jail_or_wait', super().pay_jail_or_wait())
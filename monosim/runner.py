@@ -0,0 +1,201 @@
+from monosim.game import Game
+from monosim.results import ResultsWriter
+from monosim.trace import Tracer
+from monosim.profiling import Profiler
+from concurrent.futures import ProcessPoolExecutor
+from collections import deque
+from itertools import islice
+import os
+
+
+def play_game(seed, list_player_factories, max_turns=1000, shuffle_players=True, detect_stalemate=False):
+    """ Play a single game with the given seed. This is the same loop used in the notebooks: the table is set, the
+        players meet each other, the playing order is shuffled and the players play until one of them loses or
+        the maximum number of turns is reached.
+        The game owns a random.Random(seed) generator shared by its players (see Game), so games don't depend on the
+        global random module and produce the same results of the notebooks (where random.seed(seed) is called).
+
+    :param seed: (int) Random seed of the game
+    :param list_player_factories: (list) callables with the same signature of Player (e.g. Player or a subclass).
+                                  The i-th factory creates the player named 'player{i+1}'.
+    :param max_turns: (int) Maximum number of turns (rounds of the table) before the game is stopped
+    :param shuffle_players: (bool) if True, shuffle the playing order so that player1 doesn't always start first
+    :param detect_stalemate: (bool) if True, stop the game early when it is a stalemate (see monosim.stalemate)
+    :return: (dict) game result. Example: {'seed': 3, 'turns': 120, 'player_order': ('player2', 'player1'),
+                                           'lost_players': ('player2',), 'winner': 'player1', 'cash': (...),
+                                           'holdings': (...)}. See Game.get_result.
+    """
+
+    return Game(list_player_factories, seed, shuffle_players).run(max_turns, detect_stalemate)
+
+
+def trace_game(seed, list_player_factories, max_turns=1000, shuffle_players=True, capacity=65536):
+    """ Play a game with tracing enabled (see monosim.trace). The game is the same played by play_game with the same
+        seed, so a game of a large batch can be traced again from its seed alone.
+
+    :param capacity: (int) Maximum number of events kept (see Tracer)
+    :return: (tuple) (dict game result, Tracer)
+    """
+
+    game = Game(list_player_factories, seed, shuffle_players)
+    tracer = Tracer(capacity, {'seed': seed, 'players': [player._name for player in game.get_players()]})
+    game.set_tracer(tracer)
+    return game.run(max_turns), tracer
+
+
+def _profile_chunk(list_seeds, list_player_factories, max_turns, shuffle_players):
+    """ Play the games of a chunk of seeds with a profiler. Executed by the worker processes. """
+    profiler = Profiler()
+    game = None
+    for seed in list_seeds:
+        if game is None:
+            game = Game(list_player_factories, seed, shuffle_players)
+            game.set_profiler(profiler)
+        else:
+            game.reset(seed)
+        game.run(max_turns)
+        profiler.games += 1
+    return profiler
+
+
+def profile_games(list_player_factories, seeds, max_turns=1000, n_workers=1, chunk_size=100, shuffle_players=True):
+    """ Play one game per seed with profiling and return the merged profiler.
+
+    :param list_player_factories: (list) player classes (see Game). Picklable when n_workers > 1.
+    :param seeds: (iterable) seeds of the games
+    :param max_turns: (int) maximum number of turns per game
+    :param n_workers: (int) number of processes. None for the number of CPUs.
+    :param chunk_size: (int) number of games played by a worker at a time
+    :param shuffle_players: (bool) see Game
+    :return: (Profiler) counts and times of all the games
+    """
+    if n_workers is None:
+        n_workers = os.cpu_count() or 1
+    profiler = Profiler()
+    if n_workers == 1:
+        return profiler.merge(_profile_chunk(seeds, list_player_factories, max_turns, shuffle_players))
+    with ProcessPoolExecutor(max_workers=n_workers) as executor:
+        list_futures = [executor.submit(_profile_chunk, list_seeds, list_player_factories, max_turns, shuffle_players)
+                        for list_seeds in iter_chunks(seeds, chunk_size)]
+        for future in list_futures:
+            profiler.merge(future.result())
+    return profiler
+
+
+def _iter_pooled_games(seeds, list_player_factories, max_turns, shuffle_players, detect_stalemate,
+                       last_player_standing=False):
+    """ Play one game per seed, reusing the same Game and players (see Game.reset) instead of creating them again. """
+    game = None
+    for seed in seeds:
+        if game is None:
+            game = Game(list_player_factories, seed, shuffle_players, last_player_standing)
+        else:
+            game.reset(seed)
+        yield game.run(max_turns, detect_stalemate)
+
+
+def play_games(seeds, list_player_factories, max_turns=1000, shuffle_players=True, detect_stalemate=False,
+               last_player_standing=False):
+    """ Play one game per seed in this process, reusing the same game and players, and return the list of results.
+        Defined at module level, so it can be submitted to a pool of processes with a chunk of seeds (see
+        iter_chunks), as iter_games and monosim.tournament do.
+
+    :param seeds: (iterable) seeds of the games
+    :param list_player_factories: (list) player classes (see Game)
+    :param max_turns: (int) Maximum number of turns per game
+    :param shuffle_players: (bool) if True, shuffle the playing order of each game
+    :param detect_stalemate: (bool) if True, stop the games early when they are a stalemate (see play_game)
+    :param last_player_standing: (bool) see Game
+    :return: (list) dict results (see play_game)
+    """
+    return list(_iter_pooled_games(seeds, list_player_factories, max_turns, shuffle_players, detect_stalemate,
+                                   last_player_standing))
+
+
+def iter_chunks(seeds, chunk_size):
+    """ Split an iterable of seeds in lists of (at most) chunk_size seeds, without materializing all of them.
+
+    :param seeds: (iterable) seeds
+    :param chunk_size: (int) maximum number of seeds of a chunk
+    :return: (generator) lists of seeds
+    """
+    iterator = iter(seeds)
+    chunk = list(islice(iterator, chunk_size))
+    while chunk:
+        yield chunk
+        chunk = list(islice(iterator, chunk_size))
+
+
+def iter_games(list_player_factories, seeds, max_turns=1000, n_workers=None, chunk_size=None, shuffle_players=True,
+               detect_stalemate=False):
+    """ Play one game per seed and yield the results in the same order of the seeds.
+        Games are distributed over a pool of processes in chunks of consecutive seeds. Each game only depends on its
+        own seed, so results are identical whatever the number of workers or the chunk size. Each process reuses the
+        same game and players for all its seeds (see Game.reset), so players with additional state of the game must
+        extend Player.reset.
+        At most 2 * n_workers chunks are in flight at any time, so memory stays bounded for very long seed ranges.
+
+    :param list_player_factories: (list) callables with the same signature of Player (e.g. [Player, Player]). They
+                                  must be picklable (defined at module level) when n_workers > 1.
+    :param seeds: (iterable) seeds of the games (e.g. range(0, 10000))
+    :param max_turns: (int) Maximum number of turns per game
+    :param n_workers: (int) Number of processes. Default is the number of CPUs. With 1 the games run in this process.
+    :param chunk_size: (int) Number of seeds sent to a worker at a time. Default depends on the number of seeds.
+    :param shuffle_players: (bool) if True, shuffle the playing order of each game
+    :param detect_stalemate: (bool) if True, stop the games early when they are a stalemate (see play_game)
+    :return: (generator) dict results (see play_game)
+    """
+
+    if n_workers is None:
+        n_workers = os.cpu_count() or 1
+    if chunk_size is None:
+        # Aim at a few chunks per worker, so that slow chunks (long games) are balanced by the others
+        chunk_size = max(1, min(1000, len(seeds) // (n_workers * 8))) if hasattr(seeds, '__len__') else 100
+
+    if n_workers == 1:
+        yield from _iter_pooled_games(seeds, list_player_factories, max_turns, shuffle_players, detect_stalemate)
+        return
+
+    with ProcessPoolExecutor(max_workers=n_workers) as executor:
+        queue_futures = deque()
+        for list_seeds in iter_chunks(seeds, chunk_size):
+            queue_futures.append(executor.submit(play_games, list_seeds, list_player_factories, max_turns,
+                                                 shuffle_players, detect_stalemate))
+            if len(queue_futures) >= 2 * n_workers:
+                for result in queue_futures.popleft().result():
+                    yield result
+        while queue_futures:
+            for result in queue_futures.popleft().result():
+                yield result
+
+
+def run_games(list_player_factories, seeds, max_turns=1000, n_workers=None, chunk_size=None, shuffle_players=True,
+              detect_stalemate=False):
+    """ Play one game per seed, in parallel, and return the list of results (same order of the seeds).
+        See iter_games for the description of the parameters.
+
+        Example:
+            results = run_games([Player_no_brown, Player], range(0, 10000), max_turns=1000)
+
+    :return: (list) dict results (see play_game)
+    """
+
+    return list(iter_games(list_player_factories, seeds, max_turns, n_workers, chunk_size, shuffle_players,
+                           detect_stalemate))
+
+
+def write_games(path, list_player_factories, seeds, max_turns=1000, n_workers=None, chunk_size=None,
+                shuffle_players=True, detect_stalemate=False):
+    """ Play one game per seed, in parallel, and stream the results to a file (see monosim.results) in the order of
+        the seeds. Memory stays bounded whatever the number of games.
+
+        Example:
+            write_games('results.parquet', [Player_no_brown, Player], range(0, 10 ** 8))
+
+    :param path: (str) path of the results file (.parquet, .arrow, .csv or .jsonl)
+    :return: (int) number of games written
+    """
+
+    with ResultsWriter(path) as writer:
+        return writer.write_many(iter_games(list_player_factories, seeds, max_turns, n_workers, chunk_size,
+                                            shuffle_players, detect_stalemate))
@@ -0,0 +1,101 @@
+""" Sequential testing of strategies.
+
+Instead of playing a fixed number of games and testing the win counts afterwards (e.g. with scipy.stats.binom_test),
+run_experiment evaluates a sequential probability ratio test (Wald's SPRT) after each game and stops as soon as the
+comparison is decided. Only decisive games (one of the two players lost) count. With win probability p of the tested
+strategy in decisive games, two one-sided tests are run:
+    * better: H0 p = 0.5 against H1 p = 0.5 + delta
+    * worse: H0 p = 0.5 against H1 p = 0.5 - delta
+The experiment stops when one of the tests accepts H1 (the strategy is better or worse), or when both accept H0 (the
+difference is smaller than delta). Each test has error rates alpha / 2 and beta.
+"""
+from monosim.runner import iter_games
+from itertools import count
+import math
+
+
+class SPRT:
+    def __init__(self, p0, p1, alpha=0.05, beta=0.05):
+        """ Wald's sequential probability ratio test of a Bernoulli probability p: H0 p = p0 against H1 p = p1.
+
+        :param p0: (float) probability under the null hypothesis
+        :param p1: (float) probability under the alternative hypothesis
+        :param alpha: (float) probability of accepting H1 when H0 is true
+        :param beta: (float) probability of accepting H0 when H1 is true
+        """
+        if not 0 < p0 < 1 or not 0 < p1 < 1 or p0 == p1:
+            raise Exception('Probabilities p0={} and p1={} not valid'.format(p0, p1))
+        self._llr_success = math.log(p1 / p0)
+        self._llr_failure = math.log((1 - p1) / (1 - p0))
+        self._upper_bound = math.log((1 - beta) / alpha)
+        self._lower_bound = math.log(beta / (1 - alpha))
+        self.llr = 0.
+        self.decision = None
+
+    def update(self, success):
+        """ Add an observation. Once a hypothesis is accepted, the decision doesn't change.
+
+        :param success: (bool) outcome of the trial
+        :return: (str) 'H1' or 'H0' if a hypothesis has been accepted, None if more observations are needed
+        """
+        if self.decision is None:
+            self.llr += self._llr_success if success else self._llr_failure
+            if self.llr >= self._upper_bound:
+                self.decision = 'H1'
+            elif self.llr <= self._lower_bound:
+                self.decision = 'H0'
+        return self.decision
+
+
+def run_experiment(player_factory, opponent_factory, delta=0.05, alpha=0.05, beta=0.05, max_games=100000,
+                   seeds=None, max_turns=1000, n_workers=None, chunk_size=10, detect_stalemate=False):
+    """ Play games of a strategy (player1) against an opponent (player2) until a sequential test decides whether the
+        strategy wins more or less often than the opponent (see the module description). Games are played in parallel
+        by monosim.runner.iter_games, a few chunks ahead of the test.
+
+        Example:
+            run_experiment(Player_no_brown, Player, delta=0.05)
+            -> {'decision': 'worse', 'games': 512, 'wins': 221, 'losses': 276, 'draws': 15, 'win_rate': 0.44}
+
+    :param player_factory: class of the player tested (see Game)
+    :param opponent_factory: class of the opponent
+    :param delta: (float) smallest difference of the win probability (from 0.5) to detect
+    :param alpha: (float) probability of deciding 'better' or 'worse' when the strategies are equivalent
+    :param beta: (float) probability of missing a difference of delta
+    :param max_games: (int) maximum number of games. The decision is None if they are not enough.
+    :param seeds: (iterable) seeds of the games. Default: 0, 1, 2, ...
+    :param max_turns: (int) maximum number of turns per game
+    :param n_workers: (int) number of processes (see iter_games)
+    :param chunk_size: (int) number of games sent to a worker at a time. Small chunks waste fewer games at the end.
+    :param detect_stalemate: (bool) stop stalemate games early (see monosim.stalemate)
+    :return: (dict) decision ('better', 'worse', 'equivalent' or None) and counts of the games
+    """
+    test_better = SPRT(0.5, 0.5 + delta, alpha / 2, beta)
+    test_worse = SPRT(0.5, 0.5 - delta, alpha / 2, beta)
+    wins, losses, draws = 0, 0, 0
+    decision = None
+
+    seeds = count() if seeds is None else seeds
+    iterator_results = iter_games([player_factory, opponent_factory], seeds, max_turns, n_workers, chunk_size,
+                                  detect_stalemate=detect_stalemate)
+    for result in iterator_results:
+        if result['winner'] == 'player1':
+            wins += 1
+        elif result['winner'] == 'player2':
+            losses += 1
+        else:
+            draws += 1
+        if result['winner'] is not None:
+            win = result['winner'] == 'player1'
+            if test_better.update(win) == 'H1':
+                decision = 'better'
+            elif test_worse.update(win) == 'H1':
+                decision = 'worse'
+            elif test_better.decision == 'H0' and test_worse.decision == 'H0':
+                decision = 'equivalent'
+        if decision is not None or wins + losses + draws >= max_games:
+            break
+    iterator_results.close()
+
+    return {'decision': decision, 'games': wins + losses + draws, 'wins': wins, 'losses': losses, 'draws': draws,
+            'win_rate': wins / (wins + losses) if wins + losses else None}
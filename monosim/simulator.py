@@ -1,5 +1,6 @@
 from monosim.player import Player
 from monosim.board import get_board, get_roads, get_properties, get_community_chest_cards, get_bank
+from monosim.logs import logger, TURNS
 import types
 
 def roll_dice_temp(self):
@@ -13,7 +14,7 @@ def buy(self, dict_road_info, road_name):
         :param road_name: (String) Road name
         :return:
         """
-        print(self._bank)
+        logger.debug('bank %s', self._bank)
         road_price = dict_road_info['price']
         # enough money?
         if self._cash < road_price:
@@ -53,6 +54,7 @@ def buy(self, dict_road_info, road_name):
 
 if __name__ == '__main__':
     import random
+    verbosity = 0  # 0: nothing is printed, 1: turns, 2: decisions, 3: payments (see monosim.logs)
     for seed in range(1000, 10000):
     # for seed in [313880]:
     #     print(seed)
@@ -66,6 +68,8 @@ if __name__ == '__main__':
         community_cards_deck = list(dict_community_chest_cards.keys())
         player1 = Player('player1', 1, bank, list_board, dict_roads, dict_properties, community_cards_deck)
         player2 = Player('player2', 2, bank, list_board, dict_roads, dict_properties, community_cards_deck)
+        player1.set_verbosity(verbosity)
+        player2.set_verbosity(verbosity)
 
         # player1.roll_dice = roll_dice_temp
         # player1.roll_dice = types.MethodType(roll_dice_temp, player1)
@@ -83,17 +87,16 @@ if __name__ == '__main__':
                 player.play()
             idx_count += 1
             # print('--------- ' + str(idx_count) + ' -------------')
-            dict_state_p1 = player1.get_state()
-            dict_state_p2 = player2.get_state()
-            dict_houses_hotels_p1 = player1.get_state()['owned_houses_hotels']
-            dict_houses_hotels_p2 = player2.get_state()['owned_houses_hotels']
-            list_houses_p1 = [i[0] for i in dict_houses_hotels_p1.values()]
-            list_houses_p2 = [i[0] for i in dict_houses_hotels_p2.values()]
-            list_hotels_p1 = [i[1] for i in dict_houses_hotels_p1.values()]
-            list_hotels_p2 = [i[1] for i in dict_houses_hotels_p2.values()]
-
             # if seed == 1005 and idx_count == 109:
-            if seed == 1006:
+            if verbosity >= TURNS and seed == 1006:
+                dict_state_p1 = player1.get_state()
+                dict_state_p2 = player2.get_state()
+                dict_houses_hotels_p1 = player1.get_state()['owned_houses_hotels']
+                dict_houses_hotels_p2 = player2.get_state()['owned_houses_hotels']
+                list_houses_p1 = [i[0] for i in dict_houses_hotels_p1.values()]
+                list_houses_p2 = [i[0] for i in dict_houses_hotels_p2.values()]
+                list_hotels_p1 = [i[1] for i in dict_houses_hotels_p1.values()]
+                list_hotels_p2 = [i[1] for i in dict_houses_hotels_p2.values()]
                 print('-------- ' + str(idx_count) + ' -------------')
                 print('{} is in position {} ({}), dice value {}, cash {}, '
                       'mortgageable amount {}, mortgaged_roads {}, bank-cash {}, owned_roads {}, owned_utilities {}, '
@@ -0,0 +1,166 @@
+""" Detection of stalemates.
+
+Without trading, many games reach a state where nothing can change any more: all the properties are owned, no house or
+hotel can be built and no property is mortgaged. From then on, the cash of each player only depends on the dice
+(salary from Go, community chest cards, taxes, jail fees and rents) and only its own plays can make it pay.
+A game is a stalemate when the board is frozen and no player can go bankrupt before the maximum number of turns, even
+with the worst dice: the cash of every player covers the largest loss it can accumulate over its remaining plays
+(see get_worst_losses). The result of a stalemate game stopped early by Game.run(detect_stalemate=True) has the same
+losers (none) of the game played until the end.
+"""
+from monosim.markov import JAIL_STATE, MAX_JAIL_COUNT, N_STATES, BOARD_SIZE, JAIL_POSITION, GO_TO_JAIL_POSITION
+from monosim.board import get_catalog, COMMUNITY_CHEST_CASH, STREET_REPAIR_HOUSE_COST, STREET_REPAIR_HOTEL_COST
+import numpy as np
+
+GO_SALARY = 200
+JAIL_FEE = 50
+
+
+def is_board_frozen(game):
+    """ Return True if properties, houses and mortgages can't change any more: all the properties are owned, nobody
+        has a mortgaged property and nobody can build (see Player.choose_house_hotel_to_buy).
+
+    :param game: (Game) game
+    :return: (bool) True if the board is frozen
+    """
+    catalog = get_catalog()
+    belongs_to = game._board_state.belongs_to
+    if any(belongs_to[position] is None for position in catalog.position_of.values()):
+        return False
+    for player in game.get_players():
+        if player.has_lost():
+            continue
+        if player.get_holdings_key()[1]:
+            return False
+        if player.owns_all_roads_of_a_color():
+            road, house_or_hotel = player.choose_house_hotel_to_buy()
+            # Houses and hotels are never given back to the bank
+            if house_or_hotel == 'house' and game._bank['houses'] > 0:
+                return False
+            if house_or_hotel == 'hotel' and game._bank['hotels'] > 0:
+                return False
+    return True
+
+
+def _get_payments(player, opponent):
+    """ Return the payments of a player landing on the properties of an opponent: list of (position, rent), where
+        the rent of utilities is the multiplier of the dice value (negative to mark it). """
+    list_payments = []
+    for property_name in opponent._list_owned_roads:
+        dict_info = player._dict_roads[property_name]
+        list_payments.append((dict_info['board_num'], player.estimate_rent_road(dict_info)))
+    for property_name in opponent._list_owned_stations:
+        dict_info = player._dict_properties[property_name]
+        list_payments.append((dict_info['board_num'], player.estimate_rent_station(dict_info)))
+    for property_name in opponent._list_owned_utilities:
+        dict_info = player._dict_properties[property_name]
+        multiplier = player._catalog.utility_multipliers[opponent.get_owned_utilities_count()]
+        list_payments.append((dict_info['board_num'], -multiplier))
+    return list_payments
+
+
+def _get_transitions(game, player):
+    """ Return the outcomes of a play of a player, in each state of the chain of monosim.markov (cell or jail count),
+        with a frozen board. When the outcome depends on something else than the dice (paying or waiting in jail, the
+        community chest card), all the options are included.
+
+    :return: (tuple) arrays of shape (N_STATES, number of outcomes): state after the play and loss of cash (-inf for
+             the padding)
+    """
+    catalog = get_catalog()
+    dict_rents = {}  # position: rent, or multiplier of the dice value (negative) for utilities
+    for opponent in game.get_players():
+        if opponent is not player and not opponent.has_lost():
+            dict_rents.update(_get_payments(player, opponent))
+    count_houses, count_hotels = 0, 0
+    for houses, hotels in player._dict_owned_houses_hotels.values():
+        count_houses, count_hotels = count_houses + houses, count_hotels + hotels
+    # Worst community chest card: a fee or the street repairs. The card 'to_go' moves the player to Go.
+    card_loss = max(-min(COMMUNITY_CHEST_CASH.values()),
+                    STREET_REPAIR_HOUSE_COST * count_houses + STREET_REPAIR_HOTEL_COST * count_hotels)
+    list_dice = sorted(set((dice1 + dice2, dice1 == dice2) for dice1 in range(1, 7) for dice2 in range(1, 7)))
+
+    list_transitions = [[] for _ in range(N_STATES)]
+    for position in range(BOARD_SIZE):
+        for dice_value, _ in list_dice:
+            new_position = (position + dice_value) % BOARD_SIZE
+            loss = -GO_SALARY if position + dice_value >= BOARD_SIZE else 0
+            cell_type = catalog.types[new_position]
+            if new_position in dict_rents:
+                rent = dict_rents[new_position]
+                loss += rent if rent >= 0 else -rent * dice_value
+            elif cell_type == 'tax':
+                loss += player.get_tax_value(catalog.names[new_position])
+            elif cell_type == 'community chest':
+                list_transitions[position].append((0, loss - GO_SALARY))
+                loss += card_loss
+            elif new_position == GO_TO_JAIL_POSITION:
+                new_position = JAIL_STATE
+            list_transitions[position].append((new_position, loss))
+    for jail_count in range(MAX_JAIL_COUNT + 1):
+        state = JAIL_STATE + jail_count
+        for dice_value, is_double in list_dice:
+            if is_double:
+                list_transitions[state].append((JAIL_POSITION + dice_value, 0))
+            else:
+                list_transitions[state].append((JAIL_POSITION + dice_value, JAIL_FEE))
+                if jail_count < MAX_JAIL_COUNT:
+                    list_transitions[state].append((state + 1, 0))
+
+    n_outcomes = max(len(list_outcomes) for list_outcomes in list_transitions)
+    states = np.zeros((N_STATES, n_outcomes), dtype=np.intp)
+    losses = np.full((N_STATES, n_outcomes), -np.inf)
+    for state, list_outcomes in enumerate(list_transitions):
+        for idx, (new_state, loss) in enumerate(list_outcomes):
+            states[state, idx], losses[state, idx] = new_state, loss
+    return states, losses
+
+
+def get_worst_losses(game, player, n_plays, max_loss=np.inf):
+    """ Return the largest loss of cash of a player over at most n_plays plays, from each state of the chain of
+        monosim.markov, with a frozen board (see is_board_frozen). The loss is the largest drop of cash below the
+        current cash at any moment, with the worst dice, cards and jail decisions.
+
+    :param game: (Game) game
+    :param player: (Player) player
+    :param n_plays: (int) number of plays
+    :param max_loss: (float) stop early once the loss from the current state of the player exceeds max_loss
+    :return: (np.ndarray) largest loss from each state
+    """
+    state = get_state(player)
+    states, losses = _get_transitions(game, player)
+    worst_losses = np.zeros(N_STATES)
+    for _ in range(n_plays):
+        new_worst_losses = np.maximum((losses + worst_losses[states]).max(axis=1), 0)
+        if np.array_equal(new_worst_losses, worst_losses):
+            break
+        worst_losses = new_worst_losses
+        if worst_losses[state] > max_loss:
+            break
+    return worst_losses
+
+
+def get_state(player):
+    """ Return the state of a player in the chain of monosim.markov: its cell, or JAIL_STATE + jail count. """
+    if player._position == JAIL_POSITION and not player._free_visit:
+        return JAIL_STATE + player._jail_count
+    return player._position
+
+
+def is_stalemate(game, max_turns):
+    """ Return True if the game is a stalemate: the board is frozen and no player can go bankrupt before max_turns
+        (see the module description).
+
+    :param game: (Game) game
+    :param max_turns: (int) maximum number of turns of the game
+    :return: (bool) True if the game is a stalemate
+    """
+    if game.is_over() or not is_board_frozen(game):
+        return False
+    n_plays = max_turns - game.get_turn()
+    for player in game.get_players():
+        if player.has_lost():
+            continue
+        if get_worst_losses(game, player, n_plays, player.cash)[get_state(player)] > player.cash:
+            return False
+    return True
@@ -0,0 +1,190 @@
+""" Strategies of the players.
+
+A Strategy takes the decisions of a player (buy_or_bid, mortgage_or_bid, want_to_buy_house_hotel,
+choose_house_hotel_to_buy, want_to_unmortgage, pay_jail_or_wait) without subclassing Player: StrategyPlayer forwards
+its decision hooks to the strategy. The base Strategy takes the same decisions of the default Player.
+Rule-based strategies (RuleStrategy) decide on a bucketed state of the player: position, dice value and cash bucket
+(see CASH_BUCKETS). Since the bucketed states are few, compile_strategy evaluates the rules once for every state and
+returns a TableStrategy, where each decision is a lookup in a table of bytes. Tables are plain bytes, so compiled
+strategies are cheap to send to worker processes:
+    factory = strategy_player(compile_strategy(NoBrownStrategy()))
+    results = run_games([factory, Player], range(0, 10000), n_workers=8)
+"""
+from monosim.player import Player, DECISION_HOOKS, DECISION_ANSWERS
+from monosim.board import get_catalog
+from functools import partial
+from bisect import bisect_right
+
+#  Lower bound of the cash buckets. Negative cash is in the first bucket.
+CASH_BUCKETS = (0, 50, 100, 150, 200, 300, 400, 600, 800, 1200, 1600, 2400)
+N_DICE_VALUES = 13
+
+
+class Strategy:
+    """ Decisions of a player. Each function receives the player taking the decision. The default decisions are the
+        ones of Player. """
+
+    def buy_or_bid(self, player, dict_road_info):
+        return Player.buy_or_bid(player, dict_road_info)
+
+    def mortgage_or_bid(self, player, dict_road_info):
+        return Player.mortgage_or_bid(player, dict_road_info)
+
+    def want_to_buy_house_hotel(self, player):
+        return Player.want_to_buy_house_hotel(player)
+
+    def choose_house_hotel_to_buy(self, player):
+        return Player.choose_house_hotel_to_buy(player)
+
+    def want_to_unmortgage(self, player):
+        return Player.want_to_unmortgage(player)
+
+    def pay_jail_or_wait(self, player):
+        return Player.pay_jail_or_wait(player)
+
+
+def get_state_key(player):
+    """ Return the index of the bucketed state of a player (position, dice value, cash bucket) in the decision
+        tables. """
+    cash_bucket = max(bisect_right(CASH_BUCKETS, player._cash) - 1, 0)
+    return (player._position * N_DICE_VALUES + player._dice_value) * len(CASH_BUCKETS) + cash_bucket
+
+
+class RuleStrategy(Strategy):
+    """ Strategy deciding with rules of the bucketed state of the player. Subclasses override rule(). """
+
+    def rule(self, hook, position, dice_value, cash):
+        """ Decide on a bucketed state. The default rules are the decisions of Player.
+
+        :param hook: (str) decision (see DECISION_HOOKS)
+        :param position: (int) position of the player
+        :param dice_value: (int) sum of the dice of the turn
+        :param cash: (int) lower bound of the cash bucket of the player (see CASH_BUCKETS)
+        :return: (bool) True for the affirmative answer ('buy', 'mortgage', True, 'pay')
+        """
+        if hook == 'want_to_buy_house_hotel':
+            return dice_value % 5 == 0
+        if hook == 'want_to_unmortgage':
+            return dice_value % 2 == 0
+        return hook != 'pay_jail_or_wait'
+
+    def _decide(self, hook, player):
+        cash = CASH_BUCKETS[max(bisect_right(CASH_BUCKETS, player._cash) - 1, 0)]
+        return DECISION_ANSWERS[hook][self.rule(hook, player._position, player._dice_value, cash)]
+
+    def buy_or_bid(self, player, dict_road_info):
+        return self._decide('buy_or_bid', player)
+
+    def mortgage_or_bid(self, player, dict_road_info):
+        return self._decide('mortgage_or_bid', player)
+
+    def want_to_buy_house_hotel(self, player):
+        return self._decide('want_to_buy_house_hotel', player)
+
+    def want_to_unmortgage(self, player):
+        return self._decide('want_to_unmortgage', player)
+
+    def pay_jail_or_wait(self, player):
+        return self._decide('pay_jail_or_wait', player)
+
+
+class TableStrategy(Strategy):
+    def __init__(self, dict_tables, strategy=None):
+        """ Strategy deciding with lookup tables, built by compile_strategy.
+
+        :param dict_tables: (dict) key: hook (see DECISION_HOOKS), value: (bytes) decision (0 or 1) of each state key
+                            (see get_state_key)
+        :param strategy: (Strategy) strategy of the decisions without a table (choose_house_hotel_to_buy).
+                         Default: Strategy.
+        """
+        self.dict_tables = dict_tables
+        self.strategy = strategy if strategy is not None else Strategy()
+        self._buy_table = dict_tables['buy_or_bid']
+        self._mortgage_table = dict_tables['mortgage_or_bid']
+        self._house_table = dict_tables['want_to_buy_house_hotel']
+        self._unmortgage_table = dict_tables['want_to_unmortgage']
+        self._jail_table = dict_tables['pay_jail_or_wait']
+
+    def buy_or_bid(self, player, dict_road_info):
+        return 'buy' if self._buy_table[get_state_key(player)] else 'bid'
+
+    def mortgage_or_bid(self, player, dict_road_info):
+        return 'mortgage' if self._mortgage_table[get_state_key(player)] else 'bid'
+
+    def want_to_buy_house_hotel(self, player):
+        return self._house_table[get_state_key(player)] == 1
+
+    def choose_house_hotel_to_buy(self, player):
+        return self.strategy.choose_house_hotel_to_buy(player)
+
+    def want_to_unmortgage(self, player):
+        return self._unmortgage_table[get_state_key(player)] == 1
+
+    def pay_jail_or_wait(self, player):
+        return 'pay' if self._jail_table[get_state_key(player)] else 'wait'
+
+
+def compile_strategy(strategy):
+    """ Evaluate the rules of a RuleStrategy for every bucketed state and return the equivalent TableStrategy.
+
+    :param strategy: (RuleStrategy) strategy
+    :return: (TableStrategy) strategy with the decision tables
+    """
+    board_size = get_catalog().board_size
+    dict_tables = {}
+    for hook in DECISION_HOOKS:
+        dict_tables[hook] = bytes(bool(strategy.rule(hook, position, dice_value, cash))
+                                  for position in range(board_size)
+                                  for dice_value in range(N_DICE_VALUES)
+                                  for cash in CASH_BUCKETS)
+    return TableStrategy(dict_tables, strategy)
+
+
+class StrategyPlayer(Player):
+    """ Player taking its decisions with a strategy. Use strategy_player to get a factory for Game. """
+
+    def __init__(self, name, number, bank, list_board, dict_roads, dict_properties, community_cards_deck, rng=None,
+                 verbosity=0, strategy=None):
+        super().__init__(name, number, bank, list_board, dict_roads, dict_properties, community_cards_deck, rng,
+                         verbosity)
+        self.strategy = strategy if strategy is not None else Strategy()
+
+    def buy_or_bid(self, dict_road_info):
+        return self.strategy.buy_or_bid(self, dict_road_info)
+
+    def mortgage_or_bid(self, dict_road_info):
+        return self.strategy.mortgage_or_bid(self, dict_road_info)
+
+    def want_to_buy_house_hotel(self):
+        return self.strategy.want_to_buy_house_hotel(self)
+
+    def choose_house_hotel_to_buy(self):
+        return self.strategy.choose_house_hotel_to_buy(self)
+
+    def want_to_unmortgage(self):
+        return self.strategy.want_to_unmortgage(self)
+
+    def pay_jail_or_wait(self):
+        return self.strategy.pay_jail_or_wait(self)
+
+
+def strategy_player(strategy):
+    """ Return a player factory (see Game) of StrategyPlayer with the given strategy. The factory is picklable if
+        the strategy is (e.g. a TableStrategy, or an instance of a class defined at module level).
+
+    :param strategy: (Strategy) strategy
+    :return: callable creating the players
+    """
+    return partial(StrategyPlayer, strategy=strategy)
+
+
+class NoBrownStrategy(RuleStrategy):
+    """ Never buy brown roads, otherwise decide as Player (the 'no brown' player of the notebooks). """
+
+    def __init__(self):
+        self._colors = get_catalog().colors
+
+    def rule(self, hook, position, dice_value, cash):
+        if hook in ('buy_or_bid', 'mortgage_or_bid') and self._colors[position] == 'brown':
+            return False
+        return super().rule(hook, position, dice_value, cash)
@@ -0,0 +1,187 @@
+""" Simulation sweeps with checkpoints.
+
+A sweep plays the same seeds for several configurations (e.g. one per epsilon of a k-arm player) and saves its
+progress in a checkpoint file every checkpoint_interval games: the results of the games completed and, with
+learners=True, the state of the learning players (see Player.get_learner_state). If the sweep is stopped, running it
+again with the same configuration resumes from the checkpoint, without playing the completed games again.
+    sweep = Sweep('k_arms.ckpt', {'epsilon 0.1': [Player, partial(Player_k_arm, epsilon=0.1)], ...},
+                  range(0, 10000), learners=True, on_game_end=update_q_values)
+    dict_results = sweep.run()
+Without learners, the games of each configuration are played in parallel by monosim.runner.iter_games. With learners,
+the players keep learning from game to game, so the games are played in order in this process, reusing the same
+players (see Game.reset). Learners should preferably draw random numbers from the generator of the game
+(Player._rng), which only depends on the seed. The checkpoints also hold the states of the global generators (random
+and numpy.random), so that a resumed sweep plays exactly the same games with learners drawing from them too, as the
+k-arm players of the notebooks.
+"""
+from monosim.game import Game
+from monosim.runner import iter_games
+from functools import partial
+from copy import deepcopy
+import hashlib
+import pickle
+import random
+import os
+
+try:
+    import numpy as np
+except ImportError:
+    np = None
+
+
+def _get_factory_name(factory):
+    """ Return a name of a player factory which doesn't change between runs (e.g. module.Class). The arguments of a
+        functools.partial are part of the name (e.g. module.Class(epsilon=0.1)), so that configurations differing
+        only by them have different checkpoints. """
+    if isinstance(factory, partial):
+        list_arguments = [_get_factory_name(argument) for argument in factory.args]
+        list_arguments += ['{}={}'.format(key, _get_factory_name(value))
+                           for key, value in sorted(factory.keywords.items())]
+        return '{}({})'.format(_get_factory_name(factory.func), ', '.join(list_arguments))
+    if callable(factory) and hasattr(factory, '__qualname__'):
+        return '{}.{}'.format(getattr(factory, '__module__', ''), factory.__qualname__)
+    return repr(factory)
+
+
+def _get_global_rng_states():
+    """ Return the states of the global random generators: random and numpy.random (None without numpy). """
+    return random.getstate(), None if np is None else np.random.get_state()
+
+
+def _set_global_rng_states(rng_states):
+    """ Set the states of the global random generators returned by _get_global_rng_states. """
+    random.setstate(rng_states[0])
+    if np is not None and rng_states[1] is not None:
+        np.random.set_state(rng_states[1])
+
+
+class Sweep:
+    def __init__(self, path, dict_configs, seeds, max_turns=1000, shuffle_players=True, learners=False,
+                 checkpoint_interval=500, n_workers=None, chunk_size=None, detect_stalemate=False, on_game_end=None):
+        """ Sweep of configurations over the same seeds. See the module description.
+
+        :param path: (str) path of the checkpoint file
+        :param dict_configs: (dict) key: name of the configuration, value: list of player factories (see Game)
+        :param seeds: (iterable) seeds of the games of each configuration
+        :param max_turns: (int) maximum number of turns per game
+        :param shuffle_players: (bool) see Game
+        :param learners: (bool) if True, the players keep their state from game to game and it's saved in the
+                         checkpoints
+        :param checkpoint_interval: (int) number of games between two checkpoints
+        :param n_workers: (int) number of processes without learners (see iter_games)
+        :param chunk_size: (int) see iter_games
+        :param detect_stalemate: (bool) stop stalemate games early (see monosim.stalemate)
+        :param on_game_end: callable(game, result) called after each game, e.g. to update the learners. Only with
+                            learners=True: without learners, the games are played in other processes.
+        """
+        if on_game_end is not None and not learners:
+            raise Exception('on_game_end needs learners=True: without learners, the games are played in parallel')
+        self.path = path
+        self.dict_configs = dict(dict_configs)
+        self.seeds = list(seeds)
+        self.max_turns = max_turns
+        self.shuffle_players = shuffle_players
+        self.learners = learners
+        self.checkpoint_interval = checkpoint_interval
+        self.n_workers = n_workers
+        self.chunk_size = chunk_size
+        self.detect_stalemate = detect_stalemate
+        self.on_game_end = on_game_end
+        self.dict_results = {name: [] for name in self.dict_configs}
+        self.dict_learner_states = {}
+
+    def get_key(self):
+        """ Return a digest of the configuration, used to check that a checkpoint belongs to this sweep. """
+        description = repr((sorted((name, [_get_factory_name(factory) for factory in list_factories])
+                                   for name, list_factories in self.dict_configs.items()),
+                            self.seeds, self.max_turns, self.shuffle_players, self.learners, self.detect_stalemate))
+        return hashlib.sha256(description.encode('utf-8')).hexdigest()
+
+    def load(self):
+        """ Load the progress from the checkpoint file, if it exists, and set the global random generators to their
+            state at the checkpoint.
+
+        :return: (bool) True if a checkpoint was loaded
+        """
+        if not os.path.exists(self.path):
+            return False
+        with open(self.path, 'rb') as f:
+            dict_checkpoint = pickle.load(f)
+        if dict_checkpoint['key'] != self.get_key():
+            raise Exception('Checkpoint {} was made by a sweep with a different configuration'.format(self.path))
+        self.dict_results = dict_checkpoint['results']
+        self.dict_learner_states = dict_checkpoint['learner_states']
+        _set_global_rng_states(dict_checkpoint['rng_states'])
+        return True
+
+    def save(self):
+        """ Save the progress in the checkpoint file. A temporary file is written first, so that the checkpoint is
+            never left half written if the process is stopped. """
+        dict_checkpoint = {'key': self.get_key(), 'results': self.dict_results,
+                           'learner_states': self.dict_learner_states, 'rng_states': _get_global_rng_states()}
+        tmp_path = '{}.{}.tmp'.format(self.path, os.getpid())
+        with open(tmp_path, 'wb') as f:
+            pickle.dump(dict_checkpoint, f)
+        os.replace(tmp_path, self.path)
+
+    def get_progress(self):
+        """ Return the number of games completed by each configuration. """
+        return {name: len(list_results) for name, list_results in self.dict_results.items()}
+
+    def run(self):
+        """ Play the games not completed yet, resuming from the checkpoint file if it exists.
+
+        :return: (dict) key: name of the configuration, value: list of results (see Game.get_result), in the order
+                 of the seeds
+        """
+        self.load()
+        for name, list_factories in self.dict_configs.items():
+            if self.learners:
+                self._run_learners(name, list_factories)
+            else:
+                self._run_games(name, list_factories)
+        return self.dict_results
+
+    def _run_games(self, name, list_factories):
+        """ Play the remaining games of a configuration in parallel. """
+        list_results = self.dict_results[name]
+        list_seeds = self.seeds[len(list_results):]
+        if not list_seeds:
+            return
+        for result in iter_games(list_factories, list_seeds, self.max_turns, self.n_workers, self.chunk_size,
+                                 self.shuffle_players, self.detect_stalemate):
+            list_results.append(result)
+            if len(list_results) % self.checkpoint_interval == 0:
+                self.save()
+        self.save()
+
+    def _run_learners(self, name, list_factories):
+        """ Play the remaining games of a configuration in order, with the same players. """
+        list_results = self.dict_results[name]
+        list_seeds = self.seeds[len(list_results):]
+        if not list_seeds:
+            return
+        game = Game(list_factories, list_seeds[0], self.shuffle_players)
+        if name in self.dict_learner_states:
+            for player, dict_state in zip(game.get_players(), self.dict_learner_states[name]):
+                player.set_learner_state(dict_state)
+        for idx, seed in enumerate(list_seeds):
+            if idx > 0:
+                game.reset(seed)
+            result = game.run(self.max_turns, self.detect_stalemate)
+            if self.on_game_end is not None:
+                self.on_game_end(game, result)
+            list_results.append(result)
+            if len(list_results) % self.checkpoint_interval == 0 or idx == len(list_seeds) - 1:
+                # Copied, so that the saved state doesn't change with the players until the next checkpoint
+                self.dict_learner_states[name] = [deepcopy(player.get_learner_state())
+                                                  for player in game.get_players()]
+                self.save()
+
+
+def run_sweep(path, dict_configs, seeds, **kwargs):
+    """ Run a sweep with checkpoints, resuming it if the checkpoint file exists. See Sweep for the parameters.
+
+    :return: (dict) key: name of the configuration, value: list of results
+    """
+    return Sweep(path, dict_configs, seeds, **kwargs).run()
@@ -0,0 +1,147 @@
+""" Round-robin tournaments of strategies.
+
+run_tournament plays every table of table_size different strategies (every pair with the default table_size=2) on the
+same seeds, so all the tables play the same dice sequences. The playing order of each game is shuffled from its seed,
+as random.shuffle(list_players) in the notebooks. The games of all the tables are split in small chunks and sent to a
+single pool of processes, which picks the next chunk as soon as a worker is free: long games (up to the turn cap) of a
+table don't hold back the other tables.
+Tables of more than 2 players play until a single player is left (see Game, last_player_standing).
+Strategy i beats strategy j in a game where j lost and i didn't. The win rate of i against j is the share of the
+decisive games between them won by i, with a Wilson score confidence interval.
+"""
+from monosim.runner import play_games, iter_chunks
+from concurrent.futures import ProcessPoolExecutor
+from collections import deque
+from itertools import combinations
+from statistics import NormalDist
+import math
+import os
+
+
+def get_confidence_interval(successes, trials, confidence=0.95):
+    """ Wilson score interval of a binomial proportion.
+
+    :param successes: (int) number of successes
+    :param trials: (int) number of trials
+    :param confidence: (float) confidence level
+    :return: (tuple) (lower bound, upper bound). (0, 1) without trials.
+    """
+    if trials == 0:
+        return 0., 1.
+    z = NormalDist().inv_cdf((1 + confidence) / 2)
+    proportion = successes / trials
+    center = (proportion + z ** 2 / (2 * trials)) / (1 + z ** 2 / trials)
+    half_width = z * math.sqrt(proportion * (1 - proportion) / trials + z ** 2 / (4 * trials ** 2)) / \
+        (1 + z ** 2 / trials)
+    return max(0., center - half_width), min(1., center + half_width)
+
+
+def _iter_tables_results(list_tables, dict_factories, seeds, max_turns, n_workers, chunk_size, shuffle_players,
+                         detect_stalemate, last_player_standing):
+    """ Play the games of all the tables and yield (table, list of results of a chunk), in any order. """
+    list_tasks = [(table, list_seeds) for list_seeds in iter_chunks(seeds, chunk_size) for table in list_tables]
+    if n_workers == 1:
+        for table, list_seeds in list_tasks:
+            yield table, play_games(list_seeds, [dict_factories[name] for name in table], max_turns,
+                                    shuffle_players, detect_stalemate, last_player_standing)
+        return
+
+    with ProcessPoolExecutor(max_workers=n_workers) as executor:
+        queue_futures = deque()
+        for table, list_seeds in list_tasks:
+            queue_futures.append((table, executor.submit(play_games, list_seeds,
+                                                         [dict_factories[name] for name in table], max_turns,
+                                                         shuffle_players, detect_stalemate, last_player_standing)))
+            if len(queue_futures) >= 4 * n_workers:
+                table_done, future = queue_futures.popleft()
+                yield table_done, future.result()
+        while queue_futures:
+            table_done, future = queue_futures.popleft()
+            yield table_done, future.result()
+
+
+def run_tournament(dict_factories, seeds, table_size=2, max_turns=1000, n_workers=None, chunk_size=20,
+                   shuffle_players=True, detect_stalemate=False, confidence=0.95, last_player_standing=None):
+    """ Play a round-robin tournament between strategies (see the module description).
+
+        Example:
+            run_tournament({'dummy': Player, 'no_brown': Player_no_brown, 'no_utilities': Player_no_utilities},
+                           range(0, 1000))
+
+    :param dict_factories: (dict) key: name of the strategy, value: player class (see Game). Picklable when
+                           n_workers > 1.
+    :param seeds: (iterable) seeds of the games of each table
+    :param table_size: (int) number of players of each table. Every combination of table_size strategies is played.
+    :param max_turns: (int) maximum number of turns per game
+    :param n_workers: (int) number of processes. Default: number of CPUs.
+    :param chunk_size: (int) number of games sent to a worker at a time
+    :param shuffle_players: (bool) shuffle the playing order of each game
+    :param detect_stalemate: (bool) stop stalemate games early (see monosim.stalemate)
+    :param confidence: (float) confidence level of the intervals
+    :param last_player_standing: (bool) see Game. Default: True for tables of more than 2 players, so that their
+                                 games go on after the first bankruptcy and have a winner.
+    :return: (dict) 'strategies': names, in the order of the rows and columns of the matrices.
+                    'games': games played by i with j, 'wins': games where i beat j,
+                    'win_rate': wins of i over the decisive games between i and j (None without decisive games),
+                    'confidence_interval': (lower, upper) bounds of the win rates,
+                    'scores': for each strategy, games, wins (winner of the game), losses and win rate with its
+                    confidence interval.
+    """
+    list_names = list(dict_factories)
+    if len(list_names) < table_size:
+        raise Exception('At least {} strategies are needed for tables of {} players'.format(table_size, table_size))
+    if n_workers is None:
+        n_workers = os.cpu_count() or 1
+    if last_player_standing is None:
+        last_player_standing = table_size > 2
+    seeds = list(seeds)
+    list_tables = list(combinations(list_names, table_size))
+    index = {name: idx for idx, name in enumerate(list_names)}
+    n_strategies = len(list_names)
+    games = [[0] * n_strategies for _ in range(n_strategies)]
+    wins = [[0] * n_strategies for _ in range(n_strategies)]
+    dict_scores = {name: {'games': 0, 'wins': 0, 'losses': 0} for name in list_names}
+
+    for table, list_results in _iter_tables_results(list_tables, dict_factories, seeds, max_turns, n_workers,
+                                                    chunk_size, shuffle_players, detect_stalemate,
+                                                    last_player_standing):
+        # Players are named player1, player2, ... in the order of the strategies of the table
+        dict_strategies = {'player{}'.format(idx + 1): name for idx, name in enumerate(table)}
+        for result in list_results:
+            set_lost = set(dict_strategies[player] for player in result['lost_players'])
+            for name in table:
+                dict_scores[name]['games'] += 1
+                dict_scores[name]['losses'] += name in set_lost
+                if result['winner'] is not None and dict_strategies[result['winner']] == name:
+                    dict_scores[name]['wins'] += 1
+                for other in table:
+                    if other != name:
+                        games[index[name]][index[other]] += 1
+                        wins[index[name]][index[other]] += name not in set_lost and other in set_lost
+
+    win_rate = [[None] * n_strategies for _ in range(n_strategies)]
+    confidence_interval = [[None] * n_strategies for _ in range(n_strategies)]
+    for i in range(n_strategies):
+        for j in range(n_strategies):
+            decisive = wins[i][j] + wins[j][i]
+            if i != j and decisive:
+                win_rate[i][j] = wins[i][j] / decisive
+                confidence_interval[i][j] = get_confidence_interval(wins[i][j], decisive, confidence)
+    for dict_score in dict_scores.values():
+        dict_score['win_rate'] = dict_score['wins'] / dict_score['games'] if dict_score['games'] else None
+        dict_score['confidence_interval'] = get_confidence_interval(dict_score['wins'], dict_score['games'],
+                                                                    confidence)
+
+    return {'strategies': list_names, 'games': games, 'wins': wins, 'win_rate': win_rate,
+            'confidence_interval': confidence_interval, 'scores': dict_scores}
+
+
+def format_win_rates(tournament):
+    """ Return the win-rate matrix of a tournament as a readable table (row strategy against column strategy). """
+    list_names = tournament['strategies']
+    width = max(12, max(len(name) for name in list_names) + 2)
+    list_lines = [''.ljust(width) + ''.join(name.rjust(width) for name in list_names)]
+    for name, row in zip(list_names, tournament['win_rate']):
+        list_lines.append(name.ljust(width) + ''.join(('-' if rate is None else '{:.3f}'.format(rate)).rjust(width)
+                                                      for rate in row))
+    return '\n'.join(list_lines)
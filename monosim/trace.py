@@ -0,0 +1,131 @@
+""" Binary trace of the events of a game.
+
+Tracing is opt-in: a Tracer is attached to a game with Game.set_tracer (or to single players with Player.set_tracer).
+Players without a tracer only check that the tracer is None at each event, so tracing costs nothing when it's disabled.
+Each event is packed in a fixed size record (event code, player number, two integer arguments) and stored in a ring
+buffer, which keeps the last `capacity` events of the game. Traces can be saved, loaded and printed, e.g. with the
+command line tool:
+    monosim replay trace.bin
+    monosim replay --seed 1006 --players Player,Player
+"""
+from monosim.board import get_catalog, get_community_chest_cards
+import struct
+import json
+
+#  Event codes. Arguments of each event in EVENT_FORMATS.
+TURN, DICE, MOVE, BUY, RENT, TAX, MORTGAGE, UNMORTGAGE, HOUSE, HOTEL, CARD, JAIL, JAIL_EXIT, BANKRUPT = range(14)
+EVENT_FORMATS = {TURN: 'turn {b}',
+                 DICE: '{player} rolled {a} and {b}',
+                 MOVE: '{player} moved to {a} ({cell}), cash {b}',
+                 BUY: '{player} bought {cell} for {b}',
+                 RENT: '{player} paid rent {b} for {cell}',
+                 TAX: '{player} paid tax {b}',
+                 MORTGAGE: '{player} mortgaged {cell} for {b}',
+                 UNMORTGAGE: '{player} unmortgaged {cell} for {b}',
+                 HOUSE: '{player} bought a house in {cell} for {b}',
+                 HOTEL: '{player} bought a hotel in {cell} for {b}',
+                 CARD: '{player} drew the community chest card {card}',
+                 JAIL: '{player} went to jail',
+                 JAIL_EXIT: '{player} left the jail and moved to {a} ({cell})',
+                 BANKRUPT: '{player} is bankrupt, could not pay {b}'}
+#  Index of each community chest card, used as argument of the CARD event
+CARD_NAMES = tuple(get_community_chest_cards())
+CARD_INDEX = {card_name: idx for idx, card_name in enumerate(CARD_NAMES)}
+
+RECORD = struct.Struct('<BBhi')  # event, player number, argument a, argument b
+MAGIC = b'MONOTRC1'
+HEADER_SIZE = struct.Struct('<I')
+
+
+class Tracer:
+    def __init__(self, capacity=65536, dict_info=None):
+        """ Ring buffer of binary event records.
+
+        :param capacity: (int) Maximum number of events kept. When the buffer is full, the oldest events are dropped.
+        :param dict_info: (dict) json serializable information saved with the trace (e.g. seed and players)
+        """
+        self._capacity = capacity
+        self._buffer = bytearray(capacity * RECORD.size)
+        self._count = 0
+        self.dict_info = dict(dict_info or {})
+
+    def record(self, event, player_number, a=0, b=0):
+        """ Record an event.
+
+        :param event: (int) event code (e.g. trace.BUY)
+        :param player_number: (int) number of the player (0 for game events)
+        :param a: (int) first argument (see EVENT_FORMATS)
+        :param b: (int) second argument (see EVENT_FORMATS)
+        :return: None
+        """
+        RECORD.pack_into(self._buffer, (self._count % self._capacity) * RECORD.size, event, player_number, a, b)
+        self._count += 1
+
+    def get_count(self):
+        """ Return the number of events recorded, including the dropped ones. """
+        return self._count
+
+    def _get_data(self):
+        """ Return the records kept in the buffer as bytes, from the oldest to the newest. """
+        if self._count <= self._capacity:
+            return bytes(self._buffer[:self._count * RECORD.size])
+        split = (self._count % self._capacity) * RECORD.size
+        return bytes(self._buffer[split:] + self._buffer[:split])
+
+    def get_records(self):
+        """ Return the events kept in the buffer, from the oldest to the newest.
+
+        :return: (list) tuples (event, player number, a, b)
+        """
+        return list(RECORD.iter_unpack(self._get_data()))
+
+    def save(self, path):
+        """ Save the trace in a binary file: magic bytes, json header (information, number of events recorded) and
+            records.
+
+        :param path: (str) path of the file
+        :return: None
+        """
+        header = json.dumps(dict(self.dict_info, count=self._count)).encode('utf-8')
+        with open(path, 'wb') as f:
+            f.write(MAGIC)
+            f.write(HEADER_SIZE.pack(len(header)))
+            f.write(header)
+            f.write(self._get_data())
+
+
+def load_trace(path):
+    """ Load a trace saved with Tracer.save.
+
+    :param path: (str) path of the file
+    :return: (tuple) (dict information, list of records)
+    """
+    with open(path, 'rb') as f:
+        if f.read(len(MAGIC)) != MAGIC:
+            raise Exception('File {} is not a monosim trace'.format(path))
+        header_size, = HEADER_SIZE.unpack(f.read(HEADER_SIZE.size))
+        dict_info = json.loads(f.read(header_size).decode('utf-8'))
+        data = f.read()
+    return dict_info, list(RECORD.iter_unpack(data))
+
+
+def format_records(list_records, list_player_names=None):
+    """ Return a readable description of the events.
+
+    :param list_records: (list) tuples (event, player number, a, b)
+    :param list_player_names: (list) names of the players, in the order of their number. Default: player1, ...
+    :return: (list) one string per event. Events of the players are indented under the turn.
+    """
+    catalog = get_catalog()
+    list_lines = []
+    for event, player_number, a, b in list_records:
+        if list_player_names is not None and 0 < player_number <= len(list_player_names):
+            player = list_player_names[player_number - 1]
+        else:
+            player = 'player{}'.format(player_number)
+        cell = catalog.names[a] if 0 <= a < catalog.board_size else a
+        card = CARD_NAMES[a] if 0 <= a < len(CARD_NAMES) else a
+        line = EVENT_FORMATS[event].format(player=player, a=a, b=b, cell=cell, card=card)
+        list_lines.append(line if event == TURN else '    ' + line)
+    return list_lines
+
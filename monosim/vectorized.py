@@ -0,0 +1,381 @@
+""" Lockstep engine playing many games of "dummy" players at the same time with NumPy arrays.
+
+The state of N games (positions, cash, ownership, houses, etc.) is held in arrays with a batch dimension and all the
+games advance one player turn per step. The rules and the decisions are the ones of the default Player:
+    * buy a house/hotel when the dice value is a multiple of 5 (see Player.want_to_buy_house_hotel)
+    * unmortgage when the dice value is even (see Player.want_to_unmortgage)
+    * always buy, mortgaging properties if needed (see Player.buy_or_bid and Player.mortgage_or_bid)
+    * always wait in jail (see Player.pay_jail_or_wait)
+Mortgages follow Player.choose_mortgage_properties (roads, stations, utilities in order of purchase) and
+Player.choose_unmortgage_properties. The dice are drawn from a NumPy generator, so a single game differs from the game
+with the same seed played by Player objects, but the outcome statistics are the same.
+"""
+from monosim.board import get_community_chest_cards, get_bank, get_color_to_house_mapping, get_catalog, RENT_KEYS, \
+    COMMUNITY_CHEST_CASH, STREET_REPAIR_HOUSE_COST, STREET_REPAIR_HOTEL_COST
+import numpy as np
+
+BOARD_SIZE = 40
+JAIL_POSITION = 10
+GO_TO_JAIL_POSITION = 30
+
+CELL_OTHER, CELL_ROAD, CELL_STATION, CELL_UTILITY, CELL_TAX, CELL_CHEST = 0, 1, 2, 3, 4, 5
+
+#  Same values of Player.get_tax_value
+TAX_VALUES = {'income tax': 200, 'super tax': 100}
+#  Same order used by Player.choose_house_hotel_to_buy
+COLOR_PRIORITY = ['blue', 'green', 'yellow', 'red', 'orange', 'purple', 'light_blue', 'brown']
+
+
+def _build_tables():
+    """ Build the static arrays (one entry per board cell) used by the engine, from the catalog of the board. """
+
+    catalog = get_catalog()
+    dict_cell_types = {'road': CELL_ROAD, 'station': CELL_STATION, 'utility': CELL_UTILITY, 'tax': CELL_TAX,
+                       'community chest': CELL_CHEST}
+    tables = {'cell_type': np.array([dict_cell_types.get(cell_type, CELL_OTHER) for cell_type in catalog.types],
+                                    dtype=np.int8),
+              'price': np.array(catalog.prices, dtype=np.int64),
+              'mortgage_value': np.array(catalog.mortgage_values, dtype=np.int64),
+              'unmortgage_value': np.array(catalog.unmortgage_values, dtype=np.int64),
+              'houses_cost': np.array(catalog.houses_costs, dtype=np.int64),
+              'hotels_cost': np.array(catalog.hotels_costs, dtype=np.int64),
+              'tax': np.array([TAX_VALUES.get(name, 0) for name in catalog.names], dtype=np.int64),
+              'color': np.array([COLOR_PRIORITY.index(color) if color else -1 for color in catalog.colors],
+                                dtype=np.int64),
+              'rent': np.array([rents or (0,) * len(RENT_KEYS) for rents in catalog.rents], dtype=np.int64),
+              'station_rent': np.array(catalog.station_rents, dtype=np.int64),
+              'utility_multiplier': np.array(catalog.utility_multipliers, dtype=np.int64),
+              # Order used to choose the properties to (un)mortgage: roads first, then stations and utilities
+              'type_rank': np.array([{'station': 1, 'utility': 2}.get(cell_type, 0) for cell_type in catalog.types],
+                                    dtype=np.int64)}
+
+    color_to_house_mapping = get_color_to_house_mapping()
+    tables['color_roads'] = [np.array([catalog.road_positions[road] for road in color_to_house_mapping[color]])
+                             for color in COLOR_PRIORITY]
+    # Same roads, repeated to have 3 roads per color (brown and blue have only 2)
+    tables['color_roads_padded'] = np.stack([np.resize(color_roads, 3) for color_roads in tables['color_roads']])
+    tables['stations'] = np.flatnonzero(tables['cell_type'] == CELL_STATION)
+    tables['utilities'] = np.flatnonzero(tables['cell_type'] == CELL_UTILITY)
+    tables['deck'] = list(get_community_chest_cards().keys())
+    return tables
+
+
+class VectorizedGames:
+    def __init__(self, n_games, n_players=2, seed=None, max_turns=1000, shuffle_players=True):
+        """ Set N games of n_players dummy players.
+
+        :param n_games: (int) Number of games played at the same time
+        :param n_players: (int) Number of players in each game
+        :param seed: (int) Seed of the NumPy random generator
+        :param max_turns: (int) Maximum number of turns (rounds of the table) before a game is stopped
+        :param shuffle_players: (bool) if True, shuffle the playing order of each game
+        """
+        self._tables = _build_tables()
+        self._rng = np.random.default_rng(seed)
+        self._n_games = n_games
+        self._n_players = n_players
+        self._max_turns = max_turns
+
+        bank = get_bank()
+        self._position = np.zeros((n_games, n_players), dtype=np.int64)
+        self._cash = np.full((n_games, n_players), 1500, dtype=np.int64)
+        self._mortgageable_amount = np.zeros((n_games, n_players), dtype=np.int64)
+        self._jail_count = np.zeros((n_games, n_players), dtype=np.int64)
+        self._free_visit = np.zeros((n_games, n_players), dtype=bool)
+        self._has_lost = np.zeros((n_games, n_players), dtype=bool)
+        # Redundant counters, used to skip the games where a player can't build or unmortgage
+        self._has_color_set = np.zeros((n_games, n_players), dtype=bool)
+        self._count_mortgaged = np.zeros((n_games, n_players), dtype=np.int64)
+        self._owner = np.full((n_games, BOARD_SIZE), -1, dtype=np.int64)
+        self._is_mortgaged = np.zeros((n_games, BOARD_SIZE), dtype=bool)
+        self._level = np.zeros((n_games, BOARD_SIZE), dtype=np.int64)  # houses + hotels on a road (0 to 5)
+        self._sequence = np.zeros((n_games, BOARD_SIZE), dtype=np.int64)  # when a property was bought/mortgaged
+        self._counter = 0
+        self._bank_houses = np.full(n_games, bank['houses'], dtype=np.int64)
+        self._bank_hotels = np.full(n_games, bank['hotels'], dtype=np.int64)
+        self._deck_index = np.zeros(n_games, dtype=np.int64)
+        self._turns = np.zeros(n_games, dtype=np.int64)
+        self._active = np.ones(n_games, dtype=bool)
+
+        if shuffle_players:
+            self._order = np.argsort(self._rng.random((n_games, n_players)), axis=1)
+        else:
+            self._order = np.tile(np.arange(n_players), (n_games, 1))
+
+    def _next_sequence(self):
+        self._counter += BOARD_SIZE
+        return self._counter
+
+    def _get_money_from_mortgages(self, rows, players, amount_required):
+        """ Mortgage properties, in the order of Player.choose_mortgage_properties, until the amount required is
+            reached. The caller makes sure that the mortgageable amount is sufficient.
+        """
+        if rows.size == 0:
+            return
+        tables = self._tables
+        mortgageable = (self._owner[rows] == players[:, None]) & ~self._is_mortgaged[rows]
+        key = np.where(mortgageable, tables['type_rank'] * (1 << 40) + self._sequence[rows], np.iinfo(np.int64).max)
+        order = np.argsort(key, axis=1, kind='stable')
+        sorted_mortgageable = np.take_along_axis(mortgageable, order, axis=1)
+        sorted_values = np.where(sorted_mortgageable, tables['mortgage_value'][order], 0)
+        cumulative = np.cumsum(sorted_values, axis=1)
+        selected = sorted_mortgageable & (cumulative - sorted_values < amount_required[:, None])
+
+        idx_row, idx_rank = np.nonzero(selected)
+        cells = order[idx_row, idx_rank]
+        self._is_mortgaged[rows[idx_row], cells] = True
+        self._sequence[rows[idx_row], cells] = self._next_sequence() + idx_rank
+        amount = (sorted_values * selected).sum(axis=1)
+        self._cash[rows, players] += amount
+        self._mortgageable_amount[rows, players] -= amount
+        self._count_mortgaged[rows, players] += selected.sum(axis=1)
+
+    def _pay(self, rows, players, amount, receivers=None):
+        """ Pay an amount to the bank (or to the receivers), mortgaging properties if needed. Players who can't pay
+            lose the game. Returns the mask of the rows that paid.
+        """
+        cash = self._cash[rows, players]
+        not_enough = cash < amount
+        is_bankrupt = not_enough & (cash + self._mortgageable_amount[rows, players] < amount)
+        self._has_lost[rows[is_bankrupt], players[is_bankrupt]] = True
+        to_mortgage = not_enough & ~is_bankrupt
+        self._get_money_from_mortgages(rows[to_mortgage], players[to_mortgage], (amount - cash)[to_mortgage])
+        paid = ~is_bankrupt
+        self._cash[rows[paid], players[paid]] -= amount[paid]
+        if receivers is not None:
+            self._cash[rows[paid], receivers[paid]] += amount[paid]
+        return paid
+
+    def _buy_house_hotel(self, rows, players):
+        """ Buy a house or a hotel (see Player.choose_house_hotel_to_buy). """
+        tables = self._tables
+        chosen_road = np.full(rows.size, -1, dtype=np.int64)
+        chosen_level = np.zeros(rows.size, dtype=np.int64)
+        for color_roads in tables['color_roads']:
+            owns_color = (self._owner[rows[:, None], color_roads] == players[:, None]).all(axis=1)
+            levels = self._level[rows[:, None], color_roads]
+            min_level = levels.min(axis=1)
+            pick = (chosen_road == -1) & owns_color & (min_level < 5)
+            chosen_road[pick] = color_roads[levels.argmin(axis=1)[pick]]
+            chosen_level[pick] = min_level[pick]
+
+        road = np.maximum(chosen_road, 0)
+        cash = self._cash[rows, players]
+        buy_house = (chosen_road >= 0) & (chosen_level < 4) & (self._bank_houses[rows] > 0) & \
+                    (cash >= tables['houses_cost'][road])
+        buy_hotel = (chosen_road >= 0) & (chosen_level == 4) & (self._bank_hotels[rows] > 0) & \
+                    (cash >= tables['hotels_cost'][road])
+        self._cash[rows, players] -= np.where(buy_house, tables['houses_cost'][road], 0) + \
+            np.where(buy_hotel, tables['hotels_cost'][road], 0)
+        built = buy_house | buy_hotel
+        self._level[rows[built], road[built]] += 1
+        self._bank_houses[rows[buy_house]] -= 1
+        self._bank_hotels[rows[buy_hotel]] -= 1
+
+    def _unmortgage(self, rows, players):
+        """ Unmortgage properties (see Player.choose_unmortgage_properties). """
+        tables = self._tables
+        mortgaged = (self._owner[rows] == players[:, None]) & self._is_mortgaged[rows]
+        key = np.where(mortgaged, tables['type_rank'] * (1 << 40) + self._sequence[rows], np.iinfo(np.int64).max)
+        order = np.argsort(key, axis=1, kind='stable')
+        cash = self._cash[rows, players]
+        total = np.zeros(rows.size, dtype=np.int64)
+        recovered = np.zeros(rows.size, dtype=np.int64)
+        count = np.zeros(rows.size, dtype=np.int64)
+        for rank in range(int(mortgaged.sum(axis=1).max(initial=0))):
+            cells = order[:, rank]
+            unmortgage_value = tables['unmortgage_value'][cells]
+            take = mortgaged[np.arange(rows.size), cells] & (unmortgage_value + total < cash)
+            total += np.where(take, unmortgage_value, 0)
+            recovered += np.where(take, tables['mortgage_value'][cells], 0)
+            count += take
+            self._is_mortgaged[rows[take], cells[take]] = False
+        self._cash[rows, players] -= total
+        self._mortgageable_amount[rows, players] += recovered
+        self._count_mortgaged[rows, players] -= count
+
+    def _buy_property(self, rows, players, cells):
+        """ Buy the property in the given cells, mortgaging properties if needed (see Player.mortgage_and_buy). """
+        price = self._tables['price'][cells]
+        cash = self._cash[rows, players]
+        can_mortgage = (cash < price) & (cash + self._mortgageable_amount[rows, players] >= price)
+        self._get_money_from_mortgages(rows[can_mortgage], players[can_mortgage], (price - cash)[can_mortgage])
+        buy = (cash >= price) | can_mortgage
+        rows, players, cells = rows[buy], players[buy], cells[buy]
+        self._cash[rows, players] -= price[buy]
+        self._mortgageable_amount[rows, players] += self._tables['mortgage_value'][cells]
+        self._owner[rows, cells] = players
+        self._sequence[rows, cells] = self._next_sequence()
+
+        is_road = self._tables['cell_type'][cells] == CELL_ROAD
+        color_roads = self._tables['color_roads_padded'][self._tables['color'][cells[is_road]]]
+        owns_color = (self._owner[rows[is_road][:, None], color_roads] == players[is_road][:, None]).all(axis=1)
+        self._has_color_set[rows[is_road][owns_color], players[is_road][owns_color]] = True
+
+    def _estimate_rent(self, rows, cells, owners, dice_value):
+        """ Rent of the given cells (see Player.estimate_rent). """
+        tables = self._tables
+        cell_type = tables['cell_type'][cells]
+        rent = np.zeros(rows.size, dtype=np.int64)
+
+        is_road = cell_type == CELL_ROAD
+        if is_road.any():
+            r_rows, r_cells, r_owners = rows[is_road], cells[is_road], owners[is_road]
+            color_roads = tables['color_roads_padded'][tables['color'][r_cells]]
+            owns_color = (self._owner[r_rows[:, None], color_roads] == r_owners[:, None]).all(axis=1)
+            rent_index = np.where(owns_color, 1 + self._level[r_rows, r_cells], 0)
+            rent[is_road] = tables['rent'][r_cells, rent_index]
+
+        is_station = cell_type == CELL_STATION
+        if is_station.any():
+            n_stations = (self._owner[rows[is_station][:, None], tables['stations']] ==
+                          owners[is_station][:, None]).sum(axis=1)
+            rent[is_station] = tables['station_rent'][n_stations]
+
+        is_utility = cell_type == CELL_UTILITY
+        if is_utility.any():
+            n_utilities = (self._owner[rows[is_utility][:, None], tables['utilities']] ==
+                           owners[is_utility][:, None]).sum(axis=1)
+            rent[is_utility] = tables['utility_multiplier'][n_utilities] * dice_value[is_utility]
+
+        return rent
+
+    def _play_community_chest(self, rows, players):
+        """ Draw the top card of the deck and execute it (see Player.play_community_chest). """
+        deck = self._tables['deck']
+        card_index = self._deck_index[rows] % len(deck)
+        self._deck_index[rows] += 1
+        for card_idx, card_name in enumerate(deck):
+            is_card = card_index == card_idx
+            if not is_card.any():
+                continue
+            c_rows, c_players = rows[is_card], players[is_card]
+            if card_name in COMMUNITY_CHEST_CASH:
+                amount = COMMUNITY_CHEST_CASH[card_name]
+                if amount > 0:
+                    self._cash[c_rows, c_players] += amount
+                else:
+                    self._pay(c_rows, c_players, np.full(c_rows.size, -amount, dtype=np.int64))
+            elif card_name == 'to_go':
+                self._position[c_rows, c_players] = 0
+                self._cash[c_rows, c_players] += 200
+            elif card_name == 'street_repair':
+                self._street_repair(c_rows, c_players)
+            # 'jail' is drawn but has no effect in Player.play_community_chest; 'birthday' and 'out_of_jail' are not
+            # implemented.
+
+    def _street_repair(self, rows, players):
+        """ Pay the street repairs of the houses and hotels (see Player.community_chest_street_repair). """
+        owned = self._owner[rows] == players[:, None]
+        level = np.where(owned, self._level[rows], 0)
+        amount = STREET_REPAIR_HOUSE_COST * np.minimum(level, 4).sum(axis=1) + \
+            STREET_REPAIR_HOTEL_COST * (level == 5).sum(axis=1)
+        cash = self._cash[rows, players]
+        enough = cash >= amount
+        self._cash[rows[enough], players[enough]] -= amount[enough]
+        can_mortgage = ~enough & (cash + self._mortgageable_amount[rows, players] >= amount)
+        # As in Player.community_chest_street_repair, properties are mortgaged but the amount is not paid.
+        self._get_money_from_mortgages(rows[can_mortgage], players[can_mortgage], (amount - cash)[can_mortgage])
+        is_bankrupt = ~enough & ~can_mortgage
+        self._has_lost[rows[is_bankrupt], players[is_bankrupt]] = True
+
+    def _play_seat(self, seat):
+        """ The player sitting at the given seat plays one turn in all the active games (see Player.play). """
+        tables = self._tables
+        rows = np.flatnonzero(self._active)
+        if rows.size == 0:
+            return
+        players = self._order[rows, seat]
+
+        dice = self._rng.integers(1, 7, size=(2, rows.size))
+        dice_value = dice[0] + dice[1]
+        position = self._position[rows, players]
+        free_visit = self._free_visit[rows, players]
+        moves = (position != JAIL_POSITION) | free_visit
+        position = np.where(moves, (position + dice_value) % BOARD_SIZE, position)
+        free_visit = np.where(moves, position == JAIL_POSITION, free_visit)
+        passed_go = moves & (position - dice_value < 0)
+        self._cash[rows[passed_go], players[passed_go]] += 200
+        self._position[rows, players] = position
+        self._free_visit[rows, players] = free_visit
+
+        # Buy a house or hotel
+        wants_house = (dice_value % 5 == 0) & self._has_color_set[rows, players]
+        if wants_house.any():
+            self._buy_house_hotel(rows[wants_house], players[wants_house])
+
+        # Unmortgage property
+        wants_unmortgage = (self._mortgageable_amount[rows, players] > 0) & (dice_value % 2 == 0) & \
+                           (self._count_mortgaged[rows, players] > 0)
+        if wants_unmortgage.any():
+            self._unmortgage(rows[wants_unmortgage], players[wants_unmortgage])
+
+        # Jail
+        in_jail = (position == JAIL_POSITION) & ~free_visit
+        if in_jail.any():
+            j_rows, j_players = rows[in_jail], players[in_jail]
+            double = dice[0][in_jail] == dice[1][in_jail]
+            must_pay = ~double & (self._jail_count[j_rows, j_players] == 3)
+            paid = np.zeros(j_rows.size, dtype=bool)
+            paid[must_pay] = self._pay(j_rows[must_pay], j_players[must_pay],
+                                       np.full(must_pay.sum(), 50, dtype=np.int64))
+            leaves = double | paid
+            self._jail_count[j_rows[leaves], j_players[leaves]] = 0
+            self._position[j_rows[leaves], j_players[leaves]] += dice_value[in_jail][leaves]
+            waits = ~double & ~must_pay
+            self._jail_count[j_rows[waits], j_players[waits]] += 1
+
+        cell_type = np.where(in_jail, CELL_OTHER, tables['cell_type'][position])
+
+        # Roads, stations and utilities
+        is_property = (cell_type == CELL_ROAD) | (cell_type == CELL_STATION) | (cell_type == CELL_UTILITY)
+        if is_property.any():
+            p_rows, p_players, p_cells = rows[is_property], players[is_property], position[is_property]
+            owners = self._owner[p_rows, p_cells]
+            to_buy = owners == -1
+            self._buy_property(p_rows[to_buy], p_players[to_buy], p_cells[to_buy])
+            to_rent = (owners != -1) & (owners != p_players) & ~self._is_mortgaged[p_rows, p_cells]
+            if to_rent.any():
+                rent = self._estimate_rent(p_rows[to_rent], p_cells[to_rent], owners[to_rent],
+                                           dice_value[is_property][to_rent])
+                self._pay(p_rows[to_rent], p_players[to_rent], rent, receivers=owners[to_rent])
+
+        # Taxes
+        is_tax = cell_type == CELL_TAX
+        if is_tax.any():
+            self._pay(rows[is_tax], players[is_tax], tables['tax'][position[is_tax]])
+
+        # Go to jail
+        goes_to_jail = position == GO_TO_JAIL_POSITION
+        self._position[rows[goes_to_jail], players[goes_to_jail]] = JAIL_POSITION
+
+        # Community chest
+        is_chest = cell_type == CELL_CHEST
+        if is_chest.any():
+            self._play_community_chest(rows[is_chest], players[is_chest])
+
+    def step(self):
+        """ Play one turn (a round of the table) in all the active games. Games end when a player loses or the
+            maximum number of turns is reached.
+
+        :return: (int) Number of games still active
+        """
+        for seat in range(self._n_players):
+            self._play_seat(seat)
+        self._turns[self._active] += 1
+        self._active &= ~self._has_lost.any(axis=1) & (self._turns < self._max_turns)
+        return int(self._active.sum())
+
+    def run(self):
+        """ Play all the games until the end.
+
+        :return: (dict) arrays with the outcome of every game:
+                    'turns': (n_games,) turns played
+                    'has_lost': (n_games, n_players) True if the player lost (player i is 'player{i+1}')
+                    'player_order': (n_games, n_players) players' indexes in playing order
+                    'cash': (n_games, n_players) final cash
+        """
+        while self.step() > 0:
+            pass
+        return {'turns': self._turns.copy(), 'has_lost': self._has_lost.copy(), 'player_order': self._order.copy(),
+                'cash': self._cash.copy()}
@@ -13,6 +13,7 @@ setuptools.setup(
     long_description_content_type="text/markdown",
     url="https://github.com/giogix2/MonopolySimulator",
     packages=setuptools.find_packages(),
+    entry_points={'console_scripts': ['monosim=monosim.cli:main']},
     classifiers=[
         "Programming Language :: Python :: 3",
         "License :: OSI Approved :: MIT License",
@@ -0,0 +1,18 @@
+from monosim.benchmark import run_benchmarks, compare, save_results, load_results
+
+
+def test_run_and_compare_benchmarks(tmp_path):
+    """ Test run_benchmarks and compare. Results saved as json are loaded back and a slower run is a regression. """
+
+    results = run_benchmarks(['player_play', 'games'], scale=0.01, repeat=1)
+    assert set(results['benchmarks']) == {'player_play', 'games'}
+    assert results['benchmarks']['games']['turns_per_second'] > 0
+
+    path = str(tmp_path / 'baseline.json')
+    save_results(results, path)
+    baseline = load_results(path)
+    assert baseline == results
+    slower = {'benchmarks': {name: dict(dict_result, ops_per_second=dict_result['ops_per_second'] * 0.5)
+                             for name, dict_result in results['benchmarks'].items()}}
+    assert all(not dict_value['regression'] for dict_value in compare(results, baseline).values())
+    assert all(dict_value['regression'] for dict_value in compare(slower, baseline, threshold=0.1).values())
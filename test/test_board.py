@@ -0,0 +1,58 @@
+import pickle
+from monosim.board import get_roads, get_properties, get_catalog, BoardState
+
+
+def test_catalog_is_shared():
+    """ Test function get_catalog. The catalog is built once and shared by copies and pickles. """
+
+    catalog = get_catalog()
+    assert get_catalog() is catalog
+    assert catalog.names[1] == 'old kent road'
+    assert catalog.prices[39] == 400
+    assert catalog.colors[39] == 'blue'
+    assert catalog.position_of['kings cross station'] == 5
+    assert catalog.rents[1][0] == get_roads()['old kent road']['rent']
+
+    # Copies refer to the same catalog
+    assert pickle.loads(pickle.dumps(catalog)) is catalog
+
+
+def test_roads_and_properties_use_board_state():
+    """ Test functions get_roads and get_properties. Roads and properties are plain dicts of each game, indexed by
+        the board state of the game. """
+
+    board_state = BoardState()
+    dict_roads, dict_properties = get_roads(board_state), get_properties(board_state)
+    assert dict_roads['old kent road']['price'] == 60
+    assert dict_roads['old kent road']['belongs_to'] is None
+
+    dict_roads['old kent road']['belongs_to'] = 'player1'
+    dict_properties['kings cross station']['is_mortgaged'] = True
+    assert board_state.belongs_to[1] == 'player1'
+    assert board_state.is_mortgaged[5] is True
+    assert dict(dict_roads['old kent road'])['belongs_to'] == 'player1'
+
+    # Other games are not affected
+    assert get_roads()['old kent road']['belongs_to'] is None
+
+    assert type(dict_roads['old kent road']) is dict
+    board_state.set_state((board_state.get_state()[0], (False,) * 28))
+    assert dict_properties['kings cross station']['is_mortgaged'] is False
+    board_state.release('player1')
+    assert dict_roads['old kent road']['belongs_to'] is None
+
+    dict_roads_copy = pickle.loads(pickle.dumps(dict_roads))
+    assert dict_roads_copy == dict_roads
+
+
+def test_catalog_rent_tables():
+    """ Test the rent tables of the catalog. Road rents are indexed by development level, station rents by number of
+        stations owned and utility multipliers by number of utilities owned. """
+
+    catalog = get_catalog()
+    dict_roads = get_roads()
+    assert catalog.rents[1] == (2, 4, 10, 30, 90, 160, 250)
+    assert catalog.rents[39][6] == dict_roads['mayfair']['rent_with_4_houses_1_hotels']
+    assert catalog.rents[5] is None
+    assert catalog.station_rents == (0, 25, 50, 100, 200)
+    assert catalog.utility_multipliers == (0, 4, 10)
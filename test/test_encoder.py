@@ -0,0 +1,53 @@
+import pytest
+from monosim.player import Player
+from monosim.game import Game
+from monosim.env import MonopolyEnv
+
+np = pytest.importorskip('numpy')
+from monosim.encoder import ObservationEncoder  # noqa: E402
+
+
+def test_encode_player_state():
+    """ Test ObservationEncoder.encode. Values in the layout match the state of the players, starting from the
+        observing player. """
+
+    game = Game([Player, Player, Player], seed=3)
+    for _ in range(100):
+        game.play_turn()
+    encoder = ObservationEncoder(3)
+    player1, player2, player3 = game.get_players()
+    dict_features = encoder.decode(encoder.encode(game, player2))
+
+    assert encoder.size == 4 + 3 * (6 + 2 * 28 + 2 * 22)
+    assert dict_features['turn'] == 100
+    assert dict_features['bank_cash'] == game._bank['cash']
+    for idx, player in enumerate([player2, player3, player1]):
+        assert dict_features['player{}_cash'.format(idx)] == player.cash
+        assert dict_features['player{}_position'.format(idx)] == player._position
+        owned = dict_features['player{}_owned'.format(idx)]
+        assert sum(int(bit) << position for position, bit in enumerate(owned)) == player.get_holdings_key()[0]
+        mortgaged = dict_features['player{}_mortgaged'.format(idx)]
+        assert sum(int(bit) << position for position, bit in enumerate(mortgaged)) == player.get_holdings_key()[1]
+        houses = dict_features['player{}_houses'.format(idx)]
+        assert houses.sum() == sum(houses for houses, _ in player._dict_owned_houses_hotels.values())
+
+    # Every value is overwritten, so reusing a buffer gives the same observation
+    out = np.full(encoder.size, 7, dtype=np.float32)
+    assert np.array_equal(encoder.encode(game, player2, out), encoder.encode(game, player2))
+
+
+def test_encode_batch_in_place():
+    """ Test ObservationEncoder.encode_batch. Rows of the batch are written in place and equal single encodings. """
+
+    list_games = [Game([Player, Player], seed=seed) for seed in range(4)]
+    for game in list_games:
+        game.run(max_turns=50)
+    encoder = ObservationEncoder(2)
+    batch = encoder.new_buffer(4)
+    assert encoder.encode_batch(list_games, out=batch) is batch
+    for row, game in zip(batch, list_games):
+        assert np.array_equal(row, encoder.encode(game))
+
+    env = MonopolyEnv(observe=encoder.observe)
+    observation, info = env.reset(seed=1)
+    assert observation.shape == (encoder.size,) and info['decision'] is not None
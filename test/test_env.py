@@ -0,0 +1,92 @@
+from monosim.player import Player
+from monosim.game import Game
+from monosim.env import MonopolyEnv, VectorEnv
+
+
+def get_default_action(observation):
+    """ Return the action of the default Player for the decision of an observation. """
+    dice_value = observation['dice_value'][observation['player']]
+    return {'buy_or_bid': 1, 'mortgage_or_bid': 1, 'want_to_buy_house_hotel': int(dice_value % 5 == 0),
+            'want_to_unmortgage': int(dice_value % 2 == 0), 'pay_jail_or_wait': 0}[observation['decision']]
+
+
+def make_short_env():
+    return MonopolyEnv(max_turns=20)
+
+
+def make_tiny_env():
+    return MonopolyEnv(hooks=('buy_or_bid',), max_turns=2)
+
+
+def test_env_default_actions():
+    """ Test MonopolyEnv. Answering each decision as the default Player does, the environment plays the same game of
+        two default players. """
+
+    env = MonopolyEnv(max_turns=300)
+    observation, info = env.reset(seed=4)
+    terminated, truncated = False, False
+    while not terminated and not truncated:
+        observation, reward, terminated, truncated, info = env.step(get_default_action(observation))
+
+    result = Game([Player, Player], seed=4).run(max_turns=300)
+    assert info['result'] == result
+    assert reward == (0. if result['winner'] is None else 1. if result['winner'] == 'player1' else -1.)
+
+
+def test_env_reuses_game():
+    """ Test MonopolyEnv.reset. The game is reused across episodes and a reset game plays as a new one. """
+
+    env = MonopolyEnv(max_turns=300)
+    env.reset(seed=7)
+    game, agent = env.game, env._agent
+    for _ in range(30):
+        env.step(1)
+    list_observations = [env.reset(seed=4)[0]]
+    assert env.game is game and env._agent is agent
+    terminated, truncated = False, False
+    while not terminated and not truncated:
+        observation, reward, terminated, truncated, info = env.step(get_default_action(list_observations[-1]))
+        list_observations.append(observation)
+
+    new_env = MonopolyEnv(max_turns=300)
+    new_observations = [new_env.reset(seed=4)[0]]
+    for observation in list_observations[:-1]:
+        new_observations.append(new_env.step(get_default_action(observation))[0])
+    assert list_observations == new_observations
+    assert info['result'] == Game([Player, Player], seed=4).run(max_turns=300)
+
+
+def test_vector_env_auto_reset():
+    """ Test VectorEnv. Finished games are reset with new seeds and the games don't depend on the number of workers. """
+
+    list_outputs = []
+    for n_workers in (1, 2):
+        envs = VectorEnv([make_short_env] * 3, seed=10, n_workers=n_workers)
+        envs.reset()
+        list_steps = [envs.step([idx % 2] * 3) for idx in range(100)]
+        envs.close()
+        list_outputs.append([(observations, rewards) for observations, rewards, _, _, _ in list_steps])
+        list_finished = [info for _, _, _, _, infos in list_steps for info in infos if 'final_info' in info]
+        assert list_finished
+        assert all(info['final_info']['result']['turns'] <= 20 for info in list_finished)
+    assert list_outputs[0] == list_outputs[1]
+
+
+def test_vector_env_skips_games_without_decisions():
+    """ Test VectorEnv with games ending before the first decision of the agent (seed 1 with 2 turns). They are
+        skipped, so every observation has a pending decision. """
+
+    observation, info = make_tiny_env().reset(seed=1)
+    assert observation['decision'] is None and 'decision' not in info and info['result']['turns'] == 2
+
+    list_outputs = []
+    for n_workers in (1, 2):
+        envs = VectorEnv([make_tiny_env] * 2, seed=0, n_workers=n_workers)
+        list_observations, _ = envs.reset()
+        list_steps = [envs.step([1] * 2) for _ in range(30)]
+        envs.close()
+        assert all(observation['decision'] == 'buy_or_bid' for observation in list_observations)
+        assert all(observation['decision'] == 'buy_or_bid' for observations, _, _, _, _ in list_steps
+                   for observation in observations)
+        list_outputs.append([(observations, rewards) for observations, rewards, _, _, _ in list_steps])
+    assert list_outputs[0] == list_outputs[1]
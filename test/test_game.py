@@ -0,0 +1,90 @@
+from monosim.player import Player
+from monosim.game import Game
+
+
+def get_game_state(game):
+    """ Return a comparable copy of the state of the game. """
+    return game.snapshot(), [player.get_state()['cash'] for player in game.get_players()]
+
+
+def test_snapshot_restore():
+    """ Test functions snapshot and restore. After restoring a snapshot, the game continues exactly as it did after
+        the snapshot was taken (same dice, same purchases, same payments). """
+
+    game = Game([Player, Player], seed=11)
+    for _ in range(40):
+        game.play_turn()
+    snapshot = game.snapshot()
+
+    list_states = []
+    for _ in range(60):
+        game.play_turn()
+        list_states.append(get_game_state(game))
+
+    game.restore(snapshot)
+    assert game.get_turn() == 40
+    for idx in range(60):
+        game.play_turn()
+        assert get_game_state(game) == list_states[idx]
+
+
+def test_restore_in_another_game():
+    """ Test function restore. A snapshot can be restored in another game with the same number of players. """
+
+    game = Game([Player, Player], seed=3)
+    for _ in range(25):
+        game.play_turn()
+
+    other_game = Game([Player, Player], seed=4, shuffle_players=False)
+    other_game.restore(game.snapshot())
+    assert other_game.snapshot() == game.snapshot()
+
+    game.play_turn(), other_game.play_turn()
+    assert other_game.snapshot() == game.snapshot()
+
+
+def test_game_reset():
+    """ Test Game.reset. A game reset with a seed is in the same state of a new game with that seed, reuses its
+        containers and plays the same game. """
+
+    game = Game([Player, Player, Player], seed=0)
+    game.run(max_turns=200)
+    player1 = game.get_players()[0]
+    list_owned_roads, bank = player1._list_owned_roads, game._bank
+    for seed in range(1, 20):
+        game.reset(seed)
+        new_game = Game([Player, Player, Player], seed=seed)
+        assert game.snapshot() == new_game.snapshot()
+        assert game.run(max_turns=200) == new_game.run(max_turns=200)
+    assert player1._list_owned_roads is list_owned_roads and game._bank is bank
+
+
+def test_last_player_standing():
+    """ Test a game of 6 players with last_player_standing. Bankrupt players leave the table and their properties go
+        back to the bank, until a single player is left. """
+
+    game = Game([Player] * 6, seed=5, last_player_standing=True)
+    result = game.run(max_turns=1000)
+    assert len(result['lost_players']) == 5
+    assert result['winner'] not in result['lost_players']
+    owners = set(owner for owner in game._board_state.belongs_to if owner is not None)
+    assert owners <= {result['winner']}
+    assert game.get_next_player()._name == result['winner']
+
+
+def test_last_player_standing_buildings():
+    """ Test the elimination of players with houses and hotels (seeds 2 and 5) with last_player_standing. Their houses
+        and hotels go back to the bank and they don't hold anything anymore. """
+
+    for seed in (2, 5):
+        game = Game([Player] * 6, seed=seed, last_player_standing=True)
+        game.run(max_turns=1000)
+        list_players = game.get_players()
+        assert game._bank['houses'] + sum(houses for player in list_players
+                                          for houses, _ in player._dict_owned_houses_hotels.values()) == 32
+        assert game._bank['hotels'] + sum(hotels for player in list_players
+                                          for _, hotels in player._dict_owned_houses_hotels.values()) == 12
+        for player in list_players:
+            if player.has_lost():
+                assert not player._dict_owned_houses_hotels and not player._list_owned_roads
+                assert player.get_holdings_key() == (0, 0)
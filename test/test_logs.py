@@ -0,0 +1,38 @@
+import logging
+import monosim.player
+import monosim.game
+from monosim.player import Player
+from monosim.game import Game
+from monosim.logs import ECONOMY
+
+
+class ForbiddenLogger:
+    """ Logger failing on any use. """
+
+    def __getattr__(self, name):
+        raise AssertionError('Logger used with verbosity 0')
+
+
+def test_no_logging_when_off(monkeypatch):
+    """ Test that with verbosity 0 (default) the logger is never used. """
+
+    monkeypatch.setattr(monosim.player, 'logger', ForbiddenLogger())
+    monkeypatch.setattr(monosim.game, 'logger', ForbiddenLogger())
+    for seed in range(5):
+        Game([Player, Player], seed=seed).run(max_turns=300)
+
+
+def test_logging_events(caplog):
+    """ Test function Game.set_verbosity. Records carry the event, the player and the amount. """
+
+    game = Game([Player, Player], seed=1)
+    game.set_verbosity(ECONOMY)
+    with caplog.at_level(logging.INFO, logger='monosim'):
+        for _ in range(3):
+            game.play_turn()
+
+    list_events = [record.event for record in caplog.records]
+    assert list_events.count('turn') == 3
+    assert 'move' in list_events and 'decision' in list_events and 'buy' in list_events
+    record_buy = next(record for record in caplog.records if record.event == 'buy')
+    assert record_buy.player in ('player1', 'player2') and record_buy.amount > 0
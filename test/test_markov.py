@@ -0,0 +1,46 @@
+import pytest
+from monosim.player import Player
+from monosim.game import Game
+from monosim.markov import get_transition_matrix, get_stationary_distribution, get_landing_probabilities, \
+    get_n_step_distribution, to_cells, BOARD_SIZE, JAIL_STATE
+
+np = pytest.importorskip('numpy')
+
+
+def test_transition_matrix():
+    """ Test function get_transition_matrix. Rows are probability distributions, cell 30 (go to jail) is never the
+        end of a turn and the matrix is cached per rule configuration. """
+
+    matrix = get_transition_matrix()
+    assert np.allclose(matrix.sum(axis=1), 1.)
+    assert not matrix[:, 30].any()
+    assert get_transition_matrix() is matrix
+    assert get_transition_matrix('pay') is not matrix
+    assert not matrix.flags.writeable
+
+    distribution = get_stationary_distribution()
+    assert np.allclose(distribution @ matrix, distribution)
+    assert np.allclose(get_n_step_distribution(200), distribution)
+    assert not get_stationary_distribution('pay')[JAIL_STATE + 1:].any()
+
+    with pytest.raises(Exception):
+        get_transition_matrix('bribe')
+
+
+def test_landing_probabilities_match_simulation():
+    """ Test function get_landing_probabilities against the positions of a player (with unlimited cash) playing
+        alone. """
+
+    game = Game([Player], seed=1)
+    player = game.get_players()[0]
+    player.set_cash(10 ** 9)
+    counts = np.zeros(BOARD_SIZE)
+    n_turns = 40000
+    for _ in range(n_turns):
+        game.play_next()
+        counts[player.get_state()['position']] += 1
+
+    probabilities = get_landing_probabilities()
+    assert probabilities.sum() == pytest.approx(1.)
+    assert np.abs(counts / n_turns - probabilities).max() < 0.005
+    assert np.allclose(to_cells(get_stationary_distribution()), probabilities)
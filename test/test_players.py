@@ -977,3 +977,124 @@ def test_pay_tax():
     # Player loses
     player1.pay_tax(50)
     assert player1.has_lost() is True
+
+
+def test_roll_dice_with_game_rng():
+    """ Test function roll_dice when the player uses its own random generator. Two players using generators with
+        the same seed roll the same values, whatever happens to the global random module. """
+
+    bank = get_bank()
+    list_board, dict_roads, dict_properties = get_board(), get_roads(), get_properties()
+    dict_community_chest_cards = get_community_chest_cards()
+    community_cards_deck = list(dict_community_chest_cards.keys())
+    player1 = Player('player1', 1, bank, list_board, dict_roads, dict_properties, community_cards_deck,
+                     rng=random.Random(42))
+    player2 = Player('player2', 2, bank, list_board, dict_roads, dict_properties, community_cards_deck)
+    player2.set_rng(random.Random(42))
+
+    for _ in range(100):
+        random.seed(0)
+        assert player1.roll_dice() == player2.roll_dice()
+
+
+def test_estimate_rent_road_with_houses_and_hotel():
+    """ Test estimate_rent_road function when the owner has houses or a hotel on the road. """
+
+    bank = get_bank()
+    list_board, dict_roads, dict_properties = get_board(), get_roads(), get_properties()
+    dict_community_chest_cards = get_community_chest_cards()
+    community_cards_deck = list(dict_community_chest_cards.keys())
+    player1 = Player('player1', 1, bank, list_board, dict_roads, dict_properties, community_cards_deck)
+    player2 = Player('player2', 2, bank, list_board, dict_roads, dict_properties, community_cards_deck)
+    player1.meet_other_players([player2]), player2.meet_other_players([player1])
+
+    player1.buy(dict_roads['park lane'], 'park lane')
+    assert player2.estimate_rent_road(dict_roads['park lane']) == 35
+
+    player1.buy(dict_roads['mayfair'], 'mayfair')
+    assert player2.estimate_rent_road(dict_roads['park lane']) == 70
+
+    player1._dict_owned_houses_hotels['park lane'] = (2, 0)
+    assert player2.estimate_rent_road(dict_roads['park lane']) == 500
+
+    player1._dict_owned_houses_hotels['mayfair'] = (4, 1)
+    assert player2.estimate_rent_road(dict_roads['mayfair']) == 2000
+
+
+def test_holdings_bitmasks():
+    """ Test the bitmasks of the properties owned and mortgaged by the player (get_holdings_key) and the color sets
+        completion (owns_all_roads_of_a_color). """
+
+    bank = get_bank()
+    list_board, dict_roads, dict_properties = get_board(), get_roads(), get_properties()
+    dict_community_chest_cards = get_community_chest_cards()
+    community_cards_deck = list(dict_community_chest_cards.keys())
+    player1 = Player('player1', 1, bank, list_board, dict_roads, dict_properties, community_cards_deck)
+
+    assert player1.get_holdings_key() == (0, 0)
+    player1.buy(dict_roads['old kent road'], 'old kent road')  # first purchasable cell
+    player1.buy_property(dict_properties['kings cross station'])  # third purchasable cell
+    assert player1.get_holdings_key() == (0b101, 0)
+    assert player1.owns_all_roads_of_a_color() is False
+
+    player1.buy(dict_roads['whitechapel road'], 'whitechapel road')
+    assert player1.owns_all_roads_of_a_color() is True
+    assert player1.has_all_roads_of_color('brown') is True
+
+    player1.mortgage('kings cross station', 'station')
+    assert player1.get_holdings_key() == (0b111, 0b100)
+    player1.unmortgage('kings cross station', 'station')
+    assert player1.get_holdings_key() == (0b111, 0)
+
+
+def modify_buy(buy):
+    def _wrapper(self, dict_road_info, road_name):
+        if dict_road_info['color'] != 'brown':
+            buy(self, dict_road_info, road_name)
+    return _wrapper
+
+
+class PlayerNoBrownDecorated(Player):
+    buy = modify_buy(Player.buy)
+
+
+class PlayerNoBrownCopied(Player):
+    def buy(self, dict_road_info, road_name):
+        # Body of buy copied as in the notebooks: only the lists and _dict_owned_colors are updated
+        if dict_road_info['color'] == 'brown':
+            pass
+        else:
+            road_price = dict_road_info['price']
+            self._bank['cash'] += road_price
+            self._cash -= road_price
+            dict_road_info['belongs_to'] = self._name
+            self._list_owned_roads.append(road_name)
+            self._dict_owned_houses_hotels[road_name] = (0, 0)
+            self._properties_total_mortgageable_amount += dict_road_info['mortgage_value']
+
+            color = dict_road_info['color']
+            count_roads_of_color = 0
+            for road in self._list_owned_roads:
+                if color == self._dict_roads[road]['color']:
+                    count_roads_of_color += 1
+            if count_roads_of_color == len(self.color_to_house_mapping[color]):
+                self._dict_owned_colors[color] = True
+
+
+def test_buy_override_updating_lists():
+    """ Test that a player overriding buy the way of the notebooks (updating the lists of owned roads only) plays the
+        same games of the player decorating Player.buy. """
+
+    from monosim.game import Game
+
+    for seed in range(60):
+        list_results = []
+        for factory in (PlayerNoBrownDecorated, PlayerNoBrownCopied):
+            game = Game([factory, Player], seed)
+            list_results.append(game.run(300))
+            player = game.get_players()[0]
+            catalog = player._catalog
+            assert player.get_holdings_key()[0] == sum(catalog.bits[catalog.position_of[name]] for name in
+                                                       player._list_owned_roads + player._list_owned_stations +
+                                                       player._list_owned_utilities)
+        assert list_results[0] == list_results[1]
@@ -0,0 +1,29 @@
+from monosim.player import Player
+from monosim.game import Game
+from monosim.profiling import Profiler, SECTION_NAMES, MOVE
+from monosim.runner import profile_games
+
+
+def test_profiler_counts_plays():
+    """ Test a profiled game. Each play counts one move, profiling doesn't change the game and the report covers all
+        the sections. """
+
+    game = Game([Player, Player], seed=2)
+    profiler = Profiler()
+    game.set_profiler(profiler)
+    result = game.run(max_turns=300)
+    assert result == Game([Player, Player], seed=2).run(max_turns=300)
+
+    assert profiler.counts[MOVE] == result['turns'] * 2
+    dict_report = profiler.get_report()
+    assert list(dict_report) == list(SECTION_NAMES)
+    assert dict_report['rent']['count'] > 0 and dict_report['rent']['time'] > 0
+
+
+def test_profile_games_merge():
+    """ Test profile_games. Counts don't depend on the number of workers. """
+
+    profiler = profile_games([Player, Player], range(6), max_turns=100)
+    profiler_workers = profile_games([Player, Player], range(6), max_turns=100, n_workers=2, chunk_size=2)
+    assert profiler.games == profiler_workers.games == 6
+    assert profiler.counts == profiler_workers.counts
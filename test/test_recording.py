@@ -0,0 +1,43 @@
+from monosim.player import Player
+from monosim.recording import record_game, load_recording, find_divergence
+from monosim.cli import main
+
+
+def test_seek():
+    """ Test function Recording.seek. The game reached from a checkpoint is the same game played from the start. """
+
+    recording = record_game(21, [Player, Player], max_turns=300, interval=40)
+    assert recording.result['turns'] == recording.get_last_turn()
+    assert all(turn % 40 == 0 for turn in recording.dict_checkpoints if turn != recording.get_last_turn())
+
+    game = recording.new_game()
+    for turn in range(1, recording.get_last_turn() + 1):
+        game.play_turn()
+        assert recording.seek(turn).snapshot() == game.snapshot()
+    assert recording.verify() is None
+
+
+def test_save_and_find_divergence(tmp_path):
+    """ Test functions Recording.save, load_recording and find_divergence. """
+
+    recording = record_game(5, [Player, Player], max_turns=200, interval=50)
+    path = str(tmp_path / 'game.rec')
+    recording.save(path)
+    loaded = load_recording(path)
+    assert loaded.dict_checkpoints == recording.dict_checkpoints
+    assert find_divergence(recording, loaded) is None
+
+    loaded.dict_checkpoints[100] = recording.dict_checkpoints[50]
+    assert find_divergence(recording, loaded) == 100
+    assert loaded.verify() == 100
+
+
+def test_record_and_replay_commands(tmp_path, capsys):
+    """ Test the commands monosim record and monosim replay --recording. """
+
+    path = str(tmp_path / 'game.rec')
+    main(['record', '--seed', '5', '--max-turns', '60', '--interval', '20', '--save', path])
+    capsys.readouterr()
+    main(['replay', '--recording', path, '--turn', '45', '--turns', '2'])
+    list_lines = capsys.readouterr().out.splitlines()
+    assert [line for line in list_lines if line.startswith('turn')] == ['turn 45', 'turn 46']
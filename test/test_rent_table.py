@@ -0,0 +1,44 @@
+import pytest
+import os
+
+np = pytest.importorskip('numpy')
+
+from monosim.board import get_catalog
+from monosim.markov import get_hit_probabilities
+from monosim.rent_table import get_rent_table, get_rent_table_path, compute_rent_table
+
+
+def test_rent_table_values():
+    """ Test function compute_rent_table on a road, a station and a utility. """
+
+    table = compute_rent_table()
+    hits = get_hit_probabilities().sum(axis=1)
+
+    mayfair = table['properties']['mayfair']
+    assert mayfair['hit_probability'] == pytest.approx(hits[39])
+    assert mayfair['expected_rent'][6] == pytest.approx(hits[39] * 2000)
+    assert mayfair['investment'] == [400, 400, 600, 800, 1000, 1200, 1400]
+    assert mayfair['payback_turns'][6] == pytest.approx(1400 / (hits[39] * 2000))
+
+    station = table['properties']['kings cross station']
+    assert station['expected_rent'][4] == pytest.approx(hits[5] * 200)
+    assert station['payback_turns'][0] is None
+
+    # Expected dice value of the players landing on the utility, times 10
+    utility = table['properties']['Electric company']
+    assert 6 < utility['expected_rent'][2] / (10 * hits[12]) < 8
+    assert len(table['properties']) == len(get_catalog().position_of)
+
+
+def test_rent_table_disk_cache(tmp_path):
+    """ Test function get_rent_table. The table is written to the cache directory and read back. """
+
+    cache_dir = str(tmp_path)
+    path = get_rent_table_path('pay', cache_dir=cache_dir)
+    assert not os.path.exists(path)
+    table = get_rent_table('pay', cache_dir=cache_dir)
+    assert os.path.exists(path)
+    assert table == compute_rent_table('pay')
+
+    get_rent_table.cache_clear()
+    assert get_rent_table('pay', cache_dir=cache_dir) == table
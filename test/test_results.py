@@ -0,0 +1,43 @@
+import pytest
+from monosim.player import Player
+from monosim.runner import run_games, write_games
+from monosim.results import ResultsWriter, iter_results, flatten_result, read_table
+
+
+def test_write_and_read_text_formats(tmp_path):
+    """ Test functions write_games and iter_results with csv and jsonl files, written in several chunks. """
+
+    results = run_games([Player, Player], range(0, 12), max_turns=100, n_workers=1)
+    list_records = [flatten_result(result) for result in results]
+    assert list_records[0]['starting_player'] == results[0]['player_order'][0]
+    assert list_records[0]['cash_player2'] == results[0]['cash'][1]
+
+    for extension in ('csv', 'jsonl'):
+        path = str(tmp_path / 'results.{}'.format(extension))
+        with ResultsWriter(path, chunk_size=5) as writer:
+            assert writer.write_many(results) == 12
+        assert list(iter_results(path)) == list_records
+
+        assert write_games(path, [Player, Player], range(0, 12), max_turns=100, n_workers=1) == 12
+        assert list(iter_results(path)) == list_records
+
+
+def test_write_and_read_arrow_formats(tmp_path):
+    """ Test functions write_games, iter_results and read_table with Parquet and Arrow files. """
+
+    pytest.importorskip('pyarrow')
+    results = run_games([Player, Player], range(0, 12), max_turns=100, n_workers=1)
+    list_records = [flatten_result(result) for result in results]
+    for extension in ('parquet', 'arrow'):
+        path = str(tmp_path / 'results.{}'.format(extension))
+        with ResultsWriter(path, chunk_size=5) as writer:
+            writer.write_many(results)
+        assert list(iter_results(path)) == list_records
+        assert read_table(path).num_rows == 12
+
+
+def test_unknown_format(tmp_path):
+    """ Test class ResultsWriter with a file extension not supported. """
+
+    with pytest.raises(Exception):
+        ResultsWriter(str(tmp_path / 'results.xlsx'))
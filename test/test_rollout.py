@@ -0,0 +1,70 @@
+from monosim.player import Player
+from monosim.game import Game
+from monosim.rollout import RolloutPlayer, ShadowPlayer, simulate
+from functools import partial
+import time
+
+
+def test_rollout_player_game():
+    """ Test a game with a RolloutPlayer. The game is played until the end and, with the same seed, the rollout player
+        takes the same decisions. """
+
+    factory = partial(RolloutPlayer, n_rollouts=2, rollout_turns=5)
+    list_results = [Game([factory, Player], seed=5).run(max_turns=60) for _ in range(2)]
+    assert list_results[0] == list_results[1]
+    assert list_results[0]['turns'] <= 60
+
+
+def test_simulate_replays_turn():
+    """ Test function simulate. With no rollout turns, the replayed turn is the same turn played in the real game. """
+
+    game = Game([Player, Player], seed=8)
+    for _ in range(10):
+        game.play_turn()
+    snapshot = game.snapshot()
+    idx_player = game.get_next_player()._number - 1
+    game.play_next()
+
+    shadow_game = Game([ShadowPlayer, ShadowPlayer], shuffle_players=False)
+    simulate(shadow_game, snapshot, idx_player, [], [0], rollout_turns=0)
+    assert shadow_game.get_players()[idx_player].get_snapshot() == game.get_players()[idx_player].get_snapshot()
+
+
+def test_restore_game_with_rollout_player():
+    """ Test that a game with a RolloutPlayer restored from a snapshot plays the same continuation. """
+
+    game = Game([partial(RolloutPlayer, n_rollouts=2, rollout_turns=3), Player], seed=4)
+    for _ in range(5):
+        game.play_turn()
+    snapshot = game.snapshot()
+    for _ in range(15):
+        game.play_turn()
+    expected = game.snapshot()
+
+    game.restore(snapshot)
+    for _ in range(15):
+        game.play_turn()
+    assert game.snapshot() == expected
+
+
+def test_time_budget_with_workers():
+    """ Test that the decisions of a RolloutPlayer with workers stop at the time budget. Without it, the rollouts
+        of a decision would take about 2 seconds. """
+
+    game = Game([partial(RolloutPlayer, n_rollouts=400, rollout_turns=300, time_budget=0.05, n_workers=2), Player],
+                seed=5)
+    player = game.get_players()[0]
+    evaluate = player._evaluate
+    list_times = []
+
+    def timed_evaluate(list_options):
+        start = time.perf_counter()
+        list_values = evaluate(list_options)
+        list_times.append(time.perf_counter() - start)
+        return list_values
+
+    player._evaluate = timed_evaluate
+    for _ in range(6):
+        game.play_turn()
+    player.close()
+    assert list_times and max(list_times) < 0.5
@@ -0,0 +1,43 @@
+from monosim.player import Player
+from monosim.runner import play_game, run_games
+from monosim.board import get_roads, get_board, get_properties, get_community_chest_cards, get_bank
+import random
+
+
+def test_play_game_same_as_manual_loop():
+    """ Test function play_game. The result must be the same of the loop used in the notebooks. """
+
+    seed = 7
+    random.seed(seed)
+    bank = get_bank()
+    list_board, dict_roads, dict_properties = get_board(), get_roads(), get_properties()
+    community_cards_deck = list(get_community_chest_cards().keys())
+    player1 = Player('player1', 1, bank, list_board, dict_roads, dict_properties, community_cards_deck)
+    player2 = Player('player2', 2, bank, list_board, dict_roads, dict_properties, community_cards_deck)
+    player1.meet_other_players([player2]), player2.meet_other_players([player1])
+    list_players = [player1, player2]
+    random.shuffle(list_players)
+    idx_count = 0
+    while not player1.has_lost() and not player2.has_lost() and idx_count < 300:
+        for player in list_players:
+            player.play()
+        idx_count += 1
+
+    result = play_game(seed, [Player, Player], max_turns=300)
+    assert result['seed'] == seed
+    assert result['turns'] == idx_count
+    assert result['player_order'] == (list_players[0]._name, list_players[1]._name)
+    assert ('player1' in result['lost_players']) is player1.has_lost()
+    assert ('player2' in result['lost_players']) is player2.has_lost()
+
+
+def test_run_games_same_results_any_number_of_workers():
+    """ Test function run_games. Results must be in the order of the seeds and must not depend on the number of
+        workers or on the chunk size. """
+
+    seeds = range(100, 120)
+    results_single = run_games([Player, Player], seeds, max_turns=200, n_workers=1)
+    results_pool = run_games([Player, Player], seeds, max_turns=200, n_workers=2, chunk_size=3)
+
+    assert [result['seed'] for result in results_single] == list(seeds)
+    assert results_single == results_pool
@@ -0,0 +1,37 @@
+from monosim.player import Player
+from monosim.sequential import SPRT, run_experiment
+
+
+class PlayerNeverBuys(Player):
+    def buy_or_bid(self, dict_road_info):
+        return 'bid'
+
+    def mortgage_or_bid(self, dict_road_info):
+        return 'bid'
+
+
+def test_sprt():
+    """ Test class SPRT. Only successes accept H1, alternating outcomes accept H0 (p = 0.5). """
+
+    test = SPRT(0.5, 0.6)
+    decisions = [test.update(True) for _ in range(40)]
+    assert decisions[-1] == 'H1' and decisions[0] is None
+
+    test = SPRT(0.5, 0.6)
+    for idx in range(2000):
+        if test.update(idx % 2 == 0) is not None:
+            break
+    assert test.decision == 'H0'
+
+
+def test_run_experiment():
+    """ Test function run_experiment. A player who never buys is detected as worse after a few games. Two equal
+        strategies are not detected as different. """
+
+    result = run_experiment(PlayerNeverBuys, Player, delta=0.1, max_games=1000, max_turns=300, n_workers=1)
+    assert result['decision'] == 'worse'
+    assert result['games'] < 100
+    assert result['games'] == result['wins'] + result['losses'] + result['draws']
+
+    result = run_experiment(Player, Player, delta=0.2, max_games=1000, max_turns=300, n_workers=1)
+    assert result['decision'] in ('equivalent', None)
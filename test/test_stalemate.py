@@ -0,0 +1,34 @@
+import pytest
+from monosim.player import Player
+from monosim.game import Game
+from monosim.runner import play_game
+
+pytest.importorskip('numpy')
+
+from monosim.stalemate import is_board_frozen, is_stalemate
+
+
+def test_stalemate_detection():
+    """ Test function Game.run with detect_stalemate. The game stops early as a stalemate, and the same game played
+        until the maximum number of turns doesn't end. """
+
+    result = play_game(17, [Player, Player], max_turns=1000, detect_stalemate=True)
+    assert result['stalemate'] and result['turns'] < 1000
+    assert result['lost_players'] == () and result['winner'] is None
+
+    game = Game([Player, Player], seed=17)
+    while game.get_turn() < result['turns']:
+        game.play_turn()
+    assert is_board_frozen(game) and is_stalemate(game, 1000)
+    result_full = game.run(max_turns=1000)
+    assert not result_full['stalemate'] and result_full['turns'] == 1000 and result_full['lost_players'] == ()
+
+
+def test_no_stalemate_in_games_with_a_loser():
+    """ Test that games ending with a loser are never stopped as stalemates, e.g. games where a player with a positive
+        expected cash flow goes bankrupt later. """
+
+    for seed in (868, 962, 974, 1146):
+        result = play_game(seed, [Player, Player], max_turns=1000, detect_stalemate=True)
+        assert result == play_game(seed, [Player, Player], max_turns=1000)
+        assert result['lost_players']
@@ -0,0 +1,23 @@
+from monosim.player import Player
+from monosim.strategy import Strategy, RuleStrategy, NoBrownStrategy, compile_strategy, strategy_player
+from monosim.runner import run_games
+
+
+def test_default_strategies_match_player():
+    """ Test StrategyPlayer. The default strategy, the default rules and their compiled tables play as Player. """
+
+    list_results = run_games([Player, Player], range(50), n_workers=1)
+    for strategy in (Strategy(), RuleStrategy(), compile_strategy(RuleStrategy())):
+        assert run_games([strategy_player(strategy), Player], range(50), n_workers=1) == list_results
+
+
+def test_compiled_strategy():
+    """ Test compile_strategy. The compiled strategy takes the decisions of the rules, also in worker processes, and
+        the no brown strategy never owns brown roads. """
+
+    strategy = NoBrownStrategy()
+    list_results = run_games([strategy_player(strategy), Player], range(40), n_workers=1)
+    list_results_compiled = run_games([strategy_player(compile_strategy(strategy)), Player], range(40), n_workers=2)
+    assert list_results == list_results_compiled
+    # Bits of the two brown roads (old kent road and whitechapel road, the first two purchasable cells)
+    assert all(result['holdings'][0] & 0b11 == 0 for result in list_results)
@@ -0,0 +1,143 @@
+from monosim.player import Player
+from monosim.sweep import Sweep, run_sweep
+from functools import partial
+import pickle
+import random
+import pytest
+
+
+class CountingPlayer(Player):
+    """ Learner keeping the number of games played and of rolls of each dice value across games. """
+
+    def __init__(self, name, number, bank, list_board, dict_roads, dict_properties, community_cards_deck, rng=None,
+                 verbosity=0, epsilon=0.):
+        super().__init__(name, number, bank, list_board, dict_roads, dict_properties, community_cards_deck, rng,
+                         verbosity)
+        self.epsilon = epsilon
+        self.games = 0
+        self.count_dice_values = [0] * 13
+
+    def buy_or_bid(self, dict_road_info):
+        self.count_dice_values[self._dice_value] += 1
+        return 'bid' if self._rng.random() < self.epsilon else 'buy'
+
+
+class GlobalRandomPlayer(Player):
+    """ Learner drawing from the global random module, as the k-arm players of the notebooks. """
+
+    def __init__(self, name, number, bank, list_board, dict_roads, dict_properties, community_cards_deck, rng=None,
+                 verbosity=0):
+        super().__init__(name, number, bank, list_board, dict_roads, dict_properties, community_cards_deck, rng,
+                         verbosity)
+        self.draws = []
+
+    def buy_or_bid(self, dict_road_info):
+        self.draws.append(random.random())
+        return 'bid' if self.draws[-1] < 0.3 else 'buy'
+
+
+def count_game(game, result):
+    for player in game.get_players():
+        if isinstance(player, CountingPlayer):
+            player.games += 1
+
+
+def test_sweep_resume(tmp_path):
+    """ Test that a sweep stopped after a checkpoint resumes to the same results of an uninterrupted sweep. """
+
+    dict_configs = {'dummy': [Player, Player], 'epsilon': [Player, partial(CountingPlayer, epsilon=0.5)]}
+    expected = run_sweep(str(tmp_path / 'full.ckpt'), dict_configs, range(20), max_turns=200, n_workers=1,
+                         checkpoint_interval=5)
+
+    path = str(tmp_path / 'sweep.ckpt')
+    sweep = Sweep(path, dict_configs, range(20), max_turns=200, n_workers=1, checkpoint_interval=5)
+    sweep.dict_results['dummy'] = expected['dummy'][:10]
+    sweep.save()
+    resumed = Sweep(path, dict_configs, range(20), max_turns=200, n_workers=1, checkpoint_interval=5)
+    assert resumed.load() and resumed.get_progress() == {'dummy': 10, 'epsilon': 0}
+    assert resumed.run() == expected
+
+    with pytest.raises(Exception):
+        Sweep(path, dict_configs, range(30), max_turns=200).run()
+
+
+def test_sweep_learners(tmp_path):
+    """ Test that the learner state is saved in the checkpoints and restored when a sweep resumes. """
+
+    dict_configs = {'epsilon 0.1': [Player, partial(CountingPlayer, epsilon=0.1)],
+                    'epsilon 0.5': [partial(CountingPlayer, epsilon=0.5), Player]}
+    kwargs = {'max_turns': 200, 'learners': True, 'checkpoint_interval': 4, 'on_game_end': count_game}
+    expected = Sweep(str(tmp_path / 'full.ckpt'), dict_configs, range(12), **kwargs)
+    expected_results = expected.run()
+    assert expected.dict_learner_states['epsilon 0.1'][1]['games'] == 12
+    assert sum(expected.dict_learner_states['epsilon 0.5'][0]['count_dice_values']) > 0
+
+    class StopSweep(Exception):
+        pass
+
+    list_games = []
+
+    def stop_after_6_games(game, result):
+        count_game(game, result)
+        list_games.append(result)
+        if len(list_games) == 6:
+            raise StopSweep()
+
+    path = str(tmp_path / 'sweep.ckpt')
+    with pytest.raises(StopSweep):
+        Sweep(path, dict_configs, range(12), **dict(kwargs, on_game_end=stop_after_6_games)).run()
+    resumed = Sweep(path, dict_configs, range(12), **kwargs)
+    assert resumed.load() and resumed.get_progress() == {'epsilon 0.1': 4, 'epsilon 0.5': 0}
+    assert resumed.run() == expected_results
+    assert resumed.dict_learner_states == expected.dict_learner_states
+
+
+def test_sweep_key_and_learner_state_copy(tmp_path):
+    """ Test that the arguments of partial factories are part of the key, that the learner states kept by a sweep
+        are copies, equal to the last checkpoint, and that on_game_end needs learners. """
+
+    path = str(tmp_path / 'sweep.ckpt')
+    assert Sweep(path, {'a': [Player, partial(CountingPlayer, epsilon=0.1)]}, range(4)).get_key() != \
+        Sweep(path, {'a': [Player, partial(CountingPlayer, epsilon=0.5)]}, range(4)).get_key()
+    with pytest.raises(Exception):
+        Sweep(path, {'a': [Player, Player]}, range(4), on_game_end=count_game)
+
+    list_checks = []
+
+    def check_learner_state(game, result):
+        if len(sweep.dict_results['a']) == 6:
+            with open(path, 'rb') as f:
+                list_checks.append(pickle.load(f)['learner_states'] == sweep.dict_learner_states)
+
+    sweep = Sweep(path, {'a': [Player, partial(CountingPlayer, epsilon=0.1)]}, range(8), max_turns=200,
+                  learners=True, checkpoint_interval=4, on_game_end=check_learner_state)
+    sweep.run()
+    assert list_checks == [True]
+
+
+def test_sweep_resume_with_global_random(tmp_path):
+    """ Test that a sweep of learners drawing from the global random module resumes to the same results, since the
+        state of the global generators is saved in the checkpoints. """
+
+    dict_configs = {'global': [Player, GlobalRandomPlayer]}
+    kwargs = {'max_turns': 200, 'learners': True, 'checkpoint_interval': 4}
+    random.seed(0)
+    expected = Sweep(str(tmp_path / 'full.ckpt'), dict_configs, range(12), **kwargs)
+    expected_results = expected.run()
+
+    class StopSweep(Exception):
+        pass
+
+    def stop_after_6_games(game, result):
+        if len(sweep.dict_results['global']) == 5:
+            raise StopSweep()
+
+    random.seed(0)
+    path = str(tmp_path / 'sweep.ckpt')
+    sweep = Sweep(path, dict_configs, range(12), **dict(kwargs, on_game_end=stop_after_6_games))
+    with pytest.raises(StopSweep):
+        sweep.run()
+    random.seed(1)
+    resumed = Sweep(path, dict_configs, range(12), **kwargs)
+    assert resumed.run() == expected_results
+    assert resumed.dict_learner_states == expected.dict_learner_states
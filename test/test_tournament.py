@@ -0,0 +1,50 @@
+from monosim.player import Player
+from monosim.tournament import run_tournament, get_confidence_interval, format_win_rates
+from monosim.strategy import NoBrownStrategy, compile_strategy, strategy_player
+from monosim.runner import run_games, play_games, iter_chunks
+
+
+def test_round_robin_tournament():
+    """ Test run_tournament. Every pair plays the same seeds, the matrices are consistent and don't depend on the
+        number of workers. """
+
+    dict_factories = {'dummy': Player, 'no_brown': strategy_player(compile_strategy(NoBrownStrategy())),
+                      'dummy_2': Player}
+    tournament = run_tournament(dict_factories, range(30), max_turns=300, n_workers=1, chunk_size=7)
+    assert tournament == run_tournament(dict_factories, range(30), max_turns=300, n_workers=2, chunk_size=7)
+
+    list_results = run_games([Player, dict_factories['no_brown']], range(30), max_turns=300, n_workers=1)
+    assert tournament['wins'][0][1] == sum(result['winner'] == 'player1' for result in list_results)
+    assert tournament['wins'][1][0] == sum(result['winner'] == 'player2' for result in list_results)
+    assert tournament['games'][0][1] == tournament['games'][1][0] == 30
+    assert abs(tournament['win_rate'][0][1] + tournament['win_rate'][1][0] - 1) < 1e-12
+    low, high = tournament['confidence_interval'][0][1]
+    assert low <= tournament['win_rate'][0][1] <= high
+    assert tournament['scores']['dummy']['games'] == 60
+    assert len(format_win_rates(tournament).splitlines()) == 4
+
+
+def test_tables_of_three_players():
+    """ Test a tournament with tables of 3 players and the Wilson confidence interval. """
+
+    tournament = run_tournament({'a': Player, 'b': Player, 'c': Player}, range(10), table_size=3, max_turns=200,
+                                n_workers=1)
+    assert all(tournament['games'][i][j] == (10 if i != j else 0) for i in range(3) for j in range(3))
+    assert get_confidence_interval(0, 0) == (0., 1.)
+    low, high = get_confidence_interval(50, 100)
+    assert abs(low - 0.4038) < 1e-3 and abs(high - 0.5962) < 1e-3
+
+
+def test_tables_of_three_players_have_winners():
+    """ Test that tables of 3 players play until a single player is left, unless last_player_standing is False. """
+
+    dict_factories = {'a': Player, 'b': Player, 'c': Player}
+    tournament = run_tournament(dict_factories, range(10), table_size=3, n_workers=1)
+    list_results = [result for list_seeds in iter_chunks(range(10), 4)
+                    for result in play_games(list_seeds, [Player] * 3, last_player_standing=True)]
+    n_winners = sum(result['winner'] is not None for result in list_results)
+    assert n_winners > 0
+    assert sum(dict_score['wins'] for dict_score in tournament['scores'].values()) == n_winners
+
+    tournament = run_tournament(dict_factories, range(10), table_size=3, n_workers=1, last_player_standing=False)
+    assert sum(dict_score['wins'] for dict_score in tournament['scores'].values()) == 0
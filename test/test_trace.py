@@ -0,0 +1,45 @@
+from monosim.player import Player
+from monosim.runner import play_game, trace_game
+from monosim.trace import Tracer, load_trace, format_records, TURN, DICE, BUY
+from monosim.cli import main
+
+
+def test_tracer_ring_buffer():
+    """ Test class Tracer. When the buffer is full, the oldest events are dropped. """
+
+    tracer = Tracer(capacity=4)
+    for idx in range(6):
+        tracer.record(DICE, 1, idx, idx + 1)
+    assert tracer.get_count() == 6
+    assert tracer.get_records() == [(DICE, 1, idx, idx + 1) for idx in range(2, 6)]
+
+
+def test_trace_game(tmp_path):
+    """ Test function trace_game. Tracing doesn't change the game, and the trace can be saved and loaded back. """
+
+    result, tracer = trace_game(1006, [Player, Player], max_turns=300)
+    assert result == play_game(1006, [Player, Player], max_turns=300)
+
+    list_records = tracer.get_records()
+    assert sum(1 for record in list_records if record[0] == TURN) == result['turns']
+    assert any(record[0] == BUY for record in list_records)
+
+    path = str(tmp_path / 'trace.bin')
+    tracer.save(path)
+    dict_info, list_loaded = load_trace(path)
+    assert dict_info['seed'] == 1006 and dict_info['count'] == tracer.get_count()
+    assert list_loaded == list_records
+    assert format_records(list_records[:2]) == ['turn 1', '    {} rolled {} and {}'.format(
+        dict_info['players'][list_records[1][1] - 1], list_records[1][2], list_records[1][3])]
+
+
+def test_replay_command(tmp_path, capsys):
+    """ Test the command monosim replay, from a seed and from a saved trace. """
+
+    path = str(tmp_path / 'trace.bin')
+    main(['replay', '--seed', '3', '--max-turns', '20', '--save', path])
+    output_seed = capsys.readouterr().out
+    main(['replay', path])
+    output_file = capsys.readouterr().out
+    assert 'turn 20' in output_seed
+    assert output_seed.splitlines()[1:] == output_file.splitlines()[1:]
@@ -0,0 +1,50 @@
+import pytest
+from monosim.player import Player
+from monosim.runner import run_games
+
+np = pytest.importorskip('numpy')
+from monosim.vectorized import VectorizedGames  # noqa: E402
+
+
+def test_vectorized_games_deterministic():
+    """ Test class VectorizedGames. Games played with the same seed have the same outcome. """
+
+    results1 = VectorizedGames(200, seed=3, max_turns=300).run()
+    results2 = VectorizedGames(200, seed=3, max_turns=300).run()
+    for key in results1:
+        assert (results1[key] == results2[key]).all()
+
+
+def test_vectorized_games_state_consistency():
+    """ Test class VectorizedGames. Check that the state of the games is consistent at the end of the games: games
+        end when a player loses or when the maximum number of turns is reached, houses are only built on color sets
+        and the bank's houses are consistent with the houses built. """
+
+    games = VectorizedGames(300, seed=5, max_turns=200)
+    results = games.run()
+
+    ended = results['has_lost'].any(axis=1) | (results['turns'] == 200)
+    assert ended.all()
+    assert (results['turns'] <= 200).all()
+    houses_built = np.minimum(games._level, 4).sum(axis=1)
+    assert (games._bank_houses == 32 - houses_built).all()
+    for color_roads in games._tables['color_roads']:
+        has_houses = (games._level[:, color_roads] > 0).any(axis=1)
+        owners = games._owner[:, color_roads]
+        assert (owners[has_houses] == owners[has_houses][:, :1]).all()
+
+
+def test_vectorized_games_same_statistics_as_players():
+    """ Test class VectorizedGames. The outcome statistics must be the same of the games played by Player objects
+        (dummy players). """
+
+    n_games, max_turns = 400, 500
+    results_players = run_games([Player, Player], range(n_games), max_turns=max_turns, n_workers=1)
+    results_vectorized = VectorizedGames(4 * n_games, seed=0, max_turns=max_turns).run()
+
+    rate_no_loss_players = np.mean([not result['lost_players'] for result in results_players])
+    rate_no_loss_vectorized = np.mean(~results_vectorized['has_lost'].any(axis=1))
+    assert abs(rate_no_loss_players - rate_no_loss_vectorized) < 0.06
+
+    turns_players = np.mean([result['turns'] for result in results_players])
+    assert abs(turns_players - results_vectorized['turns'].mean()) < 0.1 * turns_players